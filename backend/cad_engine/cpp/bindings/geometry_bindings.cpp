@@ -2,23 +2,98 @@
 // Copyright (c) 2024 Pygmalion Records
 
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <pybind11/stl.h>
 #include "geometry_converter.hpp"
 
 namespace py = pybind11;
 
+namespace {
+
+// Any NumPy array is accepted by the overloads below: C-contiguous float64
+// arrays are used in place, others (Fortran-ordered, strided, integer) are
+// copied into that layout once. Lists fall through to the list overloads.
+using PointArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+
+PointArray asPointArray(const py::array& points) {
+    auto converted = PointArray::ensure(points);
+    if (!converted) {
+        throw py::error_already_set();
+    }
+    return converted;
+}
+
+std::size_t pointCount(const PointArray& points) {
+    if (points.ndim() != 2 || points.shape(1) != 3) {
+        throw py::value_error("points must be an (N, 3) array");
+    }
+    return static_cast<std::size_t>(points.shape(0));
+}
+
+PointArray alignArray(const py::array& input, double gridSize) {
+    const PointArray points = asPointArray(input);
+    const std::size_t count = pointCount(points);
+    PointArray aligned({points.shape(0), static_cast<py::ssize_t>(3)});
+    const double* in = points.data();
+    double* out = aligned.mutable_data();
+    {
+        py::gil_scoped_release release;
+        eurotempl::GeometryConverter::alignToGrid(in, out, count, gridSize);
+    }
+    return aligned;
+}
+
+void alignArrayInPlace(const py::array& input, double gridSize) {
+    // A converted copy would be aligned and discarded, so only arrays that
+    // can be written as they are get through.
+    if (!py::isinstance<py::array_t<double>>(input) ||
+            !(input.flags() & py::array::c_style)) {
+        throw py::type_error("points must be a C-contiguous float64 array to be aligned in place");
+    }
+    PointArray points = py::reinterpret_borrow<PointArray>(input);
+    const std::size_t count = pointCount(points);
+    double* data = points.mutable_data();  // Raises if the array is read-only
+    py::gil_scoped_release release;
+    eurotempl::GeometryConverter::alignToGridInPlace(data, count, gridSize);
+}
+
+bool validateArray(const py::array& input, double gridSize) {
+    const PointArray points = asPointArray(input);
+    const std::size_t count = pointCount(points);
+    const double* data = points.data();
+    py::gil_scoped_release release;
+    return eurotempl::GeometryConverter::validateGridAlignment(data, count, gridSize);
+}
+
+}  // namespace
+
 PYBIND11_MODULE(eurotempl_core, m) {
     m.doc() = "EuroTempl geometry conversion module";
 
+    using Points = std::vector<std::array<double, 3>>;
+
     py::class_<eurotempl::GeometryConverter>(m, "GeometryConverter")
-        .def_static("align_to_grid", &eurotempl::GeometryConverter::alignToGrid,
+        // NumPy overloads first: noconvert() only admits ndarrays, keeping lists
+        // on the list overloads.
+        .def_static("align_to_grid", &alignArray,
+            py::arg("points").noconvert(), py::arg("grid_size") = 25.0,
+            "Align an (N, 3) array to the grid, returning a new float64 array")
+        .def_static("align_to_grid",
+            py::overload_cast<const Points&, double>(&eurotempl::GeometryConverter::alignToGrid),
             py::arg("points"), py::arg("grid_size") = 25.0,
             "Align points to the EuroTempl grid system")
-        .def_static("validate_grid_alignment", &eurotempl::GeometryConverter::validateGridAlignment,
+        .def_static("align_to_grid_inplace", &alignArrayInPlace,
+            py::arg("points").noconvert(), py::arg("grid_size") = 25.0,
+            "Align a writeable C-contiguous (N, 3) float64 array to the grid in place")
+        .def_static("validate_grid_alignment", &validateArray,
+            py::arg("points").noconvert(), py::arg("grid_size") = 25.0,
+            "Validate if an (N, 3) array is aligned to the grid")
+        .def_static("validate_grid_alignment",
+            py::overload_cast<const Points&, double>(&eurotempl::GeometryConverter::validateGridAlignment),
             py::arg("points"), py::arg("grid_size") = 25.0,
             "Validate if points are aligned to the grid")
         .def_static("to_geos", &eurotempl::GeometryConverter::toGeos,
             "Convert coordinates to GEOS format")
         .def_static("from_geos", &eurotempl::GeometryConverter::fromGeos,
             "Convert coordinates from GEOS format");
-}
\ No newline at end of file
+}
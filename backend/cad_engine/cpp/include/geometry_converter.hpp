@@ -5,6 +5,7 @@
 
 #include <vector>
 #include <array>
+#include <cstddef>
 #include <memory>
 
 namespace eurotempl {
@@ -28,8 +29,23 @@ public:
     static std::vector<std::array<double, 3>> fromGeos(
         const std::vector<std::array<double, 3>>& points) noexcept;
 
+    // Buffer variants on `count` row-major (x, y, z) points, as laid out
+    // by a C-contiguous (N, 3) float64 array; `out` may equal `points`.
+    static void alignToGrid(const double* points, double* out, std::size_t count,
+        double gridSize = 25.0) noexcept;
+
+    static void alignToGridInPlace(double* points, std::size_t count,
+        double gridSize = 25.0) noexcept;
+
+    static bool validateGridAlignment(const double* points, std::size_t count,
+        double gridSize = 25.0) noexcept;
+
+    // Point sets at least this large are processed with OpenMP, if enabled.
+    static constexpr std::size_t PARALLEL_THRESHOLD = 1 << 16;
+
 private:
     static constexpr double EPSILON = 1e-6;
+    static bool isAligned(double value, double gridSize) noexcept;
     static double roundToGrid(double value, double gridSize) noexcept;
 };
 
@@ -6,25 +6,25 @@
 
 namespace eurotempl {
 
+// The vector overloads reuse the buffer ones on the vector's storage.
+static_assert(sizeof(std::array<double, 3>) == 3 * sizeof(double),
+              "std::array<double, 3> must be laid out as three doubles");
+
 double GeometryConverter::roundToGrid(double value, double gridSize) noexcept {
     return std::round(value / gridSize) * gridSize;
 }
 
+bool GeometryConverter::isAligned(double value, double gridSize) noexcept {
+    // Distance to the nearest grid line, so values just below a line pass too.
+    return std::abs(value - roundToGrid(value, gridSize)) <= EPSILON;
+}
+
 std::vector<std::array<double, 3>> GeometryConverter::alignToGrid(
     const std::vector<std::array<double, 3>>& points,
     double gridSize) noexcept {
     
-    std::vector<std::array<double, 3>> aligned;
-    aligned.reserve(points.size());
-
-    for (const auto& point : points) {
-        aligned.push_back({
-            roundToGrid(point[0], gridSize),
-            roundToGrid(point[1], gridSize),
-            point[2]  // Z coordinate not grid-aligned as per requirements
-        });
-    }
-
+    std::vector<std::array<double, 3>> aligned(points);
+    alignToGridInPlace(reinterpret_cast<double*>(aligned.data()), aligned.size(), gridSize);
     return aligned;
 }
 
@@ -32,15 +32,58 @@ bool GeometryConverter::validateGridAlignment(
     const std::vector<std::array<double, 3>>& points,
     double gridSize) noexcept {
     
-    for (const auto& point : points) {
-        double xRemainder = std::fmod(point[0], gridSize);
-        double yRemainder = std::fmod(point[1], gridSize);
-        
-        if (std::abs(xRemainder) > EPSILON || std::abs(yRemainder) > EPSILON) {
-            return false;
+    return validateGridAlignment(
+        reinterpret_cast<const double*>(points.data()), points.size(), gridSize);
+}
+
+void GeometryConverter::alignToGrid(
+    const double* points, double* out, std::size_t count,
+    double gridSize) noexcept {
+
+    const auto n = static_cast<std::ptrdiff_t>(count);
+#ifdef _OPENMP
+    #pragma omp parallel for schedule(static) if (count >= PARALLEL_THRESHOLD)
+#endif
+    for (std::ptrdiff_t i = 0; i < n; ++i) {
+        const double* point = points + 3 * i;
+        double* result = out + 3 * i;
+        result[0] = roundToGrid(point[0], gridSize);
+        result[1] = roundToGrid(point[1], gridSize);
+        result[2] = point[2];  // Z coordinate not grid-aligned as per requirements
+    }
+}
+
+void GeometryConverter::alignToGridInPlace(
+    double* points, std::size_t count, double gridSize) noexcept {
+    alignToGrid(points, points, count, gridSize);
+}
+
+bool GeometryConverter::validateGridAlignment(
+    const double* points, std::size_t count, double gridSize) noexcept {
+
+    if (count < PARALLEL_THRESHOLD) {
+        for (std::size_t i = 0; i < count; ++i) {
+            const double* point = points + 3 * i;
+            if (!isAligned(point[0], gridSize) || !isAligned(point[1], gridSize)) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    // Large sets: count misaligned points in parallel instead of stopping early.
+    const auto n = static_cast<std::ptrdiff_t>(count);
+    std::ptrdiff_t misaligned = 0;
+#ifdef _OPENMP
+    #pragma omp parallel for schedule(static) reduction(+ : misaligned)
+#endif
+    for (std::ptrdiff_t i = 0; i < n; ++i) {
+        const double* point = points + 3 * i;
+        if (!isAligned(point[0], gridSize) || !isAligned(point[1], gridSize)) {
+            ++misaligned;
         }
     }
-    return true;
+    return misaligned == 0;
 }
 
 std::vector<std::array<double, 3>> GeometryConverter::toGeos(
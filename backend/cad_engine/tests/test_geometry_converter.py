@@ -0,0 +1,80 @@
+"""EuroTempl System
+Copyright (c) 2024 Pygmalion Records"""
+
+import numpy as np
+import pytest
+
+eurotempl_core = pytest.importorskip("eurotempl_core")
+GeometryConverter = eurotempl_core.GeometryConverter
+
+
+def test_align_array_returns_new_array():
+    points = np.array([[12.0, 38.0, 7.0], [25.0, 50.0, 1.0]])
+    aligned = GeometryConverter.align_to_grid(points)
+
+    assert isinstance(aligned, np.ndarray)
+    assert aligned.tolist() == [[0.0, 50.0, 7.0], [25.0, 50.0, 1.0]]
+    assert points[0, 0] == 12.0  # input untouched
+
+
+def test_align_array_in_place():
+    points = np.array([[12.0, 38.0, 7.0], [-13.0, 0.0, 3.0]])
+    GeometryConverter.align_to_grid_inplace(points)
+
+    assert points.tolist() == [[0.0, 50.0, 7.0], [-25.0, 0.0, 3.0]]
+    assert GeometryConverter.validate_grid_alignment(points)
+
+    points.flags.writeable = False
+    with pytest.raises(ValueError):
+        GeometryConverter.align_to_grid_inplace(points)
+
+
+def test_array_and_list_overloads_agree():
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-1000.0, 1000.0, (100, 3))
+
+    assert GeometryConverter.align_to_grid(points).tolist() == \
+        GeometryConverter.align_to_grid(points.tolist())
+    assert GeometryConverter.validate_grid_alignment(points) is False
+    assert GeometryConverter.validate_grid_alignment([[24.9999999, 0.0, 0.0]]) is True
+
+
+def test_large_arrays_use_parallel_path():
+    points = np.random.default_rng(1).integers(-4000, 4000, (200_000, 3)) * 25.0
+    assert GeometryConverter.validate_grid_alignment(points)
+    points[-1, 1] += 1.0
+    assert not GeometryConverter.validate_grid_alignment(points)
+
+
+def test_array_shape_checked():
+    with pytest.raises(ValueError, match=r"\(N, 3\)"):
+        GeometryConverter.align_to_grid(np.zeros((4, 2)))
+
+
+@pytest.mark.parametrize("make", [
+    lambda points: np.asfortranarray(points),
+    lambda points: points.astype(np.int64),
+    lambda points: np.repeat(points, 2, axis=1)[:, ::2],
+    lambda points: points[::2],
+], ids=["fortran", "int64", "strided-columns", "strided-rows"])
+def test_non_contiguous_arrays_return_arrays(make):
+    points = np.random.default_rng(2).integers(-400, 400, (50, 3)).astype(np.float64)
+    points[::3] *= 25.0
+    expected = GeometryConverter.align_to_grid(np.ascontiguousarray(make(points).astype(np.float64)))
+    aligned = GeometryConverter.align_to_grid(make(points))
+
+    assert isinstance(aligned, np.ndarray)
+    assert aligned.flags.c_contiguous
+    assert aligned.tolist() == expected.tolist()
+    assert GeometryConverter.validate_grid_alignment(make(aligned.copy()))
+    assert GeometryConverter.validate_grid_alignment(make(points)) is \
+        GeometryConverter.validate_grid_alignment(make(points).tolist())
+
+
+def test_in_place_alignment_rejects_converted_layouts():
+    points = np.asfortranarray([[12.0, 38.0, 7.0], [-13.0, 0.0, 3.0]])
+    with pytest.raises(TypeError, match="C-contiguous float64"):
+        GeometryConverter.align_to_grid_inplace(points)
+    with pytest.raises(TypeError, match="C-contiguous float64"):
+        GeometryConverter.align_to_grid_inplace(np.zeros((2, 3), dtype=np.int64))
+    assert points.tolist() == [[12.0, 38.0, 7.0], [-13.0, 0.0, 3.0]]
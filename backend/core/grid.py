@@ -0,0 +1,161 @@
+"""EuroTempl System
+Copyright (c) 2024 Pygmalion Records
+
+Vectorized 25mm grid-alignment checks for geometries.
+
+All vertices of a geometry, whatever its type, are read into one NumPy
+array straight from its WKB serialization: coordinate blocks are viewed
+in place with np.frombuffer, so single-part geometries are not copied at
+all. Alignment of every ring and part is then checked in one vectorized
+operation.
+"""
+
+import struct
+from typing import TYPE_CHECKING, List, Sequence, Union
+
+import numpy as np
+from django.core.exceptions import ValidationError
+
+if TYPE_CHECKING:
+    from django.contrib.gis.geos import GEOSGeometry
+
+GRID_SIZE = 25
+TOLERANCE = 1e-9
+
+# Flag bits of extended (EWKB) geometry type codes.
+_EWKB_Z = 0x80000000
+_EWKB_M = 0x40000000
+_EWKB_SRID = 0x20000000
+
+_POINT, _LINESTRING, _POLYGON = 1, 2, 3
+_COLLECTIONS = {4, 5, 6, 7}  # Multi* and GeometryCollection
+
+
+def geometry_coordinates(geometry: Union['GEOSGeometry', bytes, memoryview]) -> np.ndarray:
+    """
+    Get every vertex of a geometry as an (N, 3) float64 array.
+
+    Vertices are listed in WKB order: ring by ring and part by part,
+    closing vertices included. The z column is NaN for 2D geometries and
+    M values are dropped.
+
+    Args:
+        geometry (Union[GEOSGeometry, bytes, memoryview]): A geometry, or
+            its WKB or EWKB serialization.
+
+    Returns:
+        np.ndarray: The vertices; read-only when viewed in place.
+
+    Raises:
+        ValueError: If the WKB contains an unsupported geometry type.
+    """
+    buffer = geometry if isinstance(geometry, (bytes, bytearray, memoryview)) else geometry.wkb
+    blocks: List[np.ndarray] = []
+    _read_geometry(buffer, 0, blocks)
+    if not blocks:
+        return np.empty((0, 3))
+    if len(blocks) == 1:
+        return blocks[0]
+    return np.concatenate(blocks)
+
+
+def misaligned_vertices(geometry: Union['GEOSGeometry', bytes, memoryview, np.ndarray],
+                        grid: float = GRID_SIZE, tolerance: float = TOLERANCE,
+                        axes: Sequence[int] = (0, 1)) -> np.ndarray:
+    """
+    Find the vertices that are off the grid.
+
+    Args:
+        geometry (Union[GEOSGeometry, bytes, memoryview, np.ndarray]): A
+            geometry, its WKB, or vertices from geometry_coordinates().
+        grid (float): Grid spacing.
+        tolerance (float): Largest distance from a grid line still
+            considered aligned.
+        axes (Sequence[int]): Coordinate axes to check; x and y by default,
+            as the EuroTempl grid is planar.
+
+    Returns:
+        np.ndarray: Indices of the offending vertices, in the order of
+            geometry_coordinates().
+    """
+    coords = geometry if isinstance(geometry, np.ndarray) else geometry_coordinates(geometry)
+    remainder = np.remainder(coords[:, list(axes)], grid)
+    distance = np.minimum(remainder, grid - remainder)
+    return np.flatnonzero((distance > tolerance).any(axis=1))
+
+
+def validate_grid_alignment(geometry: 'GEOSGeometry', field: str, message: str) -> None:
+    """
+    Validate that every vertex of a geometry lies on the 25mm grid.
+
+    Args:
+        geometry (GEOSGeometry): The geometry to check; None and empty
+            geometries pass.
+        field (str): Model field the error is reported on.
+        message (str): Error message.
+
+    Raises:
+        ValidationError: If any vertex is off the grid; the message lists
+            the first offending vertex indices.
+    """
+    if geometry is None or geometry.empty:
+        return
+    offending = misaligned_vertices(geometry)
+    if offending.size:
+        shown = ', '.join(str(index) for index in offending[:10])
+        more = ', ...' if offending.size > 10 else ''
+        raise ValidationError({field: f"{message} (vertices {shown}{more})"})
+
+
+def _read_geometry(buffer, offset: int, blocks: List[np.ndarray]) -> int:
+    """Append the coordinate blocks of the geometry at offset; return its end."""
+    endian = '<' if buffer[offset] == 1 else '>'
+    (type_code,) = struct.unpack_from(endian + 'I', buffer, offset + 1)
+    offset += 5
+    has_z = bool(type_code & _EWKB_Z)
+    has_m = bool(type_code & _EWKB_M)
+    if type_code & _EWKB_SRID:
+        offset += 4
+    type_code &= 0x0FFFFFFF
+    if type_code >= 1000:  # ISO WKB: 1000s are Z, 2000s M, 3000s ZM
+        flavor, type_code = divmod(type_code, 1000)
+        has_z = has_z or flavor in (1, 3)
+        has_m = has_m or flavor in (2, 3)
+    dims = 2 + has_z + has_m
+    dtype = np.dtype(endian + 'f8')
+
+    def read_block(count: int, start: int) -> int:
+        if count:
+            block = np.frombuffer(buffer, dtype=dtype, count=count * dims, offset=start)
+            blocks.append(_xyz(block.reshape(count, dims), has_z))
+        return start + 8 * dims * count
+
+    if type_code == _POINT:
+        point = np.frombuffer(buffer, dtype=dtype, count=dims, offset=offset)
+        if not np.isnan(point[:2]).all():  # Empty points are stored as NaN
+            blocks.append(_xyz(point.reshape(1, dims), has_z))
+        return offset + 8 * dims
+    if type_code == _LINESTRING:
+        (count,) = struct.unpack_from(endian + 'I', buffer, offset)
+        return read_block(count, offset + 4)
+    if type_code == _POLYGON:
+        (rings,) = struct.unpack_from(endian + 'I', buffer, offset)
+        offset += 4
+        for _ in range(rings):
+            (count,) = struct.unpack_from(endian + 'I', buffer, offset)
+            offset = read_block(count, offset + 4)
+        return offset
+    if type_code in _COLLECTIONS:
+        (parts,) = struct.unpack_from(endian + 'I', buffer, offset)
+        offset += 4
+        for _ in range(parts):
+            offset = _read_geometry(buffer, offset, blocks)
+        return offset
+    raise ValueError(f"Unsupported WKB geometry type {type_code}")
+
+
+def _xyz(block: np.ndarray, has_z: bool) -> np.ndarray:
+    """Reduce a coordinate block to x, y, z columns, viewing it if possible."""
+    if has_z:
+        return block[:, :3]
+    return np.column_stack([block[:, :2], np.full(len(block), np.nan)])
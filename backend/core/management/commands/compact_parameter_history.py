@@ -0,0 +1,130 @@
+"""EuroTempl System
+Copyright (c) 2024 Pygmalion Records
+
+Management command compacting old parameter value history.
+
+History older than the retention window is reduced to one snapshot per
+(instance, parameter, day): the latest valid record of that day, or the
+latest record if none was valid. Records that are the current value of a
+parameter are never removed. Deletes are issued day by day in small
+batches, each in its own transaction, so the table is never locked for
+long and the work can be interrupted and resumed at any time.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+# Rows of one day beyond the first per (instance, parameter), ranked so
+# that the latest valid record comes first.
+SUPERSEDED_ROWS = """
+    SELECT ranked.id, ranked.recorded_at
+      FROM (
+          SELECT id, recorded_at,
+                 row_number() OVER (
+                     PARTITION BY instance_id, parameter_id
+                     ORDER BY validation_status = 'valid' DESC, recorded_at DESC
+                 ) AS position
+            FROM et_parameter_value
+           WHERE recorded_at >= %(day)s AND recorded_at < %(next_day)s
+      ) AS ranked
+     WHERE ranked.position > 1
+       AND NOT EXISTS (
+           SELECT 1 FROM et_parameter_current_value AS current
+            WHERE current.history_id = ranked.id
+       )
+"""
+
+DELETE_BATCH = f"""
+    WITH doomed AS ({SUPERSEDED_ROWS} LIMIT %(batch_size)s)
+    DELETE FROM et_parameter_value AS value
+     USING doomed
+     WHERE value.id = doomed.id AND value.recorded_at = doomed.recorded_at
+"""
+
+COUNT_SUPERSEDED = f"SELECT count(*) FROM ({SUPERSEDED_ROWS}) AS superseded"
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+NEXT_DAY_WITH_HISTORY = """
+    SELECT min(recorded_at) FROM et_parameter_value
+     WHERE recorded_at >= %s AND recorded_at < %s
+"""
+
+
+class Command(BaseCommand):
+    help = "Compact parameter value history older than the retention window to daily snapshots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-days', type=int, default=30,
+            help="Keep the full history of the last N days (default: 30)"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Maximum number of rows deleted per transaction (default: 1000)"
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Only report how many rows would be removed"
+        )
+
+    def handle(self, *args, **options):
+        if options['keep_days'] < 0:
+            raise CommandError("--keep-days must not be negative")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        cutoff = self._start_of_day(timezone.now() - timedelta(days=options['keep_days']))
+        removed = 0
+        day = self._next_day_with_history(EPOCH, cutoff)
+        while day is not None:
+            next_day = day + timedelta(days=1)
+            if options['dry_run']:
+                removed += self._count_superseded(day, next_day)
+            else:
+                removed += self._compact_day(day, next_day, options['batch_size'])
+            day = self._next_day_with_history(next_day, cutoff)
+
+        verb = "Would remove" if options['dry_run'] else "Removed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {removed} superseded parameter value(s) recorded before {cutoff:%Y-%m-%d}"
+        ))
+
+    @staticmethod
+    def _start_of_day(moment):
+        """Truncate an aware datetime to midnight UTC."""
+        return moment.astimezone(dt_timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+    def _next_day_with_history(self, start, cutoff):
+        """Return the first day at or after `start` with history before `cutoff`."""
+        with connection.cursor() as cursor:
+            cursor.execute(NEXT_DAY_WITH_HISTORY, [start, cutoff])
+            (recorded_at,) = cursor.fetchone()
+        return self._start_of_day(recorded_at) if recorded_at is not None else None
+
+    @staticmethod
+    def _count_superseded(day, next_day) -> int:
+        """Count the rows of one day that compaction would remove."""
+        with connection.cursor() as cursor:
+            cursor.execute(COUNT_SUPERSEDED, {'day': day, 'next_day': next_day})
+            (count,) = cursor.fetchone()
+        return count
+
+    @staticmethod
+    def _compact_day(day, next_day, batch_size: int) -> int:
+        """Delete the superseded rows of one day in batches."""
+        removed = 0
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(DELETE_BATCH, {
+                    'day': day, 'next_day': next_day, 'batch_size': batch_size
+                })
+                deleted = cursor.rowcount
+            removed += deleted
+            if deleted < batch_size:
+                return removed
@@ -0,0 +1,42 @@
+"""EuroTempl System
+Copyright (c) 2024 Pygmalion Records
+
+Management command creating upcoming monthly partitions of the parameter
+value history. Run it periodically (e.g. daily from cron) so rows never
+land in the default partition.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = "Create monthly et_parameter_value partitions ahead of time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int, default=3,
+            help="Number of months ahead of the current one to create (default: 3)"
+        )
+
+    def handle(self, *args, **options):
+        if options['months'] < 1:
+            raise CommandError("--months must be positive")
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT et_parameter_value_ensure_partition(month_at)
+                  FROM generate_series(
+                      date_trunc('month', now()),
+                      date_trunc('month', now()) + make_interval(months => %s),
+                      interval '1 month'
+                  ) AS month_at
+                """,
+                [options['months']]
+            )
+            partitions = [name for (name,) in cursor.fetchall()]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Ensured partitions: {', '.join(partitions)}"
+        ))
@@ -0,0 +1,61 @@
+"""EuroTempl System
+Copyright (c) 2024 Pygmalion Records
+
+Management command recomputing spatial bounding boxes in the database.
+
+Each table is updated with a single set-based UPDATE that derives the box
+from the 3D extent of the row's geometry, so no geometry is loaded into
+Python. The box is built with ST_MakeEnvelope rather than ST_Envelope so
+that points and axis-aligned lines still yield a polygon.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import ComponentInstance, Connection
+
+# Model and geometry field of every model with a spatial_bbox.
+MODELS = {
+    'instance': (ComponentInstance, 'spatial_data'),
+    'connection': (Connection, 'spatial_relationship'),
+}
+
+UPDATE_BBOXES = """
+    UPDATE {table}
+       SET spatial_bbox = ST_MakeEnvelope(
+               ST_XMin(Box3D({geometry})), ST_YMin(Box3D({geometry})),
+               ST_XMax(Box3D({geometry})), ST_YMax(Box3D({geometry})),
+               ST_SRID({geometry})
+           )
+     WHERE {geometry} IS NOT NULL
+"""
+
+
+class Command(BaseCommand):
+    help = "Recompute spatial_bbox of component instances and connections with set-based SQL."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', choices=sorted(MODELS), action='append',
+            help="Only recompute boxes of this model (repeatable; default: all)"
+        )
+        parser.add_argument(
+            '--missing-only', action='store_true',
+            help="Only fill in rows without a bounding box"
+        )
+
+    def handle(self, *args, **options):
+        for name in options['model'] or sorted(MODELS):
+            model, field_name = MODELS[name]
+            sql = UPDATE_BBOXES.format(
+                table=connection.ops.quote_name(model._meta.db_table),
+                geometry=connection.ops.quote_name(model._meta.get_field(field_name).column),
+            )
+            if options['missing_only']:
+                sql += " AND spatial_bbox IS NULL"
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql)
+                updated = cursor.rowcount
+            self.stdout.write(self.style.SUCCESS(
+                f"Recomputed {updated} {model._meta.verbose_name} bounding box(es)"
+            ))
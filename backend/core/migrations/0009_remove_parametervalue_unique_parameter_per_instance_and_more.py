@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+POPULATE_CURRENT_VALUES = """
+INSERT INTO et_parameter_current_value
+    (instance_id, parameter_id, history_id, value, recorded_at, modified_by_id, modified_at)
+SELECT DISTINCT ON (instance_id, parameter_id)
+    instance_id, parameter_id, id, value, recorded_at, modified_by_id, modified_at
+FROM et_parameter_value
+WHERE validation_status = 'valid'
+ORDER BY instance_id, parameter_id, recorded_at DESC
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0008_remove_connection_prevent_duplicate_connections_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='parametervalue',
+            name='unique_parameter_per_instance',
+        ),
+        migrations.CreateModel(
+            name='CurrentParameterValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.JSONField(help_text='The current value of the parameter')),
+                ('recorded_at', models.DateTimeField(help_text='When the current value was recorded')),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('history', models.ForeignKey(help_text='History record this value was taken from', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.parametervalue')),
+                ('instance', models.ForeignKey(help_text='Reference to the component instance', on_delete=django.db.models.deletion.CASCADE, related_name='current_parameter_values', to='core.componentinstance')),
+                ('modified_by', models.ForeignKey(help_text='User who last modified the value', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('parameter', models.ForeignKey(help_text='Reference to the parameter definition', on_delete=django.db.models.deletion.CASCADE, related_name='current_values', to='core.parameter')),
+            ],
+            options={
+                'db_table': 'et_parameter_current_value',
+                'indexes': [models.Index(fields=['parameter', 'recorded_at'], name='et_paramete_paramet_9f1c1d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('instance', 'parameter'), name='unique_current_value_per_instance')],
+            },
+        ),
+        migrations.RunSQL(POPULATE_CURRENT_VALUES, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_remove_parametervalue_unique_parameter_per_instance_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parametervalue',
+            index=models.Index(condition=models.Q(('validation_status', 'valid')), fields=['instance', 'parameter', '-recorded_at'], include=('value',), name='et_param_value_latest_valid'),
+        ),
+    ]
@@ -0,0 +1,135 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Creates the monthly partition of et_parameter_value containing `month_at`.
+# Used by this migration and by the create_parameter_value_partitions command.
+ENSURE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION et_parameter_value_ensure_partition(month_at timestamptz)
+RETURNS text AS $$
+DECLARE
+    start_at timestamptz := date_trunc('month', month_at);
+    partition_name text := 'et_parameter_value_' || to_char(start_at, 'YYYY_MM');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF et_parameter_value '
+        'FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_at, start_at + interval '1 month'
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def rebuild_table_sql(create_table: str, primary_key: str, after_create: str = "") -> str:
+    """
+    Build SQL rebuilding et_parameter_value with a new storage layout.
+
+    Secondary indexes and foreign keys are captured from the existing
+    table and recreated with their original names after the rows are
+    copied, so Django's migration state stays accurate.
+    """
+    return f"""
+DO $$
+DECLARE
+    index_names text[];
+    index_defs text[];
+    fk_names text[];
+    fk_defs text[];
+    pk_name text;
+    i integer;
+BEGIN
+    ALTER TABLE et_parameter_value RENAME TO et_parameter_value_old;
+
+    SELECT array_agg(c.relname), array_agg(pg_get_indexdef(x.indexrelid))
+      INTO index_names, index_defs
+      FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid
+     WHERE x.indrelid = 'et_parameter_value_old'::regclass AND NOT x.indisprimary;
+    SELECT array_agg(conname), array_agg(pg_get_constraintdef(oid))
+      INTO fk_names, fk_defs
+      FROM pg_constraint
+     WHERE conrelid = 'et_parameter_value_old'::regclass AND contype = 'f';
+    SELECT conname INTO pk_name
+      FROM pg_constraint
+     WHERE conrelid = 'et_parameter_value_old'::regclass AND contype = 'p';
+
+    FOR i IN 1 .. coalesce(array_length(index_names, 1), 0) LOOP
+        EXECUTE format('DROP INDEX %I', index_names[i]);
+    END LOOP;
+    FOR i IN 1 .. coalesce(array_length(fk_names, 1), 0) LOOP
+        EXECUTE format('ALTER TABLE et_parameter_value_old DROP CONSTRAINT %I', fk_names[i]);
+    END LOOP;
+    EXECUTE format('ALTER TABLE et_parameter_value_old DROP CONSTRAINT %I', pk_name);
+
+    {create_table};
+    ALTER TABLE et_parameter_value ADD PRIMARY KEY ({primary_key});
+    {after_create}
+
+    INSERT INTO et_parameter_value SELECT * FROM et_parameter_value_old;
+    DROP TABLE et_parameter_value_old;
+
+    FOR i IN 1 .. coalesce(array_length(index_defs, 1), 0) LOOP
+        EXECUTE regexp_replace(
+            index_defs[i], ' ON (ONLY )?(\\S+\\.)?et_parameter_value_old ', ' ON \\2et_parameter_value '
+        );
+    END LOOP;
+    FOR i IN 1 .. coalesce(array_length(fk_names, 1), 0) LOOP
+        EXECUTE format('ALTER TABLE et_parameter_value ADD CONSTRAINT %I %s', fk_names[i], fk_defs[i]);
+    END LOOP;
+END $$;
+"""
+
+
+PARTITION_TABLE = rebuild_table_sql(
+    create_table=(
+        "CREATE TABLE et_parameter_value "
+        "(LIKE et_parameter_value_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (recorded_at)"
+    ),
+    # Unique constraints on a partitioned table must include the partition key.
+    primary_key="id, recorded_at",
+    after_create="""
+    CREATE TABLE et_parameter_value_default PARTITION OF et_parameter_value DEFAULT;
+    PERFORM et_parameter_value_ensure_partition(month_at)
+       FROM generate_series(
+           date_trunc('month', coalesce(
+               (SELECT min(recorded_at) FROM et_parameter_value_old), now()
+           )),
+           date_trunc('month', now()) + interval '3 months',
+           interval '1 month'
+       ) AS month_at;
+    """,
+)
+
+UNPARTITION_TABLE = rebuild_table_sql(
+    create_table=(
+        "CREATE TABLE et_parameter_value "
+        "(LIKE et_parameter_value_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ),
+    primary_key="id",
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_parametervalue_et_param_value_latest_valid'),
+    ]
+
+    operations = [
+        # A partitioned table cannot have a unique index on id alone, so the
+        # reference from current values is no longer enforced by the database.
+        migrations.AlterField(
+            model_name='currentparametervalue',
+            name='history',
+            field=models.ForeignKey(db_constraint=False, help_text='History record this value was taken from', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.parametervalue'),
+        ),
+        # Statements are passed as lists so the dollar-quoted bodies are
+        # executed as-is rather than split on semicolons.
+        migrations.RunSQL(
+            [ENSURE_PARTITION_FUNCTION],
+            ["DROP FUNCTION et_parameter_value_ensure_partition(timestamptz)"],
+        ),
+        migrations.RunSQL([PARTITION_TABLE], [UNPARTITION_TABLE]),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_partition_parametervalue_by_month'),
+    ]
+
+    operations = [
+        # Start the sequence after the highest internal_id already handed out.
+        migrations.RunSQL(
+            sql=[
+                "CREATE SEQUENCE et_component_instance_internal_id_seq AS integer "
+                "OWNED BY et_component_instance.internal_id",
+                "SELECT setval('et_component_instance_internal_id_seq', "
+                "COALESCE((SELECT max(internal_id) FROM et_component_instance), 0) + 1, false)",
+            ],
+            reverse_sql=["DROP SEQUENCE et_component_instance_internal_id_seq"],
+        ),
+        migrations.AlterField(
+            model_name='componentinstance',
+            name='internal_id',
+            field=models.IntegerField(db_default=models.Func(models.Value('et_component_instance_internal_id_seq'), function='nextval', output_field=models.IntegerField()), db_index=True, help_text='Internal sequential identifier for performance optimization', unique=True),
+        ),
+    ]
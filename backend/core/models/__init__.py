@@ -4,6 +4,7 @@ from .material_requirement import MaterialRequirement
 from .documentation import Documentation
 from .instance import ComponentInstance, ComponentStatus
 from .value import ParameterValue
+from .current_value import CurrentParameterValue
 from .connection import Connection, ConnectionType, ConnectionStatus
 
 __all__ = [
@@ -14,6 +15,7 @@ __all__ = [
     'ComponentInstance',
     'ComponentStatus',
     'ParameterValue',
+    'CurrentParameterValue',
     'Connection',
     'ConnectionType',
     'ConnectionStatus',
@@ -6,13 +6,46 @@ This model defines the foundational entity for modular components,
 encapsulating their core characteristics and properties.
 """
 
-from django.db import models
+import copy
+from django.db import models, transaction
 from django.db.models import JSONField
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 import uuid
+import numpy as np
 import semver
 from django.contrib.gis.db import models as gis_models
+from django.contrib.gis.geos import GEOSGeometry, LineString, Point, Polygon
+from ..grid import geometry_coordinates, misaligned_vertices, validate_grid_alignment
+
+# Instances inserted per INSERT statement by Component.create_instances().
+INSTANCE_BATCH_SIZE = 1000
+
+
+def _translate_geometry(geometry: GEOSGeometry, offset: np.ndarray) -> GEOSGeometry:
+    """
+    Return a copy of a geometry moved by an offset.
+
+    Args:
+        geometry (GEOSGeometry): The geometry to move.
+        offset (np.ndarray): (dx, dy, dz) offset; only the components
+            matching the geometry's dimensions are applied.
+
+    Returns:
+        GEOSGeometry: The moved geometry, with the same SRID.
+    """
+    if isinstance(geometry, Point):
+        coords = np.add(geometry.coords, offset[:len(geometry.coords)])
+        moved = Point(*coords.tolist())
+    elif isinstance(geometry, LineString):  # Also covers LinearRing
+        coords = np.asarray(geometry.coords, dtype=np.float64)
+        moved = type(geometry)(coords + offset[:coords.shape[1]])
+    elif isinstance(geometry, Polygon):
+        moved = Polygon(*[_translate_geometry(ring, offset) for ring in geometry])
+    else:  # GeometryCollection and the Multi* geometries
+        moved = type(geometry)(*[_translate_geometry(part, offset) for part in geometry])
+    moved.srid = geometry.srid
+    return moved
 
 class Component(gis_models.Model):
     """
@@ -146,16 +179,9 @@ class Component(gis_models.Model):
         Raises:
             ValidationError: If the geometry does not align with the 25mm grid system.
         """
-        if not self.base_geometry:
-            return
-            
-        coords = self.base_geometry.coords
-        for coord in coords[0]:  # Check first ring coordinates
-            x, y, z = coord
-            if any(c % 25 != 0 for c in (x, y)):  # Only check x,y alignment !
-                raise ValidationError({
-                    'base_geometry': 'Geometry must align with 25mm grid system'
-                })
+        validate_grid_alignment(
+            self.base_geometry, 'base_geometry', 'Geometry must align with 25mm grid system'
+        )
 
     def save(self, *args, **kwargs):
         """
@@ -186,20 +212,92 @@ class Component(gis_models.Model):
         """
         from .instance import ComponentInstance, ComponentStatus  # Avoid circular import
         
-        last_internal_id = ComponentInstance.objects.all().order_by('-internal_id').first()
-        next_internal_id = (last_internal_id.internal_id + 1) if last_internal_id else 1
-        
         instance = ComponentInstance.objects.create(
             component=self,
             spatial_data=self.base_geometry,
-            spatial_bbox=self.base_geometry.envelope,
             instance_properties={"finish": "matte"},
             status=ComponentStatus.PLANNED.value,
-            version=1,
-            internal_id=next_internal_id
+            version=1
         )
         return instance
 
+    def create_instances(self, n, placements=None, instance_properties=None):
+        """
+        Create many ComponentInstances from this component definition at once.
+
+        The batch is validated once instead of per instance: the first
+        instance goes through the same full_clean() as save(), which covers
+        every check that does not change with the placement, and the grid
+        alignment of all translated vertices is then checked in one
+        vectorized pass with the shared grid tolerance. Geometries and
+        bounding boxes are computed in memory exactly as save() would and all
+        instances are inserted with bulk_create in one transaction; their
+        internal_ids come from the database sequence in the same statements.
+
+        Args:
+            n (int): Number of instances to create.
+            placements (Optional[Sequence[Tuple[float, float, float]]]):
+                (dx, dy, dz) offset of each instance from the base geometry.
+                All instances are placed at the base geometry if None.
+            instance_properties (Optional[dict]): Properties copied to every
+                instance. Defaults to those used by create_instance().
+
+        Returns:
+            List[ComponentInstance]: The created instances, in placement order.
+
+        Raises:
+            ValueError: If n is negative or placements do not hold one
+                offset per instance.
+            ValidationError: If the geometry is invalid, a placement is off
+                the grid, or the properties are not a dictionary.
+        """
+        from .instance import ComponentInstance, ComponentStatus, bounding_box  # Avoid circular import
+
+        if n < 0:
+            raise ValueError("Number of instances must not be negative")
+        if placements is None:
+            offsets = np.zeros((n, 3))
+        else:
+            offsets = np.asarray(placements, dtype=np.float64)
+            if offsets.shape != (n, 3):
+                raise ValueError("placements must hold one (dx, dy, dz) offset per instance")
+        if n == 0:
+            return []
+        if instance_properties is None:
+            instance_properties = {"finish": "matte"}
+
+        if not self.base_geometry or not self.base_geometry.valid:
+            raise ValidationError({
+                'spatial_data': 'Must provide valid 3D geometric data'
+            })
+        vertices = geometry_coordinates(self.base_geometry)
+        moved = (vertices[np.newaxis, :, :] + offsets[:, np.newaxis, :]).reshape(-1, 3)
+        misaligned = np.unique(misaligned_vertices(moved) // len(vertices))
+        if misaligned.size:
+            raise ValidationError({
+                'spatial_data': f'Placements {misaligned.tolist()} do not align with 25mm grid system'
+            })
+
+        instances = []
+        for offset in offsets:
+            geometry = _translate_geometry(self.base_geometry, offset)
+            instances.append(ComponentInstance(
+                component=self,
+                spatial_data=geometry,
+                spatial_bbox=bounding_box(geometry),
+                instance_properties=copy.deepcopy(instance_properties),
+                status=ComponentStatus.PLANNED.value,
+                version=1
+            ))
+        # Validity, field and property checks do not depend on the placement.
+        # The component is this saved object and ids come from uuid4 and the
+        # sequence, so lookups for them are skipped.
+        instances[0].full_clean(exclude=['internal_id', 'component'], validate_unique=False)
+        with transaction.atomic():
+            return ComponentInstance.objects.bulk_create(
+                instances, batch_size=INSTANCE_BATCH_SIZE
+            )
+
     def get_parameters(self):
         """
         Retrieve all parameters associated with this component.
@@ -13,6 +13,8 @@ from django.db import models
 from django.db.models import JSONField
 from django.core.exceptions import ValidationError
 from django.contrib.gis.db import models as gis_models
+from ..grid import validate_grid_alignment
+from .instance import bounding_box
 from django.core.validators import MinValueValidator
 import uuid
 from enum import Enum
@@ -177,17 +179,11 @@ class Connection(gis_models.Model):
             })
 
     def _validate_grid_alignment(self):
-        """Validate alignment with 25mm base grid."""
-        if not self.spatial_relationship:
-            return
-
-        coords = self.spatial_relationship.coords
-        for coord in coords[0]:
-            x, y, z = coord
-            if any(c % 25 != 0 for c in (x, y)):
-                raise ValidationError({
-                    'spatial_relationship': 'Connection points must align with 25mm grid system'
-                })
+        """Validate alignment of every vertex with 25mm base grid."""
+        validate_grid_alignment(
+            self.spatial_relationship, 'spatial_relationship',
+            'Connection points must align with 25mm grid system'
+        )
 
     def _validate_property_schema(self):
         """Validate connection properties conform to type-specific schemas."""
@@ -244,10 +240,14 @@ class Connection(gis_models.Model):
         self.save()
 
     def calculate_bounding_box(self):
-        """Calculate and update the spatial bounding box."""
+        """
+        Calculate the spatial bounding box in memory.
+
+        The box is stored by the next save(); computing it never writes to
+        the database itself.
+        """
         if self.spatial_relationship:
-            self.spatial_bbox = self.spatial_relationship.envelope3d
-            self.save(update_fields=['spatial_bbox'])
+            self.spatial_bbox = bounding_box(self.spatial_relationship)
 
     def save(self, *args, **kwargs):
         """Override save to ensure validation and bounding box calculation."""
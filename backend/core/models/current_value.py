@@ -0,0 +1,168 @@
+"""EuroTempl System
+Copyright (c) 2024 Pygmalion Records
+
+CurrentParameterValue model implementation for the EuroTempl system.
+This model materializes the latest valid value of every parameter of every
+component instance, so that reads of current state are a point lookup
+instead of a sort over the ParameterValue history.
+"""
+
+from django.db import connection, models
+from django.db.models import JSONField
+from django.utils import timezone
+from typing import Any, Iterable, List
+
+# The WHERE clause keeps a newer current value when an older record is
+# upserted after it, e.g. by a transaction that committed late.
+UPSERT_CURRENT_VALUES = """
+    INSERT INTO et_parameter_current_value AS current
+           (instance_id, parameter_id, history_id, value, recorded_at,
+            modified_by_id, modified_at)
+    VALUES {rows}
+        ON CONFLICT (instance_id, parameter_id) DO UPDATE
+       SET history_id = EXCLUDED.history_id,
+           value = EXCLUDED.value,
+           recorded_at = EXCLUDED.recorded_at,
+           modified_by_id = EXCLUDED.modified_by_id,
+           modified_at = EXCLUDED.modified_at
+     WHERE current.recorded_at <= EXCLUDED.recorded_at
+ RETURNING id, instance_id, parameter_id
+"""
+
+class CurrentParameterValue(models.Model):
+    """
+    The CurrentParameterValue model holds exactly one row per (instance, parameter)
+    pair: the latest valid ParameterValue recorded for it. ParameterValue remains
+    the append-only history; this table is kept in sync by upsert whenever a
+    valid value is recorded.
+    """
+
+    instance = models.ForeignKey(
+        'ComponentInstance',
+        on_delete=models.CASCADE,
+        related_name='current_parameter_values',
+        help_text="Reference to the component instance"
+    )
+
+    parameter = models.ForeignKey(
+        'Parameter',
+        on_delete=models.CASCADE,
+        related_name='current_values',
+        help_text="Reference to the parameter definition"
+    )
+
+    # ParameterValue is partitioned by recorded_at, so its id alone cannot
+    # back a database-level foreign key; deletes still cascade in Django.
+    history = models.ForeignKey(
+        'ParameterValue',
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='+',
+        help_text="History record this value was taken from"
+    )
+
+    value = JSONField(
+        help_text="The current value of the parameter"
+    )
+
+    recorded_at = models.DateTimeField(
+        help_text="When the current value was recorded"
+    )
+
+    modified_by = models.ForeignKey(
+        'auth.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        help_text="User who last modified the value"
+    )
+
+    modified_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'et_parameter_current_value'
+        indexes = [
+            models.Index(fields=['parameter', 'recorded_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['instance', 'parameter'],
+                name='unique_current_value_per_instance'
+            )
+        ]
+
+    @classmethod
+    def upsert(cls, history: Iterable['ParameterValue']) -> List['CurrentParameterValue']:
+        """
+        Make the given history records the current values of their parameters.
+
+        All rows are written with a single INSERT ... ON CONFLICT statement.
+        Records that are not valid are ignored, and so are records older
+        than the current value of their pair, so the latest record wins
+        whatever order concurrent writers commit in.
+
+        Args:
+            history: Saved ParameterValue records, at most one per
+                (instance, parameter) pair.
+
+        Returns:
+            List[CurrentParameterValue]: The rows actually inserted or
+                updated.
+        """
+        modified_at = timezone.now()
+        rows = {
+            (record.instance_id, record.parameter_id): cls(
+                instance_id=record.instance_id,
+                parameter_id=record.parameter_id,
+                history_id=record.pk,
+                value=record.value,
+                recorded_at=record.recorded_at,
+                modified_by_id=record.modified_by_id,
+                modified_at=modified_at
+            )
+            for record in history
+            if record.validation_status == 'valid'
+        }
+        if not rows:
+            return []
+
+        value_field = cls._meta.get_field('value')
+        params = []
+        for row in rows.values():
+            params.extend([
+                row.instance_id, row.parameter_id, row.history_id,
+                value_field.get_db_prep_save(row.value, connection),
+                row.recorded_at, row.modified_by_id, row.modified_at
+            ])
+        sql = UPSERT_CURRENT_VALUES.format(
+            rows=', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(rows))
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            written = cursor.fetchall()
+
+        upserted = []
+        for pk, instance_id, parameter_id in written:
+            row = rows[instance_id, parameter_id]
+            row.pk = pk
+            row._state.adding = False
+            upserted.append(row)
+        return upserted
+
+    def get_value(self) -> Any:
+        """
+        Retrieve the actual value from the JSONB field.
+
+        Returns:
+            Any: The parameter value
+        """
+        return self.value.get('value') if isinstance(self.value, dict) else self.value
+
+    def __str__(self) -> str:
+        """
+        String representation of the current value.
+
+        Returns:
+            str: A string describing the current value
+        """
+        return f"{self.parameter.name} = {self.get_value()} (current)"
@@ -4,14 +4,45 @@ Copyright (c) 2024 Pygmalion Records
 ComponentInstance model implementation for the EuroTempl system.
 """
 from django.utils import timezone
-from django.db import models
+from django.db import connection, models
 from django.db.models import JSONField
+from django.db.models.expressions import DatabaseDefault
 from django.core.exceptions import ValidationError
 from django.contrib.gis.db import models as gis_models
+from django.contrib.gis.geos import Polygon
+from ..grid import validate_grid_alignment
 from django.core.validators import MinValueValidator
 import uuid
 from enum import Enum
 
+# Database sequence allocating ComponentInstance.internal_id values.
+INTERNAL_ID_SEQUENCE = 'et_component_instance_internal_id_seq'
+
+# Moves the sequence past an explicitly assigned internal_id.
+ADVANCE_INTERNAL_ID_SEQUENCE = f"""
+    SELECT setval('{INTERNAL_ID_SEQUENCE}', GREATEST(last_value, %s))
+      FROM {INTERNAL_ID_SEQUENCE}
+"""
+
+
+def bounding_box(geometry):
+    """
+    Get the planar bounding box stored as a model's spatial_bbox.
+
+    Shared by component instances and connections.
+
+    Args:
+        geometry (GEOSGeometry): The instance or connection geometry.
+
+    Returns:
+        Polygon: Rectangle spanning the x/y extent of the geometry, in the
+            geometry's SRID.
+    """
+    box = Polygon.from_bbox(geometry.extent)
+    box.srid = geometry.srid
+    return box
+
+
 class ComponentStatus(str, Enum):
     """Enumeration of possible component instance statuses."""
     PLANNED = 'planned'
@@ -41,6 +72,11 @@ class ComponentInstance(gis_models.Model):
     internal_id = models.IntegerField(
         unique=True,
         db_index=True,
+        db_default=models.Func(
+            models.Value(INTERNAL_ID_SEQUENCE),
+            function='nextval',
+            output_field=models.IntegerField()
+        ),
         help_text="Internal sequential identifier for performance optimization"
     )
 
@@ -121,17 +157,10 @@ class ComponentInstance(gis_models.Model):
             })
 
     def _validate_grid_alignment(self):
-        """Validate alignment with 25mm base grid."""
-        if not self.spatial_data:
-            return
-
-        coords = self.spatial_data.coords
-        for coord in coords[0]:
-            x, y, z = coord
-            if any(c % 25 != 0 for c in (x, y)):
-                raise ValidationError({
-                    'spatial_data': 'Geometry must align with 25mm grid system'
-                })
+        """Validate alignment of every vertex with 25mm base grid."""
+        validate_grid_alignment(
+            self.spatial_data, 'spatial_data', 'Geometry must align with 25mm grid system'
+        )
 
     def _validate_property_schema(self):
         """Validate instance properties conform to component-defined schemas."""
@@ -165,35 +194,51 @@ class ComponentInstance(gis_models.Model):
 
     def create_new_version(self):
         """Create a new version of this instance."""
-        # Get the next available internal_id
-        last_internal_id = ComponentInstance.objects.all().order_by('-internal_id').first()
-        next_internal_id = (last_internal_id.internal_id + 1) if last_internal_id else 1
-    
         new_instance = ComponentInstance.objects.create(
             component=self.component,
             spatial_data=self.spatial_data,
             spatial_bbox=self.spatial_bbox,
             instance_properties=self.instance_properties,
             version=self.version + 1,
-            status=self.status,
-            internal_id=next_internal_id 
+            status=self.status
         )
         return new_instance
     def calculate_bounding_box(self):
-        """Calculate and update the spatial bounding box."""
+        """
+        Calculate the spatial bounding box in memory.
+
+        The box is stored by the next save(); computing it never writes to
+        the database itself.
+        """
         if self.spatial_data:
-            self.spatial_bbox = self.spatial_data.envelope3d
-            self.save(update_fields=['spatial_bbox'])
+            self.spatial_bbox = bounding_box(self.spatial_data)
 
     def save(self, *args, **kwargs):
-        """Override save to ensure validation, bounding box calculation, and internal_id."""
-        self.full_clean()
-        if self._state.adding:
-            last_internal_id = ComponentInstance.objects.all().order_by('-internal_id').first()
-            self.internal_id = (last_internal_id.internal_id + 1) if last_internal_id else 1
+        """
+        Override save to ensure validation, bounding box calculation, and internal_id.
+
+        New instances without an internal_id get one from a database
+        sequence, assigned by the INSERT itself and returned with it, so
+        concurrent inserts never collide and no extra query is needed. An
+        internal_id given by the caller is validated and kept, and the
+        sequence is moved past it so later allocations cannot collide.
+        """
+        allocate = self._state.adding and (
+            self.internal_id is None or isinstance(self.internal_id, DatabaseDefault)
+        )
+        if allocate:
+            self.internal_id = self._meta.get_field('internal_id').get_default()
+            # The sequence guarantees uniqueness; a lookup would consume a value.
+            self.full_clean(exclude=['internal_id'])
+        else:
+            self.full_clean()
+        explicit_id = self._state.adding and not allocate
         if not self.spatial_bbox and self.spatial_data:
             self.calculate_bounding_box()
         super().save(*args, **kwargs)
+        if explicit_id:
+            with connection.cursor() as cursor:
+                cursor.execute(ADVANCE_INTERNAL_ID_SEQUENCE, [self.internal_id])
 
     def __str__(self):
         """String representation of the component instance."""
@@ -6,12 +6,133 @@ This model defines parametric attributes that can be assigned to components,
 serving as a crucial element in implementing parametric design principles.
 """
 
+import math
 from django.db import models
 from django.db.models import JSONField
 from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator
+from django.utils.functional import cached_property
+import numpy as np
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+# Largest distance from a whole number of steps, in steps, still on step.
+STEP_TOLERANCE = 1e-10
+
+
+def is_on_step(value: float, step: float, origin: float = 0) -> bool:
+    """
+    Check that a value is a whole number of steps away from an origin.
+
+    This is the single step rule of the system: steps are counted from the
+    parameter's minimum (from 0 without one), and the 25mm grid is a step
+    of 25 counted from 0.
+
+    Args:
+        value (float): The value to check
+        step (float): The step size
+        origin (float): The value steps are counted from
+
+    Returns:
+        bool: True if the value is on a step
+    """
+    steps = (value - origin) / step
+    return abs(round(steps) - steps) < STEP_TOLERANCE
+
+
+class NumericRangeValidator:
+    """
+    Precompiled min/max/step check of a numeric value.
+
+    Used by Parameter.validate_value and by the parameters app's compiled
+    constraints, so both accept exactly the same values. It only answers
+    whether values are valid; callers produce the error messages.
+
+    When the step and the grid are whole numbers and the minimum is on
+    the step, the two are folded into one step (their least common
+    multiple), so a valid value costs one range comparison and one step
+    check.
+
+    Attributes:
+        low (float): Minimum allowed value.
+        high (float): Maximum allowed value.
+        lattices (tuple): (origin, step) pairs a value must be on.
+    """
+
+    __slots__ = ('low', 'high', 'lattices')
+
+    def __init__(self, min_value: Optional[float] = None, max_value: Optional[float] = None,
+                 step: Optional[float] = None, grid: Optional[float] = None):
+        """
+        Compile numeric constraints.
+
+        Args:
+            min_value (Optional[float]): Minimum allowed value.
+            max_value (Optional[float]): Maximum allowed value.
+            step (Optional[float]): Step size, counted from min_value.
+            grid (Optional[float]): Grid size, counted from 0.
+        """
+        self.low = float('-inf') if min_value is None else min_value
+        self.high = float('inf') if max_value is None else max_value
+        origin = 0 if min_value is None else min_value
+        lattices = []
+        if step is not None:
+            lattices.append((origin, step))
+        if grid is not None:
+            lattices.append((0, grid))
+        if (len(lattices) == 2
+                and all(float(number).is_integer() for number in (origin, step, grid))
+                and origin % step == 0):
+            lattices = [(0, math.lcm(int(step), int(grid)))]
+        self.lattices = tuple(lattices)
+
+    @classmethod
+    def from_valid_ranges(cls, valid_ranges: Dict[str, Any]) -> 'NumericRangeValidator':
+        """
+        Compile the min, max and step of a parameter's valid_ranges.
+
+        Args:
+            valid_ranges (Dict[str, Any]): The parameter's valid_ranges.
+
+        Returns:
+            NumericRangeValidator: The compiled constraints.
+        """
+        return cls(valid_ranges.get('min'), valid_ranges.get('max'), valid_ranges.get('step'))
+
+    def is_valid(self, value: float) -> bool:
+        """
+        Check every constraint in one pass.
+
+        Args:
+            value (float): The value to check
+
+        Returns:
+            bool: True if the value satisfies every numeric constraint
+        """
+        if not self.low <= value <= self.high:
+            return False
+        for origin, step in self.lattices:
+            if not is_on_step(value, step, origin):
+                return False
+        return True
+
+    def valid_mask(self, values: np.ndarray) -> np.ndarray:
+        """
+        Check many values at once; NaN and infinite values are invalid.
+
+        Args:
+            values (np.ndarray): One-dimensional float64 array.
+
+        Returns:
+            np.ndarray: Boolean array, True where the value is valid.
+        """
+        with np.errstate(invalid='ignore'):
+            mask = (values >= self.low) & (values <= self.high) & np.isfinite(values)
+            for origin, step in self.lattices:
+                steps = (values - origin) / step
+                mask &= np.abs(np.round(steps) - steps) < STEP_TOLERANCE
+        return mask
+
 
 class Parameter(models.Model):
     """
@@ -169,6 +290,8 @@ class Parameter(models.Model):
 
         # Range validation for numeric types
         if self.data_type in {'float', 'integer'} and self.valid_ranges:
+            if self._range_validator.is_valid(value):
+                return True
             min_val = self.valid_ranges.get('min')
             max_val = self.valid_ranges.get('max')
             step = self.valid_ranges.get('step')
@@ -185,6 +308,13 @@ class Parameter(models.Model):
 
         return True
 
+    @cached_property
+    def _range_validator(self) -> NumericRangeValidator:
+        """
+        Compiled numeric constraints, rebuilt after save() and refresh_from_db().
+        """
+        return NumericRangeValidator.from_valid_ranges(self.valid_ranges)
+
     def _is_valid_step(self, value: float, step: float, min_val: float) -> bool:
         """
         Check if a value follows the step constraint from the minimum value.
@@ -198,12 +328,7 @@ class Parameter(models.Model):
         Returns:
             bool: True if the value follows the step constraint
         """
-        if min_val is None:
-            min_val = 0
-        # Account for floating point precision issues
-        tolerance = 1e-10
-        steps_from_min = (value - min_val) / step
-        return abs(round(steps_from_min) - steps_from_min) < tolerance
+        return is_on_step(value, step, 0 if min_val is None else min_val)
 
     def get_values(self):
         """
@@ -218,9 +343,17 @@ class Parameter(models.Model):
         """
         Override save to ensure validation is always performed.
         """
+        self.__dict__.pop('_range_validator', None)
         self.full_clean()
         super().save(*args, **kwargs)
 
+    def refresh_from_db(self, *args, **kwargs):
+        """
+        Reload the parameter, dropping constraints compiled from old ranges.
+        """
+        self.__dict__.pop('_range_validator', None)
+        super().refresh_from_db(*args, **kwargs)
+
     def __str__(self) -> str:
         """
         String representation of the parameter.
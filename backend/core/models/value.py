@@ -6,18 +6,55 @@ This model represents the concrete values of parameters for specific component i
 serving as a bridge between abstract parameter definitions and their implementations.
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.db.models import JSONField
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 import uuid
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+class ParameterValueQuerySet(models.QuerySet):
+    """
+    QuerySet adding point-in-time queries over the parameter value history.
+    """
+
+    def as_of(self, moment: datetime,
+              instances: Optional[Iterable['ComponentInstance']] = None) -> 'ParameterValueQuerySet':
+        """
+        Restrict to the value each parameter had at a given moment.
+
+        Returns, for every (instance, parameter) pair, the latest valid
+        record with recorded_at <= moment. The result is one DISTINCT ON
+        query served by the et_param_value_latest_valid index, and only
+        partitions up to `moment` are scanned.
+
+        Args:
+            moment (datetime): The point in time to look at.
+            instances: Optional component instances (or their IDs) to
+                restrict the snapshot to.
+
+        Returns:
+            ParameterValueQuerySet: One record per (instance, parameter).
+        """
+        queryset = self.filter(validation_status='valid', recorded_at__lte=moment)
+        if instances is not None:
+            queryset = queryset.filter(instance__in=instances)
+        return queryset.order_by(
+            'instance_id', 'parameter_id', '-recorded_at'
+        ).distinct('instance_id', 'parameter_id')
+
 
 class ParameterValue(models.Model):
     """
     The ParameterValue model stores and manages actual values of parameters for specific
     component instances in the EuroTempl system. It maintains data integrity through
     comprehensive validation and supports both simple and complex parameter types.
+
+    Records form an append-only history; the latest valid record of each
+    (instance, parameter) pair is mirrored into CurrentParameterValue. The
+    table is range-partitioned by month on recorded_at (see migration 0011);
+    old history is thinned out by the compact_parameter_history command.
     """
 
     # Core fields
@@ -72,6 +109,8 @@ class ParameterValue(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
 
+    objects = ParameterValueQuerySet.as_manager()
+
     class Meta:
         db_table = 'et_parameter_value'
         indexes = [
@@ -79,12 +118,14 @@ class ParameterValue(models.Model):
             models.Index(fields=['parameter']),
             models.Index(fields=['validation_status']),
             models.Index(fields=['recorded_at']),
-        ]
-        constraints = [
-            models.UniqueConstraint(
-                fields=['instance', 'parameter'],
-                name='unique_parameter_per_instance'
-            )
+            # Serves "latest valid value of (instance, parameter)" lookups
+            # on the history with an index-only backward scan.
+            models.Index(
+                fields=['instance', 'parameter', '-recorded_at'],
+                include=['value'],
+                condition=models.Q(validation_status='valid'),
+                name='et_param_value_latest_valid'
+            ),
         ]
 
     def clean(self) -> None:
@@ -188,7 +229,9 @@ class ParameterValue(models.Model):
             self.validation_status = 'invalid'
             raise
         
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._sync_current_value()
 
     def save(self, *args, **kwargs):
         """Override save to handle validation status."""
@@ -200,7 +243,16 @@ class ParameterValue(models.Model):
             self.validation_status = 'invalid'
         
         self.full_clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._sync_current_value()
+
+    def _sync_current_value(self) -> None:
+        """
+        Make this record the current value of its parameter if it is valid.
+        """
+        from .current_value import CurrentParameterValue
+        CurrentParameterValue.upsert([self])
     
     def validate_value(self):
         """Validate the value against parameter constraints."""
@@ -140,4 +140,46 @@ class TestComponent:
         instance = component.create_instance()
         assert instance.component == component
         assert instance.spatial_data == component.base_geometry  # Changed from location
-        assert instance.instance_properties == {'finish': 'matte'}  # Changed from properties
\ No newline at end of file
+        assert instance.instance_properties == {'finish': 'matte'}  # Changed from properties
+
+    def test_create_instances(self, valid_component_data, django_assert_max_num_queries):
+        """Test placing many instances with a constant number of queries."""
+        component = Component.objects.create(**valid_component_data)
+        placements = [(25.0 * i, 0.0, 0.0) for i in range(50)]
+        with django_assert_max_num_queries(3):  # savepoint, INSERT, release
+            instances = component.create_instances(50, placements=placements)
+
+        assert len(instances) == 50
+        assert len({instance.internal_id for instance in instances}) == 50
+        last = instances[-1]
+        assert last.spatial_data.coords[0][2] == (1250.0, 25.0, 0.0)
+        assert last.spatial_bbox.extent == (1225.0, 0.0, 1250.0, 25.0)
+        assert last.instance_properties == {'finish': 'matte'}
+
+    def test_create_instances_validation(self, valid_component_data):
+        """Test batch creation rejects off-grid and mismatched placements."""
+        component = Component.objects.create(**valid_component_data)
+        with pytest.raises(ValidationError) as exc_info:
+            component.create_instances(3, placements=[(0, 0, 0), (10, 0, 0), (25, 0, 0)])
+        assert '[1]' in str(exc_info.value)
+        with pytest.raises(ValueError):
+            component.create_instances(2, placements=[(0, 0, 0)])
+        assert component.create_instances(0) == []
+
+    def test_create_instances_matches_create_instance(self, valid_component_data):
+        """Test batch creation applies the grid tolerance and bounding box of save()."""
+        component = Component.objects.create(**valid_component_data)
+        single = component.create_instance()
+        # Floating-point noise within the grid tolerance is accepted as on save().
+        batch = component.create_instances(2, placements=[(0, 0, 0), (25 + 1e-12, 0, 0)])
+
+        assert batch[0].spatial_bbox.equals_exact(single.spatial_bbox)
+        assert batch[0].spatial_bbox.srid == single.spatial_bbox.srid
+        assert batch[1].spatial_bbox.extent == pytest.approx((25.0, 0.0, 50.0, 25.0))
+
+    def test_create_instances_runs_instance_validation(self, valid_component_data):
+        """Test batch creation rejects what ComponentInstance.clean() rejects."""
+        component = Component.objects.create(**valid_component_data)
+        with pytest.raises(ValidationError) as exc_info:
+            component.create_instances(2, instance_properties=['matte'])
+        assert 'instance_properties' in exc_info.value.message_dict
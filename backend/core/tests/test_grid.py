@@ -0,0 +1,66 @@
+"""EuroTempl System
+Copyright (c) 2024 Pygmalion Records
+
+Test suite for the vectorized grid-alignment checks.
+"""
+
+import struct
+import numpy as np
+import pytest
+from django.core.exceptions import ValidationError
+from core.grid import geometry_coordinates, misaligned_vertices, validate_grid_alignment
+
+SQUARE = [(0, 0, 0), (0, 25, 0), (25, 25, 0), (25, 0, 0), (0, 0, 0)]
+
+
+def polygon_wkb(*rings, iso=False):
+    """Build little-endian 3D polygon WKB, EWKB-flagged unless iso."""
+    type_code = 1003 if iso else 3 | 0x80000000
+    wkb = struct.pack('<BII', 1, type_code, len(rings))
+    for ring in rings:
+        wkb += struct.pack('<I', len(ring)) + b''.join(struct.pack('<3d', *point) for point in ring)
+    return wkb
+
+
+def test_coordinates_of_every_ring_and_part():
+    """Test holes and parts of multi-geometries are all read."""
+    hole = [(5, 5, 0), (5, 10, 0), (10, 10, 0), (5, 5, 0)]
+    multi = struct.pack('<BII', 1, 6 | 0x80000000, 2) + polygon_wkb(SQUARE, hole) + polygon_wkb(SQUARE, iso=True)
+
+    coords = geometry_coordinates(multi)
+    assert coords.shape == (14, 3)
+    assert misaligned_vertices(multi).tolist() == [5, 6, 7, 8]
+
+
+def test_single_part_is_viewed_in_place():
+    """Test a single coordinate block is not copied."""
+    coords = geometry_coordinates(polygon_wkb(SQUARE))
+    assert not coords.flags.owndata
+    assert coords[2].tolist() == [25.0, 25.0, 0.0]
+
+
+def test_two_dimensional_big_endian_linestring():
+    """Test 2D big-endian WKB gets a NaN z column."""
+    wkb = struct.pack('>BII', 0, 2, 2) + struct.pack('>4d', 0, 0, 25, 12.5)
+    coords = geometry_coordinates(wkb)
+    assert np.isnan(coords[:, 2]).all()
+    assert misaligned_vertices(wkb).tolist() == [1]
+
+
+def test_tolerance():
+    """Test vertices within the tolerance of a grid line are aligned."""
+    coords = np.array([[-1e-12, 25 - 1e-12, 0.0], [0.0, 25.001, 0.0]])
+    assert misaligned_vertices(coords).tolist() == [1]
+    assert misaligned_vertices(coords, tolerance=0.01).size == 0
+
+
+def test_validate_grid_alignment_reports_vertices():
+    """Test the validation error names the offending vertices."""
+    class Geometry:
+        empty = False
+        wkb = polygon_wkb([(0, 0, 0), (0, 10, 0), (10, 10, 0), (0, 0, 0)])
+
+    with pytest.raises(ValidationError) as exc_info:
+        validate_grid_alignment(Geometry(), 'spatial_data', 'Geometry must align with 25mm grid system')
+    assert 'vertices 1, 2' in str(exc_info.value)
+    validate_grid_alignment(None, 'spatial_data', 'unused')
@@ -82,6 +82,27 @@ class TestComponentInstance:
         assert new_version.component == instance.component
         assert new_version.spatial_data.equals(instance.spatial_data)
 
+    def test_internal_id_allocated_by_sequence(self, valid_instance_data,
+                                               django_assert_num_queries):
+        """Test internal_id comes from the INSERT when none is supplied."""
+        del valid_instance_data['internal_id']
+        first = ComponentInstance.objects.create(**valid_instance_data)
+        # Component lookup and id uniqueness check from full_clean, then INSERT.
+        with django_assert_num_queries(3):
+            second = ComponentInstance.objects.create(**valid_instance_data)
+        assert second.internal_id > first.internal_id
+        assert second.create_new_version().internal_id > second.internal_id
+
+    def test_supplied_internal_id_kept(self, valid_instance_data):
+        """Test a supplied internal_id is validated, kept and skipped by the sequence."""
+        valid_instance_data['internal_id'] = 500000
+        instance = ComponentInstance.objects.create(**valid_instance_data)
+        assert instance.internal_id == 500000
+        assert instance.create_new_version().internal_id > 500000
+
+        with pytest.raises(ValidationError):
+            ComponentInstance.objects.create(**valid_instance_data)
+
     def test_temporal_validation(self, valid_instance_data):
         """Test temporal consistency validation."""
         instance = ComponentInstance.objects.create(**valid_instance_data)
@@ -97,6 +118,28 @@ class TestComponentInstance:
         assert instance.spatial_bbox is not None
         assert instance.spatial_bbox.contains(instance.spatial_data)
 
+    def test_bounding_box_computed_in_single_save(self, valid_instance_data,
+                                                  django_assert_num_queries):
+        """Test a missing bounding box is stored by the INSERT itself."""
+        del valid_instance_data['spatial_bbox']
+        # Component lookup and id uniqueness check from full_clean, then INSERT.
+        with django_assert_num_queries(3):
+            instance = ComponentInstance.objects.create(**valid_instance_data)
+        instance.refresh_from_db()
+        assert instance.spatial_bbox.extent == (0.0, 0.0, 25.0, 25.0)
+
+    def test_recompute_bboxes_command(self, valid_instance_data):
+        """Test the command rebuilds bounding boxes in the database."""
+        from django.core.management import call_command
+
+        instance = ComponentInstance.objects.create(**valid_instance_data)
+        ComponentInstance.objects.filter(pk=instance.pk).update(spatial_bbox=None)
+        call_command('recompute_bboxes', model=['instance'], missing_only=True)
+
+        instance.refresh_from_db()
+        assert instance.spatial_bbox.extent == (0.0, 0.0, 25.0, 25.0)
+        assert instance.spatial_bbox.srid == instance.spatial_data.srid
+
     def test_invalid_status_update(self, valid_instance_data):
         """Test invalid status update handling."""
         instance = ComponentInstance.objects.create(**valid_instance_data)
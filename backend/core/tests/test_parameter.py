@@ -80,6 +80,33 @@ class TestParameter:
         with pytest.raises(ValidationError):
             parameter.validate_value(50.05)  # not a valid step
 
+    def test_validate_value_after_ranges_change(self, valid_parameter_data):
+        """Test validation follows valid_ranges once they are saved."""
+        parameter = Parameter.objects.create(**valid_parameter_data)
+        with pytest.raises(ValidationError):
+            parameter.validate_value(150.0)
+
+        parameter.valid_ranges = {'min': 0, 'max': 200, 'step': 0.1}
+        parameter.save()
+        assert parameter.validate_value(150.0) is True
+
+    def test_validate_value_after_ranges_edited_in_place(self, valid_parameter_data):
+        """Test saving drops constraints compiled from ranges edited in place."""
+        valid_parameter_data['valid_ranges']['max'] = 200
+        parameter = Parameter.objects.create(**valid_parameter_data)
+        assert parameter.validate_value(150.0) is True
+
+        parameter.valid_ranges['max'] = 100
+        parameter.save()
+        with pytest.raises(ValidationError):
+            parameter.validate_value(150.0)
+
+        Parameter.objects.filter(pk=parameter.pk).update(
+            valid_ranges={'min': 0, 'max': 200, 'step': 0.1}
+        )
+        parameter.refresh_from_db()
+        assert parameter.validate_value(150.0) is True
+
     def test_validate_value_required(self, valid_parameter_data):
         """Test validation of required parameters."""
         parameter = Parameter.objects.create(**valid_parameter_data)
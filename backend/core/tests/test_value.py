@@ -9,7 +9,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from datetime import timedelta
 import uuid
-from core.models import ParameterValue, Parameter, ComponentInstance, Component
+from core.models import ParameterValue, CurrentParameterValue, Parameter, ComponentInstance, Component
 from .test_component import valid_component_data
 
 @pytest.fixture
@@ -131,11 +131,71 @@ class TestParameterValue:
         with pytest.raises(ValidationError):
             ParameterValue.objects.create(**valid_parameter_value_data)
 
-    def test_unique_constraint(self, valid_parameter_value_data):
-        """Test unique constraint on instance and parameter."""
+    def test_history_is_append_only(self, valid_parameter_value_data):
+        """Test every recorded value is kept and only the latest is current."""
+        first = ParameterValue.objects.create(**valid_parameter_value_data)
+        valid_parameter_value_data['value'] = {'value': 60.0, 'unit': 'mm'}
+        second = ParameterValue.objects.create(**valid_parameter_value_data)
+        # recorded_at is auto_now_add; make the order explicit after saving.
+        ParameterValue.objects.filter(id=first.id).update(
+            recorded_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        assert ParameterValue.objects.filter(
+            instance=first.instance, parameter=first.parameter
+        ).count() == 2
+        current = CurrentParameterValue.objects.get(
+            instance=first.instance, parameter=first.parameter
+        )
+        assert current.history_id == second.id
+        assert current.get_value() == 60.0
+
+    def test_current_value_follows_set_value(self, valid_parameter_value_data):
+        """Test updating a record in place refreshes the current value."""
+        value = ParameterValue.objects.create(**valid_parameter_value_data)
+        value.set_value(75.0, 'mm')
+        current = CurrentParameterValue.objects.get(
+            instance=value.instance, parameter=value.parameter
+        )
+        assert current.get_value() == 75.0
+
+    def test_as_of(self, valid_parameter_value_data):
+        """Test as_of returns the latest valid record at a moment."""
+        first = ParameterValue.objects.create(**valid_parameter_value_data)
+        moment = timezone.now()
+        valid_parameter_value_data['value'] = {'value': 60.0, 'unit': 'mm'}
         ParameterValue.objects.create(**valid_parameter_value_data)
-        with pytest.raises(ValidationError):
-            ParameterValue.objects.create(**valid_parameter_value_data)
+
+        snapshot = ParameterValue.objects.as_of(moment, [first.instance])
+        assert [record.id for record in snapshot] == [first.id]
+        assert ParameterValue.objects.as_of(moment - timedelta(days=1)).count() == 0
+
+    def test_current_value_keeps_newer_record(self, valid_parameter_value_data):
+        """Test an older record upserted after a newer one does not become current."""
+        valid_parameter_value_data['value'] = {'value': 60.0, 'unit': 'mm'}
+        newer = ParameterValue.objects.create(**valid_parameter_value_data)
+        valid_parameter_value_data['value'] = {'value': 40.0, 'unit': 'mm'}
+        older = ParameterValue.objects.create(**valid_parameter_value_data)
+
+        # recorded_at is auto_now_add, so backdate the records after saving;
+        # both stay after the moment the current value was recorded.
+        moment = timezone.now() + timedelta(minutes=1)
+        for record, recorded_at in ((newer, moment + timedelta(minutes=1)), (older, moment)):
+            ParameterValue.objects.filter(id=record.id).update(recorded_at=recorded_at)
+            record.recorded_at = recorded_at
+
+        assert CurrentParameterValue.upsert([newer]) != []
+        assert CurrentParameterValue.upsert([older]) == []
+        current = CurrentParameterValue.objects.get(
+            instance=newer.instance, parameter=newer.parameter
+        )
+        assert current.history_id == newer.id
+        assert current.get_value() == 60.0
+
+    def test_current_value_upsert_skips_invalid(self, valid_parameter_value_data):
+        """Test records that are not valid never become current."""
+        value = ParameterValue(**valid_parameter_value_data)
+        assert CurrentParameterValue.upsert([value]) == []
 
     def test_get_value(self, valid_parameter_value_data):
         """Test get_value method."""
@@ -185,4 +245,40 @@ class TestParameterValue:
         
         original_modified = value.modified_at
         value.set_value(75.0, 'mm')
-        assert value.modified_at > original_modified
\ No newline at end of file
+        assert value.modified_at > original_modified
+
+@pytest.mark.django_db
+class TestCompactParameterHistory:
+    """Test suite for the compact_parameter_history command."""
+
+    def _record(self, data, value, recorded_at):
+        data = dict(data, value={'value': value, 'unit': 'mm'})
+        record = ParameterValue.objects.create(**data)
+        ParameterValue.objects.filter(id=record.id).update(recorded_at=recorded_at)
+        return record
+
+    def test_compaction_keeps_daily_snapshot_and_current(self, valid_parameter_value_data):
+        """Test old history is reduced to one record per day."""
+        from django.core.management import call_command
+
+        old_day = (timezone.now() - timedelta(days=40)).replace(hour=12, minute=0)
+        first = self._record(valid_parameter_value_data, 10.0, old_day)
+        second = self._record(valid_parameter_value_data, 20.0, old_day + timedelta(hours=1))
+        current = self._record(valid_parameter_value_data, 30.0, timezone.now())
+
+        call_command('compact_parameter_history', keep_days=30, dry_run=True)
+        assert ParameterValue.objects.count() == 3
+
+        call_command('compact_parameter_history', keep_days=30, batch_size=1)
+        remaining = set(ParameterValue.objects.values_list('id', flat=True))
+        assert remaining == {second.id, current.id}
+        assert CurrentParameterValue.objects.get().history_id == current.id
+
+
+def test_create_partitions_rejects_non_positive_months():
+    """Test the partition command needs at least one month ahead."""
+    from django.core.management import call_command
+    from django.core.management.base import CommandError
+
+    with pytest.raises(CommandError):
+        call_command('create_parameter_value_partitions', months=0)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ParametersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'parameters'
+
+    def ready(self):
+        # Connect the model signals that invalidate value and shared caches.
+        from .core.interfaces import shared_cache, value_cache  # noqa: F401
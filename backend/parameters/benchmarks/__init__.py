@@ -0,0 +1,10 @@
+"""EuroTempl System
+Copyright (c) 2024 Pygmalion Records
+
+Performance benchmarks for the parameters engine.
+
+Run from the backend directory, e.g.::
+
+    python -m parameters.benchmarks.graph_benchmark
+    python -m parameters.benchmarks.value_query_benchmark --rows 1000000
+"""
@@ -0,0 +1,67 @@
+"""
+EuroTempl System - Formula Engine Benchmarks
+
+Compares evaluating a compiled formula against parsing and evaluating
+the expression string on every call. Run from the backend directory:
+
+    python -m parameters.benchmarks.formula_benchmark --evaluations 100000
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import argparse
+import time
+
+from parameters.utils.formula import compile_formula
+
+FORMULAS = [
+    "width * height",
+    "(width - 2 * wall_thickness) * (height - 2 * wall_thickness)",
+    "max(width, height) / 25 + sqrt(width ** 2 + height ** 2)",
+]
+
+VALUES = {'width': 600.0, 'height': 450.0, 'wall_thickness': 25.0}
+
+
+def bench_formula(expression: str, evaluations: int) -> None:
+    """
+    Time compiled and re-parsed evaluation of a formula.
+
+    Args:
+        expression (str): The formula to evaluate.
+        evaluations (int): Number of evaluations to time.
+    """
+    evaluator = compile_formula(expression).bind({name: name for name in VALUES})
+    start = time.perf_counter()
+    for _ in range(evaluations):
+        evaluator(VALUES)
+    compiled = time.perf_counter() - start
+
+    namespace = {'__builtins__': {}, 'max': max, 'sqrt': lambda x: x ** 0.5}
+    start = time.perf_counter()
+    for _ in range(evaluations):
+        eval(compile(expression, '<formula>', 'eval'), namespace, VALUES)
+    reparsed = time.perf_counter() - start
+
+    print(
+        f"{expression[:48]:<48} x{evaluations:,}: "
+        f"compiled {compiled * 1e3:8.1f} ms, "
+        f"re-parsed {reparsed * 1e3:8.1f} ms, "
+        f"speedup x{reparsed / compiled:.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--evaluations", type=int, default=100_000,
+        help="Number of evaluations timed per formula"
+    )
+    args = parser.parse_args()
+
+    for expression in FORMULAS:
+        bench_formula(expression, args.evaluations)
+
+
+if __name__ == "__main__":
+    main()
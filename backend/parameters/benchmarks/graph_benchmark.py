@@ -0,0 +1,260 @@
+"""
+EuroTempl System - Parameter Graph Benchmarks
+
+Measures lookup and recalculation cost of the parameter dependency graph
+on large, synthetic graphs. Run from the backend directory:
+
+    python -m parameters.benchmarks.graph_benchmark --sizes 10000 100000
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+import numpy as np
+
+from parameters.core.cpp_extensions import CppParameterGraphManager, PythonParameterGraphManager
+
+
+def build_graph(size: int, fan_in: int = 3, seed: int = 42,
+                backend=PythonParameterGraphManager):
+    """
+    Build a synthetic acyclic graph with `size` parameters.
+
+    Every parameter after the first `fan_in` depends on `fan_in` randomly
+    chosen parameters with a lower index, which keeps the graph acyclic.
+
+    Args:
+        size (int): Number of parameters in the graph.
+        fan_in (int): Number of inputs per dependent parameter.
+        seed (int): Seed for the random generator.
+        backend (type): Graph implementation to populate.
+
+    Returns:
+        ParameterGraphManager: The populated graph.
+    """
+    rng = random.Random(seed)
+    graph = backend()
+    for index in range(size):
+        graph.add_parameter(f"p{index}", f"param_{index}", "float", 1.0)
+    for index in range(fan_in, size):
+        targets = rng.sample(range(index), fan_in)
+        formula = " + ".join(f"param_{target}" for target in targets)
+        for target in targets:
+            graph.add_dependency(f"p{index}", f"p{target}", formula)
+    return graph
+
+
+def _linear_scan(graph: PythonParameterGraphManager, param_id: str) -> List[str]:
+    """Reference implementation scanning every dependency entry."""
+    return [
+        source for source, deps in graph._dependencies.items()
+        if param_id in deps
+    ]
+
+
+def _time(func: Callable[[str], List[str]], keys: List[str]) -> float:
+    """Return the mean time per call in microseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        func(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def bench_affected_parameters(size: int, lookups: int = 1000) -> None:
+    """
+    Compare indexed and scanning lookups of affected parameters.
+
+    Args:
+        size (int): Number of parameters in the graph.
+        lookups (int): Number of lookups to time.
+    """
+    graph = build_graph(size)
+    rng = random.Random(size)
+    keys = [f"p{rng.randrange(size)}" for _ in range(lookups)]
+
+    indexed = _time(graph.get_affected_parameters, keys)
+    scan_keys = keys[:max(1, lookups // 10)]
+    scanned = _time(lambda key: _linear_scan(graph, key), scan_keys)
+
+    print(
+        f"get_affected_parameters n={size:>7}: "
+        f"indexed {indexed:10.2f} us/call, "
+        f"linear scan {scanned:10.2f} us/call, "
+        f"speedup x{scanned / indexed:,.0f}"
+    )
+
+
+def bench_incremental_update(size: int, updates: int = 100) -> None:
+    """
+    Compare incremental and full-graph recalculation after a value change.
+
+    Args:
+        size (int): Number of parameters in the graph.
+        updates (int): Number of updates to time.
+    """
+    graph = build_graph(size)
+    rng = random.Random(size)
+    # Updates near the sinks of the graph touch a small dirty subgraph,
+    # which is the common case for a single configurator edit.
+    keys = [f"p{rng.randrange(size // 2, size)}" for _ in range(updates)]
+
+    graph.reset_recompute_stats()
+    start = time.perf_counter()
+    for key in keys:
+        graph.update_value(key, 2.0)
+    incremental = (time.perf_counter() - start) / updates * 1e3
+    recomputed = graph.get_recompute_stats()["total"] / updates
+
+    full_updates = max(1, updates // 10)
+    start = time.perf_counter()
+    for key in keys[:full_updates]:
+        graph._values[key] = 2.0
+        graph._recalculate_dependencies()
+    full = (time.perf_counter() - start) / full_updates * 1e3
+
+    print(
+        f"update_value            n={size:>7}: "
+        f"incremental {incremental:8.3f} ms/update "
+        f"({recomputed:,.1f} nodes), "
+        f"full graph {full:8.3f} ms/update ({graph.get_recompute_stats()['last']:,} nodes)"
+    )
+
+
+def bench_batch_evaluation(instances: int, parameters: int = 200) -> None:
+    """
+    Compare one vectorized pass with per-instance recalculation.
+
+    Args:
+        instances (int): Number of component instances sharing the graph.
+        parameters (int): Number of parameters in the shared graph.
+    """
+    graph = build_graph(parameters)
+    rng = np.random.default_rng(instances)
+    roots = [f"p{index}" for index in range(3)]
+    columns = {root: rng.uniform(25.0, 1000.0, instances) for root in roots}
+
+    start = time.perf_counter()
+    graph.evaluate_batch(columns)
+    vectorized = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    for index in range(instances):
+        graph.update_values({root: columns[root][index] for root in roots})
+    looped = (time.perf_counter() - start) * 1e3
+
+    print(
+        f"evaluate_batch          N={instances:>7}: "
+        f"vectorized {vectorized:8.2f} ms, "
+        f"per-instance loop {looped:9.2f} ms, "
+        f"speedup x{looped / vectorized:,.1f}"
+    )
+
+
+def bench_backends(size: int, lookups: int = 200) -> None:
+    """
+    Compare the pure-Python and native graph backends.
+
+    Args:
+        size (int): Number of parameters in the graph.
+        lookups (int): Number of propagation orders to time.
+    """
+    if CppParameterGraphManager is None:
+        print(f"backends                n={size:>7}: native engine not built, skipped")
+        return
+
+    rng = random.Random(size)
+    # Roots near the sources of the graph have large downstream subgraphs.
+    keys = [f"p{rng.randrange(size // 100 + 1)}" for _ in range(lookups)]
+    timings = {}
+    for name, backend in (("python", PythonParameterGraphManager),
+                          ("cpp", CppParameterGraphManager)):
+        start = time.perf_counter()
+        graph = build_graph(size, backend=backend)
+        build = time.perf_counter() - start
+        timings[name] = (build * 1e3, _time(graph.get_propagation_order, keys) / 1e3)
+
+    print(
+        f"get_propagation_order   n={size:>7}: "
+        f"python {timings['python'][1]:8.2f} ms/call, "
+        f"cpp {timings['cpp'][1]:8.2f} ms/call, "
+        f"speedup x{timings['python'][1] / timings['cpp'][1]:.1f} "
+        f"(build {timings['python'][0]:,.0f} ms / {timings['cpp'][0]:,.0f} ms)"
+    )
+
+
+def bench_bulk_construction(size: int, fan_in: int = 3) -> None:
+    """
+    Compare bulk and per-call graph construction.
+
+    Args:
+        size (int): Number of parameters in the graph.
+        fan_in (int): Number of inputs per dependent parameter.
+    """
+    rng = random.Random(size)
+    ids = [f"p{index}" for index in range(size)]
+    names = [f"param_{index}" for index in range(size)]
+    sources, targets, formulas = [], [], []
+    for index in range(fan_in, size):
+        picked = rng.sample(range(index), fan_in)
+        formula = " + ".join(f"param_{target}" for target in picked)
+        for target in picked:
+            sources.append(ids[index])
+            targets.append(ids[target])
+            formulas.append(formula)
+
+    backends = [("python", PythonParameterGraphManager)]
+    if CppParameterGraphManager is not None:
+        backends.append(("cpp", CppParameterGraphManager))
+    for name, backend in backends:
+        start = time.perf_counter()
+        graph = backend()
+        for param_id, param_name in zip(ids, names):
+            graph.add_parameter(param_id, param_name, "float", 1.0)
+        for source, target, formula in zip(sources, targets, formulas):
+            graph.add_dependency(source, target, formula)
+        per_call = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        graph = backend()
+        graph.add_parameters_bulk(ids, names, ["float"] * size, [1.0] * size)
+        graph.add_dependencies_bulk(sources, targets, formulas)
+        bulk = (time.perf_counter() - start) * 1e3
+
+        print(
+            f"build {name:<6}            n={size:>7}: "
+            f"bulk {bulk:9.1f} ms, per-call {per_call:9.1f} ms, "
+            f"speedup x{per_call / bulk:.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000],
+        help="Graph sizes (number of parameters) to benchmark"
+    )
+    parser.add_argument(
+        "--lookups", type=int, default=1000,
+        help="Number of lookups timed per graph size"
+    )
+    parser.add_argument(
+        "--instances", type=int, nargs="+", default=[100, 1000],
+        help="Instance counts for the batch evaluation benchmark"
+    )
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        bench_affected_parameters(size, args.lookups)
+        bench_incremental_update(size)
+        bench_backends(size)
+        bench_bulk_construction(size)
+    for instances in args.instances:
+        bench_batch_evaluation(instances)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+EuroTempl System - Parameter Value Query Benchmarks
+
+Records query plans and latencies of the "latest valid value" lookups on
+the parameter value history, with only the single-column indexes and with
+the composite partial index on (instance, parameter, recorded_at). Runs
+against the configured PostgreSQL database on a scratch temporary table,
+so no project data is touched. Run from the backend directory:
+
+    python -m parameters.benchmarks.value_query_benchmark --rows 1000000 10000000 50000000
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Any, Dict, List
+
+TABLE = "bench_parameter_value"
+
+SINGLE_COLUMN_INDEXES = [
+    f"CREATE INDEX ON {TABLE} (instance_id)",
+    f"CREATE INDEX ON {TABLE} (parameter_id)",
+    f"CREATE INDEX ON {TABLE} (validation_status)",
+    f"CREATE INDEX ON {TABLE} (recorded_at)",
+]
+
+COMPOSITE_INDEX = (
+    f"CREATE INDEX ON {TABLE} (instance_id, parameter_id, recorded_at DESC) "
+    f"INCLUDE (value) WHERE validation_status = 'valid'"
+)
+
+QUERIES = {
+    "latest_value": (
+        f"SELECT value FROM {TABLE} "
+        f"WHERE instance_id = %s AND parameter_id = %s AND validation_status = 'valid' "
+        f"ORDER BY recorded_at DESC LIMIT 1"
+    ),
+    "instance_values": (
+        f"SELECT DISTINCT ON (parameter_id) parameter_id, value FROM {TABLE} "
+        f"WHERE instance_id = %s AND validation_status = 'valid' "
+        f"ORDER BY parameter_id, recorded_at DESC"
+    ),
+}
+
+
+def _uuid_sql(expression: str) -> str:
+    """Return SQL deriving a deterministic UUID from an integer expression."""
+    return f"md5(({expression})::text)::uuid"
+
+
+def populate(cursor, rows: int, instances: int, parameters: int) -> None:
+    """
+    Fill the scratch table with synthetic history rows.
+
+    Args:
+        cursor: Database cursor.
+        rows (int): Number of history rows.
+        instances (int): Number of distinct instances.
+        parameters (int): Number of distinct parameters per instance.
+    """
+    cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    cursor.execute(
+        f"CREATE TEMPORARY TABLE {TABLE} (LIKE et_parameter_value INCLUDING DEFAULTS)"
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO {TABLE}
+            (id, instance_id, parameter_id, value, recorded_at,
+             validation_status, created_at, modified_at)
+        SELECT
+            {_uuid_sql("'row' || g")},
+            {_uuid_sql(f"'instance' || (g %% {instances})")},
+            {_uuid_sql(f"'parameter' || ((g / {instances}) %% {parameters})")},
+            jsonb_build_object('value', g %% 1000, 'unit', 'mm'),
+            now() - g * interval '1 second',
+            CASE WHEN g %% 10 = 0 THEN 'invalid' ELSE 'valid' END,
+            now(), now()
+        FROM generate_series(1, %s) AS g
+        """,
+        [rows],
+    )
+
+
+def measure(cursor, sql: str, params: List[Any], repeats: int) -> Dict[str, Any]:
+    """
+    Capture the plan of a query and its latency distribution.
+
+    Args:
+        cursor: Database cursor.
+        sql (str): Query to measure.
+        params (List[Any]): Query parameters.
+        repeats (int): Number of timed executions.
+
+    Returns:
+        Dict[str, Any]: The plan and median/p95 latency in milliseconds.
+    """
+    cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT TEXT) " + sql, params)
+    plan = [line for (line,) in cursor.fetchall()]
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - start) * 1e3)
+    timings.sort()
+    return {
+        "plan": plan,
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+    }
+
+
+def bench_rows(cursor, rows: int, instances: int, parameters: int,
+               repeats: int) -> Dict[str, Any]:
+    """
+    Benchmark both index layouts for one history size.
+
+    Args:
+        cursor: Database cursor.
+        rows (int): Number of history rows.
+        instances (int): Number of distinct instances.
+        parameters (int): Number of distinct parameters per instance.
+        repeats (int): Number of timed executions per query.
+
+    Returns:
+        Dict[str, Any]: Results keyed by index layout and query name.
+    """
+    populate(cursor, rows, instances, parameters)
+    # The composite index is added on top of the single-column ones, which
+    # matches the model's index set.
+    instance_sql = _uuid_sql("'instance' || 7")
+    parameter_sql = _uuid_sql("'parameter' || 3")
+    cursor.execute(f"SELECT {instance_sql}, {parameter_sql}")
+    instance_id, parameter_id = cursor.fetchone()
+    query_params = {
+        "latest_value": [instance_id, parameter_id],
+        "instance_values": [instance_id],
+    }
+
+    results = {}
+    for layout, statements in (("single_column", SINGLE_COLUMN_INDEXES),
+                               ("composite", [COMPOSITE_INDEX])):
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.execute(f"VACUUM ANALYZE {TABLE}")
+        results[layout] = {
+            name: measure(cursor, sql, query_params[name], repeats)
+            for name, sql in QUERIES.items()
+        }
+        for name, result in results[layout].items():
+            print(
+                f"{name:<16} rows={rows:>10,} {layout:<13}: "
+                f"median {result['median_ms']:9.3f} ms, p95 {result['p95_ms']:9.3f} ms"
+            )
+    cursor.execute(f"DROP TABLE {TABLE}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 50_000_000],
+        help="History sizes (number of parameter value rows) to benchmark"
+    )
+    parser.add_argument(
+        "--instances", type=int, default=100_000,
+        help="Number of distinct component instances"
+    )
+    parser.add_argument(
+        "--parameters", type=int, default=20,
+        help="Number of distinct parameters per instance"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=50,
+        help="Number of timed executions per query"
+    )
+    parser.add_argument(
+        "--output", help="Write plans and latencies to this JSON file"
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "eurotempl.settings")
+    import django
+    django.setup()
+    from django.db import connection
+
+    report = {}
+    with connection.cursor() as cursor:
+        for rows in args.rows:
+            report[rows] = bench_rows(
+                cursor, rows, args.instances, args.parameters, args.repeats
+            )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
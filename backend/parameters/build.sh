@@ -0,0 +1,28 @@
+#!/bin/bash
+set -e
+
+# Build the native parameter graph engine (parameters_engine) into
+# core/cpp_extensions/lib, where the Python backend selection picks it up.
+
+# Get conda environment path more reliably
+CONDA_ENV=$(dirname $(dirname $(which python)))
+
+# Print debug info
+echo "Using Conda env: ${CONDA_ENV}"
+echo "Python location: $(which python)"
+
+# Create build directory
+rm -rf build
+mkdir -p build
+cd build
+
+cmake .. \
+    -DCMAKE_BUILD_TYPE=Release \
+    -DPYTHON_EXECUTABLE="$(which python)" \
+    -DPython_EXECUTABLE="$(which python)" \
+    -DBOOST_ROOT="${CONDA_ENV}"
+
+# Build
+cmake --build . -- -j4
+
+cd ..
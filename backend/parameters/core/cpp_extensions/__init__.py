@@ -1,6 +1,50 @@
 """EuroTempl System
-Copyright (c) 2024 Pygmalion Records"""
+Copyright (c) 2024 Pygmalion Records
 
-from ._parameter_graph import ParameterGraphManager
+Parameter graph backends.
 
-__all__ = ['ParameterGraphManager']
\ No newline at end of file
+The Boost.Graph engine (parameters_engine, built from parameters/cpp into
+the lib directory next to this file) is used when it is available; the
+pure-Python graph is the fallback. Set EUROTEMPL_PARAMETER_BACKEND to
+'python' or 'cpp' to force a backend."""
+
+import os
+import sys
+
+# Get the directory containing this __init__.py file
+_current_dir = os.path.dirname(os.path.abspath(__file__))
+_lib_dir = os.path.join(_current_dir, 'lib')
+
+# Add the lib directory to Python's path
+if _lib_dir not in sys.path:
+    sys.path.append(_lib_dir)
+
+from ._parameter_graph import ParameterGraphManager as PythonParameterGraphManager
+
+_requested_backend = os.environ.get('EUROTEMPL_PARAMETER_BACKEND', 'auto').lower()
+
+if _requested_backend == 'python':
+    CppParameterGraphManager = None
+else:
+    try:
+        from ._cpp import ParameterGraphManager as CppParameterGraphManager
+    except ImportError:
+        if _requested_backend == 'cpp':
+            raise ImportError(
+                "Native parameter engine requested but parameters_engine is not built"
+            )
+        CppParameterGraphManager = None
+
+if CppParameterGraphManager is not None:
+    ParameterGraphManager = CppParameterGraphManager
+    BACKEND = 'cpp'
+else:
+    ParameterGraphManager = PythonParameterGraphManager
+    BACKEND = 'python'
+
+__all__ = [
+    'BACKEND',
+    'CppParameterGraphManager',
+    'ParameterGraphManager',
+    'PythonParameterGraphManager',
+]
@@ -1,13 +1,173 @@
-"""EuroTempl System
-Copyright (c) 2024 Pygmalion Records"""
+"""
+Native-backed parameter dependency graph for the EuroTempl system.
+
+This module wraps the Boost.Graph ParameterGraphManager from the compiled
+parameters_engine extension. Graph topology (affected parameters, cycle
+checks and propagation order) is answered by the native engine, while
+values and formulas stay in Python so both backends evaluate identically.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import numbers
+from decimal import Decimal
+
+from parameters_engine import ParameterGraphManager as _NativeGraph
+
+from ._parameter_graph import ParameterGraphManager as _PythonGraph, _columns
+
+
+class ParameterGraphManager(_PythonGraph):
+    """
+    Parameter dependency graph backed by the native Boost.Graph engine.
+
+    Attributes:
+        _native (parameters_engine.ParameterGraphManager): The native graph
+            mirroring every parameter and dependency.
+    """
 
-class ParameterGraphManager:
     def __init__(self):
-        self._parameters = {}
-
-    def add_parameter(self, id: str, name: str, type: str, value: float) -> None:
-        self._parameters[id] = {
-            'name': name,
-            'type': type,
-            'value': value
-        }
\ No newline at end of file
+        """
+        Initialize a new native-backed ParameterGraphManager instance.
+        """
+        super().__init__()
+        self._native = _NativeGraph()
+
+    def add_parameter(self, param_id: str, name: str, data_type: str, initial_value: float) -> None:
+        """
+        Add a new parameter to the graph.
+
+        Args:
+            param_id (str): Unique identifier for the parameter.
+            name (str): Human-readable name of the parameter.
+            data_type (str): Data type of the parameter.
+            initial_value (Any): Initial value of the parameter.
+        """
+        self._native.add_parameter(param_id, name, data_type, _native_value(initial_value))
+        super().add_parameter(param_id, name, data_type, initial_value)
+
+    def add_parameters_bulk(self, param_ids, names, data_types, initial_values) -> None:
+        """
+        Add many parameters to the graph in one pass.
+
+        Args:
+            param_ids (Iterable[str]): Unique identifiers of the parameters.
+            names (Iterable[str]): Human-readable names of the parameters.
+            data_types (Iterable[str]): Data types of the parameters.
+            initial_values (Iterable[Any]): Initial values of the parameters.
+
+        Raises:
+            ValueError: If the columns have different lengths.
+        """
+        param_ids, names, data_types, initial_values = _columns(
+            param_ids, names, data_types, initial_values
+        )
+        self._native.add_parameters_bulk(
+            param_ids, names, data_types, [_native_value(value) for value in initial_values]
+        )
+        super().add_parameters_bulk(param_ids, names, data_types, initial_values)
+
+    def add_dependency(self, source: str, target: str, formula: str) -> None:
+        """
+        Add a dependency between parameters.
+
+        Args:
+            source (str): Identifier of the source (dependent) parameter.
+            target (str): Identifier of the target parameter.
+            formula (str): Formula to calculate the source parameter's value.
+
+        Raises:
+            KeyError: If either parameter is not found in the graph.
+            ValueError: If the dependency would introduce a cycle.
+        """
+        self._native.add_dependency(source, target, formula)
+        self._link(source, target, formula)
+
+    def add_dependencies_bulk(self, sources, targets, formulas) -> None:
+        """
+        Add many dependencies to the graph in one pass.
+
+        Args:
+            sources (Iterable[str]): Identifiers of the dependent parameters.
+            targets (Iterable[str]): Identifiers of the parameters they depend on.
+            formulas (Iterable[str]): Formulas of the dependent parameters.
+
+        Raises:
+            KeyError: If any parameter is not found in the graph.
+            ValueError: If the columns have different lengths or the batch
+                would introduce a cycle.
+        """
+        sources, targets, formulas = _columns(sources, targets, formulas)
+        self._native.add_dependencies_bulk(sources, targets, formulas)
+        self._link_bulk(sources, targets, formulas)
+
+    def remove_parameters(self, param_ids) -> None:
+        """
+        Remove parameters that take part in no dependency.
+
+        Args:
+            param_ids (Iterable[str]): Identifiers of the parameters to remove.
+
+        Raises:
+            ValueError: If a parameter still has dependencies; nothing is
+                removed in that case.
+        """
+        param_ids = list(param_ids)
+        self._native.remove_parameters(param_ids)
+        super().remove_parameters(param_ids)
+
+    def get_affected_parameters(self, param_id: str) -> list[str]:
+        """
+        Get list of parameters affected by changes to a specific parameter.
+
+        Args:
+            param_id (str): Identifier of the parameter to check.
+
+        Returns:
+            list[str]: List of parameter identifiers affected by param_id.
+        """
+        return self._native.get_affected_parameters(param_id)
+
+    def _downstream_order(self, roots) -> list[str]:
+        """
+        Get the parameters downstream of a set of roots in topological order.
+
+        Args:
+            roots (Iterable[str]): Identifiers of the changed parameters.
+
+        Returns:
+            list[str]: Downstream parameter identifiers, excluding the roots.
+        """
+        return self._native.get_propagation_order(list(roots))
+
+    def _reaches(self, start: str, goal: str) -> bool:
+        """
+        Check whether goal is downstream of start.
+
+        Args:
+            start (str): Identifier to start the search from.
+            goal (str): Identifier to look for.
+
+        Returns:
+            bool: True if goal depends, directly or transitively, on start.
+        """
+        return self._native.reaches(start, goal)
+
+
+def _native_value(value) -> float:
+    """
+    Get the value mirrored into the native graph for a parameter value.
+
+    The native graph only stores floats and never evaluates them, so
+    non-numeric values (text, None, structured data) are mirrored as 0.0
+    while the Python side keeps them as given.
+
+    Args:
+        value (Any): The parameter value.
+
+    Returns:
+        float: The value as a float, or 0.0 if it is not a number.
+    """
+    if isinstance(value, (numbers.Real, Decimal)):
+        return float(value)
+    return 0.0
@@ -7,6 +7,11 @@ relationships, dependencies, and value calculations.
 Copyright (c) 2024 Pygmalion Records
 """
 
+from collections import ChainMap
+import numpy as np
+from ...utils.formula import SCALAR_FUNCTIONS, VECTOR_FUNCTIONS, compile_formula, normalize_name
+
+
 class ParameterGraphManager:
     """
     Manages the parameter dependency graph.
@@ -18,7 +23,17 @@ class ParameterGraphManager:
         _parameters (dict): Stores parameter metadata.
         _values (dict): Stores current parameter values.
         _dependencies (dict): Stores dependency relationships between parameters.
+        _dependents (dict): Reverse index mapping a parameter to the
+            parameters that depend on it, kept in insertion order.
         _formulas (dict): Stores calculation formulas for dependent parameters.
+        _compiled (dict): Caches bound formula evaluators per dependent
+            parameter.
+        _vector_compiled (dict): Caches NumPy-bound formula evaluators per
+            dependent parameter for batch evaluation.
+        _last_recompute_count (int): Parameters recalculated by the most
+            recent recalculation.
+        _total_recompute_count (int): Parameters recalculated since creation
+            or the last counter reset.
     """
 
     def __init__(self):
@@ -28,7 +43,12 @@ class ParameterGraphManager:
         self._parameters = {}
         self._values = {}
         self._dependencies = {}
+        self._dependents = {}
         self._formulas = {}
+        self._compiled = {}
+        self._vector_compiled = {}
+        self._last_recompute_count = 0
+        self._total_recompute_count = 0
 
     def add_parameter(self, param_id: str, name: str, data_type: str, initial_value: float) -> None:
         """
@@ -46,10 +66,68 @@ class ParameterGraphManager:
         }
         self._values[param_id] = initial_value
 
+    def add_parameters_bulk(self, param_ids, names, data_types, initial_values) -> None:
+        """
+        Add many parameters to the graph in one pass.
+
+        All arguments are parallel columns (lists, tuples, NumPy arrays or
+        other iterables) describing one parameter per position.
+
+        Args:
+            param_ids (Iterable[str]): Unique identifiers of the parameters.
+            names (Iterable[str]): Human-readable names of the parameters.
+            data_types (Iterable[str]): Data types of the parameters.
+            initial_values (Iterable[Any]): Initial values of the parameters.
+
+        Raises:
+            ValueError: If the columns have different lengths.
+        """
+        parameters, values = self._parameters, self._values
+        for param_id, name, data_type, initial_value in zip(
+            *_columns(param_ids, names, data_types, initial_values)
+        ):
+            parameters[param_id] = {'name': name, 'type': data_type}
+            # Stored as given, like add_parameter(): values may be text or None.
+            values[param_id] = initial_value
+
+    def has_dependencies(self, param_id: str) -> bool:
+        """
+        Check whether a parameter takes part in any dependency.
+
+        Args:
+            param_id (str): Identifier of the parameter to check.
+
+        Returns:
+            bool: True if the parameter depends on, or is depended on by,
+                another parameter.
+        """
+        return param_id in self._dependencies or param_id in self._dependents
+
+    def remove_parameters(self, param_ids) -> None:
+        """
+        Remove parameters that take part in no dependency.
+
+        Args:
+            param_ids (Iterable[str]): Identifiers of the parameters to remove.
+
+        Raises:
+            ValueError: If a parameter still has dependencies; nothing is
+                removed in that case.
+        """
+        param_ids = list(param_ids)
+        linked = [param_id for param_id in param_ids if self.has_dependencies(param_id)]
+        if linked:
+            raise ValueError(f"Parameters with dependencies cannot be removed: {', '.join(linked)}")
+        for param_id in param_ids:
+            self._parameters.pop(param_id, None)
+            self._values.pop(param_id, None)
+
     def update_value(self, param_id: str, value: float) -> None:
         """
         Update a parameter's value and recalculate dependencies.
 
+        Only parameters downstream of param_id are recalculated.
+
         Args:
             param_id (str): Identifier of the parameter to update.
             value (float): New value for the parameter.
@@ -57,10 +135,39 @@ class ParameterGraphManager:
         Raises:
             KeyError: If the parameter_id is not found in the graph.
         """
-        if param_id not in self._values:
-            raise KeyError(f"Parameter {param_id} not found")
-        self._values[param_id] = value
-        self._recalculate_dependencies()
+        self.update_values({param_id: value})
+
+    def update_values(self, values: dict[str, float]) -> list[str]:
+        """
+        Update several parameter values and recalculate their dependents.
+
+        The dirty set is the union of everything downstream of the updated
+        parameters; it is recalculated in a single topological pass, so a
+        parameter shared by several updated inputs is evaluated only once.
+        Explicitly updated parameters keep the value they were given. If a
+        formula fails, the graph is left exactly as it was before the call.
+
+        Args:
+            values (dict[str, float]): New values keyed by parameter identifier.
+
+        Returns:
+            list[str]: Recalculated parameter identifiers in evaluation order.
+
+        Raises:
+            KeyError: If any parameter identifier is not found in the graph.
+            Exception: Whatever a failing formula raises, such as
+                ZeroDivisionError.
+        """
+        for param_id in values:
+            if param_id not in self._values:
+                raise KeyError(f"Parameter {param_id} not found")
+        previous = {param_id: self._values[param_id] for param_id in values}
+        self._values.update(values)
+        try:
+            return self._recalculate_from(values)
+        except Exception:
+            self._values.update(previous)
+            raise
 
     def get_parameter_value(self, param_id: str) -> float:
         """
@@ -79,10 +186,54 @@ class ParameterGraphManager:
             raise KeyError(f"Parameter {param_id} not found")
         return self._values[param_id]
 
+    def restore_values(self, values: dict[str, float]) -> None:
+        """
+        Put back values read earlier, without recalculating dependents.
+
+        Used to undo an update whose persistence failed; values must come
+        from get_parameter_value() so the graph stays consistent.
+
+        Args:
+            values (dict[str, float]): Previous values keyed by parameter
+                identifier; parameters no longer in the graph are skipped.
+        """
+        for param_id, value in values.items():
+            if param_id in self._values:
+                self._values[param_id] = value
+
     def add_dependency(self, source: str, target: str, formula: str) -> None:
         """
         Add a dependency between parameters.
 
+        Formulas reference their inputs by normalized parameter name
+        (e.g. "Wall Thickness" becomes wall_thickness) or by identifier.
+        The graph is kept acyclic: a dependency that would make a parameter
+        depend on itself, directly or transitively, is rejected here so that
+        propagation never has to guard against cycles.
+
+        Args:
+            source (str): Identifier of the source (dependent) parameter.
+            target (str): Identifier of the target parameter.
+            formula (str): Formula to calculate the source parameter's value.
+
+        Raises:
+            KeyError: If either parameter is not found in the graph.
+            ValueError: If the dependency would introduce a cycle.
+        """
+        for param_id in (source, target):
+            if param_id not in self._parameters:
+                raise KeyError(f"Parameter {param_id} not found")
+        if target not in self._dependencies.get(source, ()):
+            if source == target or self._reaches(source, target):
+                raise ValueError(
+                    f"Dependency {source} -> {target} would create a cycle"
+                )
+        self._link(source, target, formula)
+
+    def _link(self, source: str, target: str, formula: str) -> None:
+        """
+        Record a validated dependency in the forward and reverse indexes.
+
         Args:
             source (str): Identifier of the source (dependent) parameter.
             target (str): Identifier of the target parameter.
@@ -91,23 +242,348 @@ class ParameterGraphManager:
         if source not in self._dependencies:
             self._dependencies[source] = set()
         self._dependencies[source].add(target)
+        if target not in self._dependents:
+            self._dependents[target] = {}
+        self._dependents[target][source] = None
         self._formulas[source] = formula
+        self._compiled.pop(source, None)
+        self._vector_compiled.pop(source, None)
+
+    def add_dependencies_bulk(self, sources, targets, formulas) -> None:
+        """
+        Add many dependencies to the graph in one pass.
+
+        Acyclicity is validated once for the whole batch rather than per
+        dependency. If the batch would introduce a cycle, none of its
+        dependencies are kept.
+
+        Args:
+            sources (Iterable[str]): Identifiers of the dependent parameters.
+            targets (Iterable[str]): Identifiers of the parameters they depend on.
+            formulas (Iterable[str]): Formulas of the dependent parameters.
+
+        Raises:
+            KeyError: If any parameter is not found in the graph.
+            ValueError: If the columns have different lengths or the batch
+                would introduce a cycle.
+        """
+        sources, targets, formulas = _columns(sources, targets, formulas)
+        unknown = (set(sources) | set(targets)) - self._parameters.keys()
+        if unknown:
+            raise KeyError(f"Parameter {unknown.pop()} not found")
+
+        added, previous_formulas = self._link_bulk(sources, targets, formulas)
+        if len(self._topological_order()) != len(self._dependencies):
+            for source, target in added:
+                self._unlink(source, target)
+            for source, formula in previous_formulas.items():
+                if formula is None:
+                    self._formulas.pop(source, None)
+                else:
+                    self._formulas[source] = formula
+            raise ValueError("Dependencies would create a cycle")
+
+    def _link_bulk(self, sources: list[str], targets: list[str],
+                   formulas: list[str]) -> tuple[list, dict]:
+        """
+        Record validated dependencies from parallel columns in one pass.
+
+        Args:
+            sources (list[str]): Identifiers of the dependent parameters.
+            targets (list[str]): Identifiers of the parameters they depend on.
+            formulas (list[str]): Formulas of the dependent parameters.
+
+        Returns:
+            tuple[list, dict]: The newly added (source, target) pairs and the
+            formulas the affected sources had before, for rolling back.
+        """
+        previous_formulas = {
+            source: self._formulas.get(source) for source in dict.fromkeys(sources)
+        }
+        added = []
+        dependencies = self._dependencies
+        dependents = self._dependents
+        for source, target in zip(sources, targets):
+            inputs = dependencies.get(source)
+            if inputs is None:
+                inputs = dependencies[source] = set()
+            elif target in inputs:
+                continue
+            inputs.add(target)
+            reverse = dependents.get(target)
+            if reverse is None:
+                reverse = dependents[target] = {}
+            reverse[source] = None
+            added.append((source, target))
+        self._formulas.update(zip(sources, formulas))
+        for source in previous_formulas:
+            self._compiled.pop(source, None)
+            self._vector_compiled.pop(source, None)
+        return added, previous_formulas
+
+    def _unlink(self, source: str, target: str) -> None:
+        """
+        Remove a dependency from the forward and reverse indexes.
+
+        Args:
+            source (str): Identifier of the source (dependent) parameter.
+            target (str): Identifier of the target parameter.
+        """
+        self._dependencies[source].discard(target)
+        if not self._dependencies[source]:
+            del self._dependencies[source]
+        self._dependents[target].pop(source, None)
+        if not self._dependents[target]:
+            del self._dependents[target]
+        self._compiled.pop(source, None)
+        self._vector_compiled.pop(source, None)
 
     def get_affected_parameters(self, param_id: str) -> list[str]:
         """
         Get list of parameters affected by changes to a specific parameter.
 
+        Uses the reverse dependency index, so the cost is proportional to
+        the number of direct dependents rather than the size of the graph.
+
         Args:
             param_id (str): Identifier of the parameter to check.
 
         Returns:
             list[str]: List of parameter identifiers affected by param_id.
         """
-        affected = []
-        for source, deps in self._dependencies.items():
-            if param_id in deps:
-                affected.append(source)
-        return affected
+        return list(self._dependents.get(param_id, ()))
+
+    def get_propagation_order(self, param_id: str) -> list[str]:
+        """
+        Get all parameters downstream of a parameter in topological order.
+
+        Only the subgraph reachable from param_id is visited. Every
+        parameter appears after all of the parameters it depends on.
+
+        Args:
+            param_id (str): Identifier of the changed parameter.
+
+        Returns:
+            list[str]: Transitively affected parameter identifiers, excluding
+            param_id itself.
+        """
+        return self._downstream_order([param_id])
+
+    def propagate(self, param_id: str) -> list[str]:
+        """
+        Recalculate every parameter downstream of a changed parameter.
+
+        Each affected parameter is evaluated exactly once, after all of its
+        inputs have been brought up to date.
+
+        Args:
+            param_id (str): Identifier of the changed parameter.
+
+        Returns:
+            list[str]: Recalculated parameter identifiers in evaluation order.
+
+        Raises:
+            KeyError: If the parameter_id is not found in the graph.
+        """
+        if param_id not in self._values:
+            raise KeyError(f"Parameter {param_id} not found")
+        return self._recalculate_from([param_id])
+
+    def evaluate_batch(self, columns: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """
+        Evaluate dependent parameters for many instances at once.
+
+        Intended for instances of the same component that share this graph's
+        shape: each column holds one input value per instance. Every formula
+        downstream of the given columns is evaluated once over whole arrays.
+        Parameters without a column use their current graph value for all
+        instances. The graph's own values are left unchanged.
+
+        Args:
+            columns (dict[str, np.ndarray]): Input values keyed by parameter
+                identifier, one array of length N per parameter.
+
+        Returns:
+            dict[str, np.ndarray]: Values of the recalculated parameters,
+            one array of length N per parameter.
+
+        Raises:
+            KeyError: If a column refers to an unknown parameter.
+            ValueError: If the columns do not all have the same length.
+        """
+        arrays = {}
+        for param_id, column in columns.items():
+            if param_id not in self._values:
+                raise KeyError(f"Parameter {param_id} not found")
+            arrays[param_id] = np.asarray(column, dtype=float)
+        lengths = {array.shape for array in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        shape = lengths.pop() if lengths else (0,)
+
+        results = {}
+        values = ChainMap(results, arrays, self._values)
+        for node in self._downstream_order(arrays):
+            evaluator = self._vector_compiled.get(node)
+            if evaluator is None:
+                evaluator = self._vector_compiled[node] = self._bind_formula(
+                    node, VECTOR_FUNCTIONS
+                )
+            results[node] = np.broadcast_to(
+                np.asarray(evaluator(values), dtype=float), shape
+            )
+        return results
+
+    def get_recompute_stats(self) -> dict[str, int]:
+        """
+        Get counters of recalculated parameters.
+
+        Returns:
+            dict[str, int]: 'last' is the number of parameters evaluated by the
+            most recent recalculation, 'total' the number evaluated since the
+            graph was created or the counters were reset.
+        """
+        return {
+            'last': self._last_recompute_count,
+            'total': self._total_recompute_count
+        }
+
+    def reset_recompute_stats(self) -> None:
+        """Reset the recalculation counters to zero."""
+        self._last_recompute_count = 0
+        self._total_recompute_count = 0
+
+    def _downstream_order(self, roots) -> list[str]:
+        """
+        Get the parameters downstream of a set of roots in topological order.
+
+        Performs a depth-first search over the reverse dependency index and
+        returns the reverse postorder, which visits only the reachable
+        subgraph.
+
+        Args:
+            roots (Iterable[str]): Identifiers of the changed parameters.
+
+        Returns:
+            list[str]: Downstream parameter identifiers, excluding the roots.
+        """
+        roots = dict.fromkeys(roots)
+        postorder = []
+        visited = set(roots)
+        for root in roots:
+            stack = [(root, iter(self._dependents.get(root, ())))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if child not in visited:
+                        visited.add(child)
+                        stack.append((child, iter(self._dependents.get(child, ()))))
+                        break
+                else:
+                    stack.pop()
+                    if node not in roots:
+                        postorder.append(node)
+        postorder.reverse()
+        return postorder
+
+    def _recalculate_from(self, roots) -> list[str]:
+        """
+        Recalculate the dirty subgraph downstream of the given roots.
+
+        Args:
+            roots (Iterable[str]): Identifiers of the changed parameters.
+
+        Returns:
+            list[str]: Recalculated parameter identifiers in evaluation order.
+        """
+        order = self._downstream_order(roots)
+        self._assign_evaluated(order)
+        self._last_recompute_count = len(order)
+        self._total_recompute_count += len(order)
+        return order
+
+    def _reaches(self, start: str, goal: str) -> bool:
+        """
+        Check whether goal is downstream of start.
+
+        Args:
+            start (str): Identifier to start the search from.
+            goal (str): Identifier to look for.
+
+        Returns:
+            bool: True if goal depends, directly or transitively, on start.
+        """
+        visited = {start}
+        stack = [start]
+        while stack:
+            for child in self._dependents.get(stack.pop(), ()):
+                if child == goal:
+                    return True
+                if child not in visited:
+                    visited.add(child)
+                    stack.append(child)
+        return False
+
+    def _topological_order(self) -> list[str]:
+        """
+        Get every dependent parameter of the graph in topological order.
+
+        Returns:
+            list[str]: Dependent parameter identifiers, inputs first.
+        """
+        dependencies = self._dependencies
+        dependents = self._dependents
+        pending = {source: len(targets) for source, targets in dependencies.items()}
+        # Start from the inputs that do not depend on anything themselves.
+        ready = [node for node in dependents if node not in dependencies]
+        order = []
+        while ready:
+            node = ready.pop()
+            if node in dependencies:
+                order.append(node)
+            for child in dependents.get(node, ()):
+                pending[child] -= 1
+                if pending[child] == 0:
+                    ready.append(child)
+        return order
+
+    def _evaluate(self, source: str) -> float:
+        """
+        Evaluate a dependent parameter from the current values of its inputs.
+
+        Args:
+            source (str): Identifier of the dependent parameter.
+
+        Returns:
+            float: The calculated value.
+        """
+        evaluator = self._compiled.get(source)
+        if evaluator is None:
+            evaluator = self._compiled[source] = self._bind_formula(source)
+        return evaluator(self._values)
+
+    def _bind_formula(self, source: str, functions=SCALAR_FUNCTIONS):
+        """
+        Compile the formula of a dependent parameter against its inputs.
+
+        Args:
+            source (str): Identifier of the dependent parameter.
+            functions (Mapping[str, Callable]): Function implementations to
+                bind, scalar by default.
+
+        Returns:
+            Callable: Evaluator taking the value mapping of the graph.
+
+        Raises:
+            ValueError: If the formula is invalid or references a parameter
+                that is not one of the inputs of source.
+        """
+        names = {}
+        for dep in self._dependencies[source]:
+            names[dep] = dep
+            if dep in self._parameters:
+                names[normalize_name(self._parameters[dep]['name'])] = dep
+        return compile_formula(self._formulas[source]).bind(names, functions)
 
     def _recalculate_dependencies(self) -> None:
         """
@@ -115,14 +591,52 @@ class ParameterGraphManager:
 
         This method updates the values of all dependent parameters
         based on their formulas and the current values of their
-        dependencies.
-        """
-        for source, deps in self._dependencies.items():
-            if source in self._formulas:
-                formula = self._formulas[source]
-                # For this simple example, we just multiply the values
-                # In a real implementation, you'd want to parse and evaluate the formula
-                result = 1.0
-                for dep in deps:
-                    result *= self._values.get(dep, 0.0)
-                self._values[source] = result
\ No newline at end of file
+        dependencies, visiting them in topological order so each one
+        is evaluated exactly once.
+        """
+        order = [source for source in self._topological_order() if source in self._formulas]
+        self._assign_evaluated(order)
+        self._last_recompute_count = len(order)
+        self._total_recompute_count += len(order)
+
+    def _assign_evaluated(self, order: list[str]) -> None:
+        """
+        Evaluate dependent parameters in order and store their values.
+
+        The pass is all-or-nothing: if a formula raises, the values already
+        assigned in this pass are restored before the error propagates.
+
+        Args:
+            order (list[str]): Dependent parameter identifiers, inputs first.
+        """
+        values = self._values
+        previous = {}
+        try:
+            for node in order:
+                previous[node] = values[node]
+                values[node] = self._evaluate(node)
+        except Exception:
+            values.update(previous)
+            raise
+
+
+def _columns(*columns) -> tuple[list, ...]:
+    """
+    Materialize parallel columns as lists of equal length.
+
+    Args:
+        *columns (Iterable): The columns to materialize.
+
+    Returns:
+        tuple[list, ...]: One list per column.
+
+    Raises:
+        ValueError: If the columns have different lengths.
+    """
+    columns = tuple(
+        column.tolist() if isinstance(column, np.ndarray) else list(column)
+        for column in columns
+    )
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("All columns must have the same length")
+    return columns
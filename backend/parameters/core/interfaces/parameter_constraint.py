@@ -1,12 +1,36 @@
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Set
-import concurrent.futures
+import functools
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
+import numpy as np
 from django.core.exceptions import ValidationError
-from django.db import transaction
-from core.models import Parameter, ParameterValue, Component, ComponentInstance
-from ..cpp_extensions import ParameterGraphManager
-from ...utils import UnitConverter
-from geometry.cad_model import CADModel
+from core.models import Parameter
+from core.models.parameter import NumericRangeValidator, is_on_step
+
+
+GRID_SIZE = 25
+
+# Reason codes of a batch validation, in the order constraints are checked.
+_NOT_FINITE, _BELOW_MIN, _ABOVE_MAX, _OFF_STEP, _OFF_GRID = range(1, 6)
+
+
+@dataclass
+class BatchValidationResult:
+    """
+    Outcome of validating many values of one parameter at once.
+
+    Attributes:
+        mask (np.ndarray): Boolean array, True where the value is valid.
+        errors (Dict[int, str]): Reason per index of every invalid value,
+            worded like the scalar ValidationError messages.
+    """
+
+    mask: np.ndarray
+    errors: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def all_valid(self) -> bool:
+        """True if every value passed validation."""
+        return not self.errors
 
 
 @dataclass
@@ -41,9 +65,216 @@ class ParameterConstraint:
             raise ValidationError(f"Value {value} below minimum {self.min_value}")
         if self.max_value is not None and value > self.max_value:
             raise ValidationError(f"Value {value} above maximum {self.max_value}")
-        if self.step is not None:
-            if abs(value % self.step) > 1e-10:
-                raise ValidationError(f"Value {value} must be a multiple of step {self.step}")
+        if self.step is not None and not is_on_step(value, self.step, self._step_origin):
+            raise ValidationError(self._step_message(value))
+
+        if self.grid_aligned and not is_on_step(value, GRID_SIZE):
+            raise ValidationError("Value must align with 25mm grid")
+
+    @property
+    def _step_origin(self) -> float:
+        """Value steps are counted from: the minimum, or 0 without one."""
+        return 0 if self.min_value is None else self.min_value
+
+    def _step_message(self, value: float) -> str:
+        if self._step_origin:
+            return f"Value {value} must be in steps of {self.step} from {self.min_value}"
+        return f"Value {value} must be a multiple of step {self.step}"
+
+    def validate_batch(self, values: Any) -> BatchValidationResult:
+        """
+        Validate many values in one vectorized pass.
 
-        if self.grid_aligned and abs(value % 25) > 1e-10:
-                raise ValidationError("Value must align with 25mm grid")
+        Each invalid value is reported with the first constraint it
+        violates, in the order validate() checks them. Unlike validate(),
+        NaN and infinite values are rejected.
+
+        Args:
+            values (Any): One-dimensional array-like of values.
+
+        Returns:
+            BatchValidationResult: Validity mask and per-index reasons.
+
+        Raises:
+            ValueError: If values is not one-dimensional.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 1:
+            raise ValueError("Batch validation expects a one-dimensional array")
+
+        reasons = np.where(np.isfinite(values), 0, _NOT_FINITE).astype(np.int8)
+        with np.errstate(invalid='ignore'):
+            if self.min_value is not None:
+                reasons[(reasons == 0) & (values < self.min_value)] = _BELOW_MIN
+            if self.max_value is not None:
+                reasons[(reasons == 0) & (values > self.max_value)] = _ABOVE_MAX
+            if self.step is not None:
+                off_step = ~NumericRangeValidator(step=self.step).valid_mask(
+                    values - self._step_origin
+                )
+                reasons[(reasons == 0) & off_step] = _OFF_STEP
+            if self.grid_aligned:
+                off_grid = ~NumericRangeValidator(grid=GRID_SIZE).valid_mask(values)
+                reasons[(reasons == 0) & off_grid] = _OFF_GRID
+
+        mask = reasons == 0
+        errors = {
+            int(index): self._batch_message(int(reasons[index]), values[index].item())
+            for index in np.flatnonzero(~mask)
+        }
+        return BatchValidationResult(mask=mask, errors=errors)
+
+    def _batch_message(self, code: int, value: float) -> str:
+        if code == _NOT_FINITE:
+            return f"Value {value} is not a finite number"
+        if code == _BELOW_MIN:
+            return f"Value {value} below minimum {self.min_value}"
+        if code == _ABOVE_MAX:
+            return f"Value {value} above maximum {self.max_value}"
+        if code == _OFF_STEP:
+            return self._step_message(value)
+        return "Value must align with 25mm grid"
+
+    @classmethod
+    def from_parameter(cls, parameter: Parameter) -> 'ParameterConstraint':
+        """
+        Build the constraints stored on a parameter.
+
+        Args:
+            parameter (Parameter): The parameter to read valid_ranges from.
+
+        Returns:
+            ParameterConstraint: The parameter's constraints.
+        """
+        return cls(
+            min_value=parameter.valid_ranges.get('min'),
+            max_value=parameter.valid_ranges.get('max'),
+            step=parameter.valid_ranges.get('step'),
+            unit=parameter.units,
+            grid_aligned=parameter.valid_ranges.get('grid_aligned', False)
+        )
+
+    def compile(self) -> 'CompiledConstraint':
+        """
+        Compile the constraints into a validator for hot loops.
+
+        Returns:
+            CompiledConstraint: Validator equivalent to validate().
+        """
+        return CompiledConstraint(self)
+
+
+class CompiledConstraint:
+    """
+    Precompiled, immutable form of a ParameterConstraint.
+
+    Valid values are checked by the same NumericRangeValidator that
+    Parameter.validate_value uses, so the model and the manager accept
+    exactly the same values. Only invalid values take the slow path that
+    finds the violated constraint.
+
+    Attributes:
+        unit (Optional[str]): Unit of measurement.
+    """
+
+    __slots__ = ('unit', '_validator', '_constraint')
+
+    def __init__(self, constraint: ParameterConstraint):
+        """
+        Compile a constraint.
+
+        Args:
+            constraint (ParameterConstraint): The constraint to compile.
+        """
+        self.unit = constraint.unit
+        self._validator = NumericRangeValidator(
+            constraint.min_value, constraint.max_value, constraint.step,
+            GRID_SIZE if constraint.grid_aligned else None
+        )
+        self._constraint = constraint
+
+    def is_valid(self, value: float) -> bool:
+        """
+        Check a value against every constraint at once.
+
+        Args:
+            value (float): The value to check.
+
+        Returns:
+            bool: True if the value satisfies all constraints.
+        """
+        return self._validator.is_valid(value)
+
+    def validate(self, value: float) -> None:
+        """
+        Validate a value against the constraints.
+
+        Args:
+            value (float): The value to validate.
+
+        Raises:
+            ValidationError: If the value violates any constraint, with the
+                same message ParameterConstraint.validate() gives.
+        """
+        if not self._validator.is_valid(value):
+            # The reference check reports which constraint failed.
+            self._constraint.validate(value)
+
+    def validate_batch(self, values: Any) -> BatchValidationResult:
+        """
+        Validate many values in one vectorized pass.
+
+        Args:
+            values (Any): One-dimensional array-like of values.
+
+        Returns:
+            BatchValidationResult: Same result as
+                ParameterConstraint.validate_batch().
+
+        Raises:
+            ValueError: If values is not one-dimensional.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 1:
+            raise ValueError("Batch validation expects a one-dimensional array")
+
+        mask = self._validator.valid_mask(values)
+        if mask.all():
+            return BatchValidationResult(mask=mask)
+
+        # Only the rejected values need the reasons of the reference check.
+        rejected = np.flatnonzero(~mask)
+        detail = self._constraint.validate_batch(values[rejected])
+        mask[rejected] = detail.mask
+        errors = {int(rejected[index]): reason for index, reason in detail.errors.items()}
+        return BatchValidationResult(mask=mask, errors=errors)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(min_value: Optional[float], max_value: Optional[float], step: Optional[float],
+             unit: Optional[str], grid_aligned: bool) -> CompiledConstraint:
+    """Compile constraints, shared by every parameter with the same ones."""
+    return ParameterConstraint(min_value, max_value, step, unit, grid_aligned).compile()
+
+
+def compiled_constraint(parameter: Parameter) -> CompiledConstraint:
+    """
+    Get the compiled constraints of a parameter.
+
+    Compiled constraints are cached by their values in a bounded LRU
+    cache, so they never go stale when a parameter changes and parameters
+    with the same constraints share one entry.
+
+    Args:
+        parameter (Parameter): The parameter to get constraints for.
+
+    Returns:
+        CompiledConstraint: The parameter's compiled constraints.
+    """
+    ranges = parameter.valid_ranges
+    key = (ranges.get('min'), ranges.get('max'), ranges.get('step'),
+           parameter.units, ranges.get('grid_aligned', False))
+    try:
+        return _compile(*key)
+    except TypeError:  # Unhashable JSON values are compiled uncached
+        return ParameterConstraint(*key).compile()
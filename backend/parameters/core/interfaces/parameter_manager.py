@@ -8,17 +8,27 @@ constraints, and updates.
 Copyright (c) 2024 Pygmalion Records
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Set
-import concurrent.futures
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from core.models import Parameter, ParameterValue, Component, ComponentInstance
+from django.db.models import F, JSONField, OuterRef, Subquery
+from core.models import (
+    Parameter, ParameterValue, CurrentParameterValue, Component, ComponentInstance
+)
 from ..cpp_extensions import ParameterGraphManager
 from ...utils import UnitConverter
 from geometry.cad_model import CADModel
-from .parameter_constraint import ParameterConstraint
+from .parameter_constraint import (
+    BatchValidationResult,
+    ParameterConstraint,
+    compiled_constraint,
+)
 from .parametric_value import ParametricValue
+from .value_cache import MISSING, ParameterValueCache, invalidate_on_commit
+from .shared_cache import SharedParameterCache
 
 class ParameterManager:
     """
@@ -29,50 +39,264 @@ class ParameterManager:
     the parameter graph.
     """
     
-    def __init__(self):
-        """Initialize the ParameterManager."""
+    def __init__(self, cache_size: int = 100_000,
+                 shared_cache: Optional[SharedParameterCache] = None,
+                 lazy: bool = False, max_components: Optional[int] = None):
+        """
+        Initialize the ParameterManager.
+
+        Args:
+            cache_size (int): Maximum number of current values kept in the
+                in-process value cache.
+            shared_cache (Optional[SharedParameterCache]): Cache shared with
+                other processes. Defaults to the one configured by the
+                EUROTEMPL_PARAMETER_CACHE setting, if any.
+            lazy (bool): Load a component's parameters on first access
+                instead of loading every parameter up front.
+            max_components (Optional[int]): In lazy mode, the number of
+                resident components above which the least recently used
+                ones are evicted. Unbounded if None.
+
+        Raises:
+            ValueError: If max_components is given without lazy mode or is
+                not positive.
+        """
+        if max_components is not None and (not lazy or max_components < 1):
+            raise ValueError("max_components requires lazy mode and must be positive")
         self._graph = ParameterGraphManager()
-        self._thread_pool = concurrent.futures.ThreadPoolExecutor(
-            max_workers=4,
-            thread_name_prefix="param_worker"
-        )
         self._parameters: Dict[str, Parameter] = {}
+        self._component_parameters: Dict[str, List[str]] = {}
         self._cad_models: Dict[str, CADModel] = {}
-        self._load_parameters()
+        self._value_cache = ParameterValueCache(cache_size)
+        self._shared_cache = shared_cache or SharedParameterCache.from_settings()
+        # Shared-cache stamps the local state was loaded under.
+        self._component_stamps: Dict[str, Optional[str]] = {}
+        self._instance_stamps: Dict[str, Optional[str]] = {}
+        self._lazy = lazy
+        self._max_components = max_components
+        # Loaded components in least- to most-recently-used order (lazy mode).
+        self._resident: 'OrderedDict[str, None]' = OrderedDict()
+        if not lazy:
+            self._load_parameters()
 
     def _load_parameters(self) -> None:
         """
         Load existing parameters from database.
 
         This method populates the internal parameter dictionary and graph
-        with existing parameters from the database.
-        """
-        for param in Parameter.objects.all():
-            self._parameters[str(param.id)] = param
-            self._graph.add_parameter(
-                str(param.id),
-                param.name,
-                param.data_type,
-                self._get_current_value(param)
+        with existing parameters from the database. Parameters and their
+        latest valid values are fetched in a single query, and the graph
+        is built with a single bulk call. With a shared cache, components
+        cached by another process are taken from it instead.
+        """
+        if self._shared_cache is None:
+            self._install_components(self._query_components())
+        else:
+            self._load_components(self._stored_component_ids())
+
+    def _stored_component_ids(self) -> List[str]:
+        """
+        Get the IDs of all components that have parameters.
+
+        Returns:
+            List[str]: Component IDs.
+        """
+        return [
+            str(component_id) for component_id in
+            Parameter.objects.values_list('component_id', flat=True).distinct()
+        ]
+
+    def _query_components(self, component_ids: Optional[Iterable[str]] = None
+                          ) -> Dict[str, List[Tuple[Parameter, float]]]:
+        """
+        Fetch parameters and their latest valid values in a single query.
+
+        Args:
+            component_ids (Optional[Iterable[str]]): Restrict to these
+                components; all components if None.
+
+        Returns:
+            Dict[str, List[Tuple[Parameter, float]]]: Parameters with their
+                values, grouped by component ID.
+        """
+        latest_value = CurrentParameterValue.objects.filter(
+            parameter=OuterRef('pk')
+        ).order_by('-recorded_at').values('value')[:1]
+        params = Parameter.objects.annotate(
+            current_value=Subquery(latest_value, output_field=JSONField())
+        )
+        if component_ids is not None:
+            params = params.filter(component_id__in=list(component_ids))
+
+        components: Dict[str, List[Tuple[Parameter, float]]] = {}
+        for param in params:
+            components.setdefault(str(param.component_id), []).append(
+                (param, self._extract_value(param.current_value))
             )
+        return components
 
-    def _get_current_value(self, param: Parameter) -> float:
+    def _load_components(self, component_ids: List[str]) -> None:
         """
-        Get current value for a parameter.
+        Load components through the shared cache.
+
+        Components whose definitions are cached under their current stamp
+        are taken from the shared cache; the rest are read from the
+        database in one query and stored for other processes.
+
+        Args:
+            component_ids (List[str]): IDs of the components to load.
+        """
+        stamps = self._shared_cache.get_component_stamps(component_ids)
+        components = self._shared_cache.get_components(stamps)
+        missing = [component_id for component_id in component_ids
+                   if component_id not in components]
+        if missing:
+            loaded = self._query_components(missing)
+            stamps.update(self._shared_cache.set_components(loaded, stamps))
+            components.update(loaded)
+        self._install_components(components)
+        self._component_stamps.update(stamps)
+
+    def _install_components(self, components: Dict[str, List[Tuple[Parameter, float]]]) -> None:
+        """
+        Register loaded parameters and add them to the graph in one call.
 
         Args:
-            param (Parameter): The parameter to get the value for.
+            components (Dict[str, List[Tuple[Parameter, float]]]): Parameters
+                with their values, grouped by component ID.
+        """
+        entries = [entry for params in components.values() for entry in params]
+        for param, _ in entries:
+            self._register_parameter(param)
+        self._graph.add_parameters_bulk(
+            [str(param.id) for param, _ in entries],
+            [param.name for param, _ in entries],
+            [param.data_type for param, _ in entries],
+            [value for _, value in entries]
+        )
+
+    def refresh_parameters(self) -> List[str]:
+        """
+        Reload the components another process changed.
+
+        Only components whose shared-cache stamp differs from the one they
+        were loaded under, and components that are new, are reloaded. In
+        lazy mode only resident components are considered. Without a shared
+        cache this is a no-op.
 
         Returns:
-            float: The current value of the parameter.
+            List[str]: IDs of the reloaded components.
         """
-        try:
-            param_value = param.parametervalue_set.filter(
-                validation_status='valid'
-            ).latest('recorded_at')
-            return param_value.value.get('value', 0.0)
-        except ParameterValue.DoesNotExist:
+        if self._shared_cache is None:
+            return []
+        component_ids = list(self._resident) if self._lazy else self._stored_component_ids()
+        stamps = self._shared_cache.get_component_stamps(component_ids)
+        changed = [
+            component_id for component_id in component_ids
+            if component_id not in self._component_stamps
+            or stamps[component_id] != self._component_stamps[component_id]
+        ]
+        if changed:
+            self._load_components(changed)
+        return changed
+
+    def _register_parameter(self, param: Parameter) -> None:
+        """
+        Index a parameter by its ID and by its component.
+
+        Args:
+            param (Parameter): The parameter to register.
+        """
+        param_id = str(param.id)
+        if param_id not in self._parameters:
+            self._component_parameters.setdefault(
+                str(param.component_id), []
+            ).append(param_id)
+        self._parameters[param_id] = param
+
+    def _ensure_components(self, component_ids: Iterable[str]) -> None:
+        """
+        Make sure components are loaded, loading missing ones in one batch.
+
+        Does nothing unless the manager is lazy. Accessed components become
+        the most recently used; if more than max_components are resident
+        afterwards, the least recently used ones are evicted.
+
+        Args:
+            component_ids (Iterable[str]): IDs of the components needed.
+        """
+        if not self._lazy:
+            return
+        needed = [str(component_id) for component_id in dict.fromkeys(component_ids)]
+        missing = []
+        for component_id in needed:
+            if component_id in self._resident:
+                self._resident.move_to_end(component_id)
+            else:
+                missing.append(component_id)
+        if missing:
+            if self._shared_cache is None:
+                self._install_components(self._query_components(missing))
+            else:
+                self._load_components(missing)
+            self._resident.update(dict.fromkeys(missing))
+            self._evict_components(protected=set(needed))
+
+    def _ensure_parameter(self, param_id: str) -> None:
+        """
+        Make sure the component owning a parameter is loaded.
+
+        Args:
+            param_id (str): ID of the parameter needed.
+        """
+        if self._lazy and param_id not in self._parameters:
+            component_ids = Parameter.objects.filter(id=param_id).values_list(
+                'component_id', flat=True
+            )
+            self._ensure_components(component_ids)
+
+    def _evict_components(self, protected: Set[str]) -> None:
+        """
+        Evict least recently used components above max_components.
+
+        Components whose parameters take part in a dependency are kept:
+        dependencies only live in the graph and could not be reloaded.
+
+        Args:
+            protected (Set[str]): Component IDs that must stay resident.
+        """
+        if self._max_components is None:
+            return
+        for component_id in list(self._resident):
+            if len(self._resident) <= self._max_components:
+                break
+            if component_id in protected:
+                continue
+            param_ids = self._component_parameters.get(component_id, [])
+            if any(self._graph.has_dependencies(param_id) for param_id in param_ids):
+                continue
+            self._graph.remove_parameters(param_ids)
+            for param_id in param_ids:
+                del self._parameters[param_id]
+            self._component_parameters.pop(component_id, None)
+            self._component_stamps.pop(component_id, None)
+            del self._resident[component_id]
+
+    @staticmethod
+    def _extract_value(raw_value: Optional[Dict[str, Any]]) -> Any:
+        """
+        Extract the value from a stored ParameterValue payload.
+
+        Args:
+            raw_value (Optional[Dict[str, Any]]): The JSON payload, or None
+                if the parameter has no valid value yet.
+
+        Returns:
+            Any: The stored value as given, or 0.0 if there is none.
+        """
+        if raw_value is None:
             return 0.0
+        return raw_value.get('value', 0.0)
 
     @transaction.atomic
     def add_parameter(self, component: Component, name: str, 
@@ -89,6 +313,7 @@ class ParameterManager:
         Returns:
             Parameter: The newly created parameter.
         """
+        self._ensure_components([component.id])
         valid_ranges = {}
         if constraints.min_value is not None:
             valid_ranges['min'] = constraints.min_value
@@ -115,7 +340,12 @@ class ParameterManager:
             0.0  # Default value
         )
         
-        self._parameters[str(param.id)] = param
+        self._register_parameter(param)
+        if self._shared_cache is not None:
+            # Record the new stamp so this manager does not reload its own write.
+            transaction.on_commit(lambda: self._component_stamps.update(
+                self._shared_cache.invalidate_components([str(component.id)])
+            ))
         return param
 
     def update_parameter(self, instance: ComponentInstance, 
@@ -124,6 +354,12 @@ class ParameterManager:
         """
         Update parameter value and propagate changes.
 
+        The new value and every propagated dependent value are appended to
+        the history and made current in the same transaction; dependents
+        are written with one history insert and one current-value upsert.
+        If anything in the transaction fails, the in-memory graph values are
+        restored along with the database rollback.
+
         Args:
             instance (ComponentInstance): The instance being updated.
             param_id (str): ID of the parameter to update.
@@ -131,101 +367,343 @@ class ParameterManager:
             modified_by (str): Identifier of who modified the parameter.
 
         Returns:
-            List[str]: List of affected parameter IDs.
+            List[str]: List of transitively affected parameter IDs, in
+                the order they were recalculated.
 
         Raises:
             KeyError: If the parameter_id is not found.
         """
+        self._ensure_components([instance.component_id])
+        self._ensure_parameter(param_id)
         if param_id not in self._parameters:
             raise KeyError(f"Parameter {param_id} not found")
     
         parameter = self._parameters[param_id]
-        constraints = ParameterConstraint(
-            min_value=parameter.valid_ranges.get('min'),
-            max_value=parameter.valid_ranges.get('max'),
-            step=parameter.valid_ranges.get('step'),
-            unit=parameter.units,
-            grid_aligned=parameter.valid_ranges.get('grid_aligned', False)
-        )
-        
-        new_value.validate(constraints)
+        new_value.validate(compiled_constraint(parameter))
         
-        with transaction.atomic():
-            ParameterValue.objects.create(
+        previous = {
+            affected_id: self._graph.get_parameter_value(affected_id)
+            for affected_id in [param_id, *self._graph.get_propagation_order(param_id)]
+        }
+        try:
+            with transaction.atomic():
+                ParameterValue.objects.create(
+                    instance=instance,
+                    parameter=parameter,
+                    value={
+                        'value': new_value.value,
+                        'unit': new_value.unit
+                    },
+                    validation_status='valid',
+                    modified_by=modified_by
+                )
+                
+                affected = self._graph.update_values({param_id: new_value.value})
+                values = self._save_dependent_values(instance, affected, modified_by)
+                values[param_id] = new_value.value
+                self._cache_on_commit(instance, values)
+        except Exception:
+            self._graph.restore_values(previous)
+            raise
+        return affected
+    
+    def _save_dependent_values(self, instance: ComponentInstance, param_ids: List[str],
+                               modified_by: str) -> Dict[str, float]:
+        """
+        Persist the graph values of dependent parameters.
+
+        Values are validated in memory, appended to the history with a
+        single bulk_create and made current with a single upsert, so the
+        writes share the caller's transaction instead of issuing one
+        INSERT per parameter.
+
+        Args:
+            instance (ComponentInstance): The instance being updated.
+            param_ids (List[str]): IDs of the dependent parameters to save.
+            modified_by (str): Identifier of who modified the parameters.
+
+        Returns:
+            Dict[str, float]: The saved values keyed by parameter ID.
+
+        Raises:
+            ValidationError: If a propagated value violates its parameter's
+                constraints.
+        """
+        if not param_ids:
+            return {}
+
+        dependent_values = []
+        for param_id in param_ids:
+            parameter = self._parameters[param_id]
+            dependent_value = ParameterValue(
                 instance=instance,
                 parameter=parameter,
                 value={
-                    'value': new_value.value,
-                    'unit': new_value.unit
+                    'value': self._graph.get_parameter_value(param_id),
+                    'unit': parameter.units
                 },
                 validation_status='valid',
                 modified_by=modified_by
             )
-            
-            self._graph.update_value(param_id, new_value.value)
-            affected = self._graph.get_affected_parameters(param_id)
-            
-            futures = []
-            for affected_id in affected:
-                futures.append(
-                    self._thread_pool.submit(
-                        self._update_dependent, 
-                        instance, 
-                        affected_id,
-                        modified_by
-                    )
-                )
-            concurrent.futures.wait(futures)
-            
-            return affected
-    
-    def _update_dependent(self, instance: ComponentInstance, param_id: str, 
-                          modified_by: str) -> None:
+            dependent_value.clean()
+            dependent_values.append(dependent_value)
+
+        ParameterValue.objects.bulk_create(dependent_values)
+        CurrentParameterValue.upsert(dependent_values)
+        # bulk_create sends no post_save, so invalidate other caches here.
+        invalidate_on_commit((str(instance.id), param_id) for param_id in param_ids)
+        return {
+            str(value.parameter_id): value.value['value'] for value in dependent_values
+        }
+
+    def _cache_on_commit(self, instance: ComponentInstance, values: Dict[str, float]) -> None:
         """
-        Update a dependent parameter based on relationship rules.
+        Write values through to the value cache once the transaction commits.
+
+        With a shared cache, the stamps of the instance and its component
+        are replaced as well so other processes reload them. Registered
+        after the model signals' own invalidation, so the stamps recorded
+        here are the latest and this manager does not reload its own write.
 
         Args:
-            instance (ComponentInstance): The instance being updated.
-            param_id (str): ID of the parameter to update.
-            modified_by (str): Identifier of who modified the parameter.
+            instance (ComponentInstance): The instance the values belong to.
+            values (Dict[str, float]): Parameter IDs to their new values.
         """
-        parameter = self._parameters[param_id]
-        new_value = self._graph.get_parameter_value(param_id)
-        
-        ParameterValue.objects.create(
-            instance=instance,
-            parameter=parameter,
-            value={
-                'value': new_value,
-                'unit': parameter.units
-            },
-            validation_status='valid',
-            modified_by=modified_by
-        )
-        
+        instance_id = str(instance.id)
+        entries = {(instance_id, param_id): value for param_id, value in values.items()}
+
+        def write_through():
+            if self._shared_cache is not None:
+                self._instance_stamps.update(
+                    self._shared_cache.invalidate_instances([instance_id])
+                )
+                self._component_stamps.update(
+                    self._shared_cache.invalidate_components([str(instance.component_id)])
+                )
+            self._value_cache.put_many(entries)
+
+        transaction.on_commit(write_through)
+
     def get_parameter_values(self, instance: ComponentInstance) -> Dict[str, float]:
         """
         Get current values for all parameters of an instance.
 
+        Only parameters of the instance's component are returned. All
+        current values are fetched in a single indexed lookup.
+
         Args:
             instance (ComponentInstance): The instance to get values for.
 
         Returns:
             Dict[str, float]: Dictionary of parameter IDs to their current values.
         """
-        values = {}
-        for param_id, param in self._parameters.items():
-            try:
-                value = ParameterValue.objects.filter(
-                    instance=instance,
-                    parameter=param,
-                    validation_status='valid'
-                ).latest('recorded_at')
-                values[param_id] = value.value.get('value')
-            except ParameterValue.DoesNotExist:
-                values[param_id] = 0.0
+        return self.get_parameter_values_bulk([instance])[str(instance.id)]
+
+    def get_parameter_values_bulk(self, instances: List[ComponentInstance]) -> Dict[str, Dict[str, float]]:
+        """
+        Get current values for all parameters of many instances.
+
+        Each instance only receives the parameters of its own component.
+        Values are served from the value cache; instances with any
+        uncached parameter are read from the materialized current-value
+        table in a single query and then cached.
+
+        Args:
+            instances (List[ComponentInstance]): The instances to get values for.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Mapping of instance IDs to dictionaries
+                of parameter IDs to their current values.
+        """
+        values = self._empty_values(instances)
+        stamps = self._refresh_instance_stamps(values)
+        uncached = []
+        for instance in instances:
+            instance_id = str(instance.id)
+            instance_values = values[instance_id]
+            for param_id in instance_values:
+                cached = self._value_cache.get(instance_id, param_id, MISSING)
+                if cached is MISSING:
+                    uncached.append(instance)
+                    break
+                instance_values[param_id] = cached
+        if not uncached:
+            return values
+
+        # Taken before reading, so values overwritten meanwhile are not cached.
+        generations = self._value_cache.generations(
+            (str(instance.id), param_id)
+            for instance in uncached
+            for param_id in values[str(instance.id)]
+        )
+
+        if stamps is not None:
+            shared = self._shared_cache.get_instances(
+                {str(instance.id): stamps[str(instance.id)] for instance in uncached}
+            )
+            for instance_id, instance_values in shared.items():
+                values[instance_id].update(
+                    (param_id, value) for param_id, value in instance_values.items()
+                    if param_id in values[instance_id]
+                )
+            query_instances = [instance for instance in uncached
+                               if str(instance.id) not in shared]
+        else:
+            query_instances = uncached
+
+        if query_instances:
+            latest = CurrentParameterValue.objects.filter(
+                instance__in=query_instances,
+                parameter__component_id=F('instance__component_id')
+            ).values_list('instance_id', 'parameter_id', 'value')
+            self._fill_values(values, latest)
+            if stamps is not None:
+                self._instance_stamps.update(self._shared_cache.set_instances(
+                    {str(instance.id): values[str(instance.id)] for instance in query_instances},
+                    stamps
+                ))
+        self._value_cache.fill({
+            (str(instance.id), param_id): value
+            for instance in uncached
+            for param_id, value in values[str(instance.id)].items()
+        }, generations)
         return values
 
+    def _refresh_instance_stamps(self, values: Dict[str, Dict[str, float]]
+                                 ) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Drop locally cached values of instances changed by other processes.
+
+        Args:
+            values (Dict[str, Dict[str, float]]): Dictionaries built by
+                _empty_values() for the instances being read.
+
+        Returns:
+            Optional[Dict[str, Optional[str]]]: Current shared-cache stamp
+                per instance, or None without a shared cache.
+        """
+        if self._shared_cache is None or not values:
+            return None
+        stamps = self._shared_cache.get_instance_stamps(values)
+        for instance_id, stamp in stamps.items():
+            if self._instance_stamps.get(instance_id) != stamp:
+                self._value_cache.invalidate(
+                    (instance_id, param_id) for param_id in values[instance_id]
+                )
+                self._instance_stamps[instance_id] = stamp
+        return stamps
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get value cache statistics for sizing the cache.
+
+        Returns:
+            Dict[str, int]: Hits, misses, evictions, current size and
+                maximum size of the value cache.
+        """
+        return self._value_cache.get_stats()
+
+    def get_parameter_snapshot(self, instance: ComponentInstance,
+                               moment: datetime) -> Dict[str, float]:
+        """
+        Get the values all parameters of an instance had at a given moment.
+
+        Args:
+            instance (ComponentInstance): The instance to get values for.
+            moment (datetime): The point in time to look at.
+
+        Returns:
+            Dict[str, float]: Dictionary of parameter IDs to their values at
+                `moment`; parameters without a valid value by then report 0.0.
+        """
+        return self.get_parameter_snapshots_bulk([instance], moment)[str(instance.id)]
+
+    def get_parameter_snapshots_bulk(self, instances: List[ComponentInstance],
+                                     moment: datetime) -> Dict[str, Dict[str, float]]:
+        """
+        Get the values all parameters of many instances had at a given moment.
+
+        Each instance only receives the parameters of its own component.
+        The snapshot is read from the value history in a single query.
+
+        Args:
+            instances (List[ComponentInstance]): The instances to get values for.
+            moment (datetime): The point in time to look at.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Mapping of instance IDs to dictionaries
+                of parameter IDs to their values at `moment`.
+        """
+        values = self._empty_values(instances)
+        if not values:
+            return values
+
+        snapshot = ParameterValue.objects.filter(
+            parameter__component_id=F('instance__component_id')
+        ).as_of(moment, instances).values_list('instance_id', 'parameter_id', 'value')
+        return self._fill_values(values, snapshot)
+
+    def _empty_values(self, instances: List[ComponentInstance]) -> Dict[str, Dict[str, float]]:
+        """
+        Build the per-instance value dictionaries with every parameter at 0.0.
+
+        Args:
+            instances (List[ComponentInstance]): The instances to build them for.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Mapping of instance IDs to dictionaries
+                of their component's parameter IDs to 0.0.
+        """
+        self._ensure_components(instance.component_id for instance in instances)
+        return {
+            str(instance.id): dict.fromkeys(
+                self._component_parameters.get(str(instance.component_id), ()),
+                0.0
+            )
+            for instance in instances
+        }
+
+    def _fill_values(self, values: Dict[str, Dict[str, float]],
+                     records) -> Dict[str, Dict[str, float]]:
+        """
+        Fill per-instance value dictionaries from stored value rows.
+
+        Args:
+            values (Dict[str, Dict[str, float]]): Dictionaries built by
+                _empty_values(), updated in place.
+            records: Iterable of (instance_id, parameter_id, value) rows.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The filled dictionaries.
+        """
+        for instance_id, parameter_id, value in records:
+            instance_values = values[str(instance_id)]
+            if str(parameter_id) in instance_values:
+                instance_values[str(parameter_id)] = self._extract_value(value)
+        return values
+
+    def validate_parameter_values(self, param_id: str, values: Any) -> BatchValidationResult:
+        """
+        Validate many candidate values of one parameter at once.
+
+        Intended for imports: the values are checked in a single vectorized
+        pass against the parameter's compiled constraints.
+
+        Args:
+            param_id (str): ID of the parameter the values are for.
+            values (Any): One-dimensional array-like of values.
+
+        Returns:
+            BatchValidationResult: Validity mask and per-index reasons.
+
+        Raises:
+            KeyError: If the parameter_id is not found.
+        """
+        self._ensure_parameter(param_id)
+        if param_id not in self._parameters:
+            raise KeyError(f"Parameter {param_id} not found")
+        return compiled_constraint(self._parameters[param_id]).validate_batch(values)
+
     def validate_grid_alignment(self, value: float) -> bool:
         """
         Validate alignment with 25mm grid.
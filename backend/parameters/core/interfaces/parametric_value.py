@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Union
 import concurrent.futures
 from django.core.exceptions import ValidationError
 from django.db import transaction
@@ -7,7 +7,7 @@ from core.models import Parameter, ParameterValue, Component, ComponentInstance
 from ..cpp_extensions import ParameterGraphManager
 from ...utils import UnitConverter
 from geometry.cad_model import CADModel
-from .parameter_constraint import ParameterConstraint
+from .parameter_constraint import CompiledConstraint, ParameterConstraint
 
 
 @dataclass
@@ -25,8 +25,8 @@ class ParametricValue:
     value: float
     unit: Optional[str] = None
 
-    def validate(self, constraint: ParameterConstraint) -> None:
-        """Validate value against constraints."""
+    def validate(self, constraint: Union[ParameterConstraint, CompiledConstraint]) -> None:
+        """Validate value against constraints, plain or compiled."""
         if not isinstance(self.value, (int, float)):
             raise ValidationError("Invalid value type - must be numeric")
             
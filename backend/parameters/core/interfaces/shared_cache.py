@@ -0,0 +1,318 @@
+"""
+EuroTempl System - Shared Parameter Cache
+
+This module provides a cache of parameter definitions and current values
+shared between processes through Django's cache framework, so any
+configured backend (locmem, file-based, Redis, Memcached) can be used.
+
+Every component and every instance has a version stamp. Cached payloads
+are stored under the stamp that was current when they were read from the
+database; a write replaces the stamp instead of deleting payloads, so a
+worker only reloads what changed and a payload written concurrently with
+an invalidation is never served. Saving or deleting a Parameter or a
+ParameterValue replaces the affected stamps once the transaction commits,
+whoever made the change.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import functools
+import uuid
+import weakref
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core.models import Parameter, ParameterValue
+
+KEY_PREFIX = 'eurotempl:parameters'
+
+# Every live shared cache, so model signals can reach all of them.
+_caches: 'weakref.WeakSet[SharedParameterCache]' = weakref.WeakSet()
+
+
+class SharedParameterCache:
+    """
+    Version-stamped parameter cache on top of a Django cache backend.
+
+    Attributes:
+        alias (str): Name of the Django cache (a key of settings.CACHES).
+        timeout (Optional[int]): Lifetime of cached payloads in seconds;
+            version stamps never expire.
+    """
+
+    def __init__(self, alias: str = 'default', timeout: Optional[int] = 3600):
+        """
+        Initialize the shared cache.
+
+        Args:
+            alias (str): Name of the Django cache to use.
+            timeout (Optional[int]): Lifetime of cached payloads in seconds,
+                or None to keep them until evicted by the backend.
+        """
+        self.alias = alias
+        self.timeout = timeout
+        self._cache = caches[alias]
+        _caches.add(self)
+
+    @classmethod
+    def from_settings(cls) -> Optional['SharedParameterCache']:
+        """
+        Build the shared cache configured in settings, if any.
+
+        Reads EUROTEMPL_PARAMETER_CACHE (a cache alias) and
+        EUROTEMPL_PARAMETER_CACHE_TIMEOUT.
+
+        Returns:
+            Optional[SharedParameterCache]: The configured cache, or None if
+                sharing is disabled.
+        """
+        alias = getattr(settings, 'EUROTEMPL_PARAMETER_CACHE', None)
+        if not alias:
+            return None
+        return cls(alias, getattr(settings, 'EUROTEMPL_PARAMETER_CACHE_TIMEOUT', 3600))
+
+    def get_component_stamps(self, component_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Get the current version stamps of components.
+
+        Args:
+            component_ids (Iterable[str]): IDs of the components.
+
+        Returns:
+            Dict[str, Optional[str]]: Stamp per component, None if the
+                component has no stamp yet.
+        """
+        return self._get_stamps('component', component_ids)
+
+    def get_components(self, stamps: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """
+        Get cached parameter definitions of components.
+
+        Args:
+            stamps (Dict[str, Optional[str]]): Component stamps as returned
+                by get_component_stamps().
+
+        Returns:
+            Dict[str, Any]: Payload per component whose current stamp has
+                one; components missing from the result must be loaded from
+                the database.
+        """
+        return self._get_payloads('component', stamps)
+
+    def set_components(self, payloads: Dict[str, Any],
+                       stamps: Dict[str, Optional[str]]) -> Dict[str, str]:
+        """
+        Store parameter definitions of components.
+
+        Args:
+            payloads (Dict[str, Any]): Payload per component ID.
+            stamps (Dict[str, Optional[str]]): Stamps read before the payloads
+                were loaded from the database.
+
+        Returns:
+            Dict[str, str]: Stamps created for components that had none.
+        """
+        return self._set_payloads('component', payloads, stamps)
+
+    def invalidate_components(self, component_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Mark the cached definitions of components as stale in every process.
+
+        Args:
+            component_ids (Iterable[str]): IDs of the changed components.
+
+        Returns:
+            Dict[str, str]: The new stamp of each component.
+        """
+        return self._bump('component', component_ids)
+
+    def get_instance_stamps(self, instance_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Get the current version stamps of instances.
+
+        Args:
+            instance_ids (Iterable[str]): IDs of the component instances.
+
+        Returns:
+            Dict[str, Optional[str]]: Stamp per instance, None if the
+                instance has no stamp yet.
+        """
+        return self._get_stamps('instance', instance_ids)
+
+    def get_instances(self, stamps: Dict[str, Optional[str]]) -> Dict[str, Dict[str, float]]:
+        """
+        Get cached current values of instances.
+
+        Args:
+            stamps (Dict[str, Optional[str]]): Instance stamps as returned
+                by get_instance_stamps().
+
+        Returns:
+            Dict[str, Dict[str, float]]: Parameter values per instance whose
+                current stamp has a payload.
+        """
+        return self._get_payloads('instance', stamps)
+
+    def set_instances(self, values: Dict[str, Dict[str, float]],
+                      stamps: Dict[str, Optional[str]]) -> Dict[str, str]:
+        """
+        Store current values of instances.
+
+        Args:
+            values (Dict[str, Dict[str, float]]): Parameter values per
+                instance ID.
+            stamps (Dict[str, Optional[str]]): Stamps read before the values
+                were loaded from the database.
+
+        Returns:
+            Dict[str, str]: Stamps created for instances that had none.
+        """
+        return self._set_payloads('instance', values, stamps)
+
+    def invalidate_instances(self, instance_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Mark the cached values of instances as stale in every process.
+
+        Args:
+            instance_ids (Iterable[str]): IDs of the changed instances.
+
+        Returns:
+            Dict[str, str]: The new stamp of each instance.
+        """
+        return self._bump('instance', instance_ids)
+
+    @staticmethod
+    def _stamp_key(kind: str, object_id: str) -> str:
+        return f'{KEY_PREFIX}:{kind}:stamp:{object_id}'
+
+    @staticmethod
+    def _payload_key(kind: str, object_id: str, stamp: str) -> str:
+        return f'{KEY_PREFIX}:{kind}:{object_id}:{stamp}'
+
+    def _get_stamps(self, kind: str, object_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        keys = {self._stamp_key(kind, object_id): object_id for object_id in object_ids}
+        found = self._cache.get_many(list(keys))
+        return {object_id: found.get(key) for key, object_id in keys.items()}
+
+    def _get_payloads(self, kind: str, stamps: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        keys = {
+            self._payload_key(kind, object_id, stamp): object_id
+            for object_id, stamp in stamps.items()
+            if stamp is not None
+        }
+        if not keys:
+            return {}
+        found = self._cache.get_many(list(keys))
+        return {keys[key]: payload for key, payload in found.items()}
+
+    def _set_payloads(self, kind: str, payloads: Dict[str, Any],
+                      stamps: Dict[str, Optional[str]]) -> Dict[str, str]:
+        entries = {}
+        created = {}
+        for object_id, payload in payloads.items():
+            stamp = stamps.get(object_id)
+            if stamp is None:
+                # If another process stamped the object since our read, it
+                # may have written newer data; skip rather than serve ours.
+                stamp = uuid.uuid4().hex
+                if not self._cache.add(self._stamp_key(kind, object_id), stamp, timeout=None):
+                    continue
+                created[object_id] = stamp
+            entries[self._payload_key(kind, object_id, stamp)] = payload
+        if entries:
+            self._cache.set_many(entries, timeout=self.timeout)
+        return created
+
+    def _bump(self, kind: str, object_ids: Iterable[str]) -> Dict[str, str]:
+        stamps = {object_id: uuid.uuid4().hex for object_id in object_ids}
+        self._cache.set_many(
+            {self._stamp_key(kind, object_id): stamp for object_id, stamp in stamps.items()},
+            timeout=None
+        )
+        return stamps
+
+
+def restamp_on_commit(instance_ids: Iterable[str] = (),
+                      component_ids: Iterable[str] = ()) -> None:
+    """
+    Replace stamps in every live and the configured shared cache on commit.
+
+    Args:
+        instance_ids (Iterable[str]): IDs of instances whose values changed.
+        component_ids (Iterable[str]): IDs of components whose parameters or
+            values changed.
+    """
+    instance_ids, component_ids = list(instance_ids), list(component_ids)
+    targets = {cache.alias: cache for cache in list(_caches)}
+    configured = getattr(settings, 'EUROTEMPL_PARAMETER_CACHE', None)
+    if configured and configured not in targets:
+        targets[configured] = SharedParameterCache(configured)
+    if not targets:
+        return
+
+    def invalidate():
+        for cache in targets.values():
+            if instance_ids:
+                cache.invalidate_instances(instance_ids)
+            if component_ids:
+                cache.invalidate_components(component_ids)
+
+    transaction.on_commit(invalidate)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parameter_component(parameter_id) -> Optional[str]:
+    """
+    Get the component ID of a parameter, remembered across value writes.
+
+    Args:
+        parameter_id: ID of the parameter.
+
+    Returns:
+        Optional[str]: The component ID, or None if the parameter is gone.
+    """
+    component_id = Parameter.objects.filter(pk=parameter_id).values_list(
+        'component_id', flat=True
+    ).first()
+    return None if component_id is None else str(component_id)
+
+
+@receiver(post_save, sender=ParameterValue, dispatch_uid='parameter_value_shared_cache_save')
+@receiver(post_delete, sender=ParameterValue, dispatch_uid='parameter_value_shared_cache_delete')
+def invalidate_shared_value(sender, instance: ParameterValue, **kwargs) -> None:
+    """
+    Mark the shared values of a saved or deleted ParameterValue as stale.
+
+    The component is stamped too, as its cached definitions carry the
+    latest value of each parameter. The component comes from the loaded
+    parameter if there is one, and from a per-process lookup otherwise,
+    so a value write costs no extra query.
+
+    Args:
+        sender: The ParameterValue model.
+        instance (ParameterValue): The saved or deleted record.
+    """
+    if ParameterValue.parameter.is_cached(instance):
+        component_id = str(instance.parameter.component_id)
+    else:
+        component_id = _parameter_component(instance.parameter_id)
+    # None if deleted along with its parameter, whose own signal stamps the component.
+    restamp_on_commit([str(instance.instance_id)], [component_id] if component_id else [])
+
+
+@receiver(post_save, sender=Parameter, dispatch_uid='parameter_shared_cache_save')
+@receiver(post_delete, sender=Parameter, dispatch_uid='parameter_shared_cache_delete')
+def invalidate_shared_parameter(sender, instance: Parameter, **kwargs) -> None:
+    """
+    Mark the shared definitions of a saved or deleted Parameter's component as stale.
+
+    Args:
+        sender: The Parameter model.
+        instance (Parameter): The saved or deleted parameter.
+    """
+    _parameter_component.cache_clear()
+    restamp_on_commit(component_ids=[str(instance.component_id)])
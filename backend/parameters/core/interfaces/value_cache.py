@@ -0,0 +1,261 @@
+"""
+EuroTempl System - Parameter Value Cache
+
+This module provides a bounded, thread-safe LRU cache of current parameter
+values keyed by (instance_id, parameter_id). ParameterManager writes
+through to it and every live cache is invalidated when a ParameterValue
+is saved or deleted.
+
+Values read from the database are stored with fill(), which only accepts
+keys whose generation has not moved since the read started: a write or
+invalidation racing with the read bumps the generation, so the stale
+value it read is dropped instead of cached.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Tuple
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core.models import ParameterValue
+
+CacheKey = Tuple[str, str]
+
+# Returned by get() on a miss when passed as default; unlike None it cannot
+# be a cached value.
+MISSING = object()
+
+# Every live cache, so model signals can reach all of them.
+_caches: 'weakref.WeakSet[ParameterValueCache]' = weakref.WeakSet()
+
+
+class ParameterValueCache:
+    """
+    Bounded LRU cache of current parameter values.
+
+    Attributes:
+        maxsize (int): Maximum number of cached values; the least recently
+            used value is evicted when it is exceeded.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of cached values.
+
+        Raises:
+            ValueError: If maxsize is not positive.
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self._values: 'OrderedDict[CacheKey, float]' = OrderedDict()
+        # Generation of every recently written key. Keys without an entry
+        # are at _floor, the highest generation ever dropped from the map,
+        # so the map stays bounded without ever accepting a stale fill.
+        self._generations: 'OrderedDict[CacheKey, int]' = OrderedDict()
+        self._counter = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        _caches.add(self)
+
+    def get(self, instance_id: str, parameter_id: str, default: Any = None) -> Any:
+        """
+        Look up a value and mark it as recently used.
+
+        Args:
+            instance_id (str): ID of the component instance.
+            parameter_id (str): ID of the parameter.
+            default (Any): Returned on a miss; pass MISSING to tell misses
+                apart from cached None values.
+
+        Returns:
+            Any: The cached value, or default on a miss.
+        """
+        key = (instance_id, parameter_id)
+        with self._lock:
+            value = self._values.get(key, MISSING)
+            if value is MISSING:
+                self._misses += 1
+                return default
+            self._values.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, instance_id: str, parameter_id: str, value: float) -> None:
+        """
+        Store a value, evicting the least recently used one if full.
+
+        Args:
+            instance_id (str): ID of the component instance.
+            parameter_id (str): ID of the parameter.
+            value (float): The current value.
+        """
+        self.put_many({(instance_id, parameter_id): value})
+
+    def put_many(self, values: Dict[CacheKey, float]) -> None:
+        """
+        Store several freshly written values at once.
+
+        The values supersede any read in flight, so fills started before
+        this call are rejected for these keys.
+
+        Args:
+            values (Dict[CacheKey, float]): Values keyed by
+                (instance_id, parameter_id).
+        """
+        with self._lock:
+            for key, value in values.items():
+                self._bump(key)
+                self._store(key, value)
+            self._evict()
+
+    def generations(self, keys: Iterable[CacheKey]) -> Dict[CacheKey, int]:
+        """
+        Get the current generation of keys, before reading their values.
+
+        Args:
+            keys (Iterable[CacheKey]): (instance_id, parameter_id) pairs.
+
+        Returns:
+            Dict[CacheKey, int]: Generation per key, to pass to fill().
+        """
+        with self._lock:
+            return {key: self._generations.get(key, self._floor) for key in keys}
+
+    def fill(self, values: Dict[CacheKey, float], generations: Dict[CacheKey, int]) -> None:
+        """
+        Store values read from the database unless they went stale meanwhile.
+
+        Args:
+            values (Dict[CacheKey, float]): Values keyed by
+                (instance_id, parameter_id).
+            generations (Dict[CacheKey, int]): Generations returned by
+                generations() before the values were read; keys whose
+                generation has moved since, or that are not listed, are
+                not stored.
+        """
+        with self._lock:
+            for key, value in values.items():
+                generation = generations.get(key)
+                if generation is not None and \
+                        self._generations.get(key, self._floor) == generation:
+                    self._store(key, value)
+            self._evict()
+
+    def invalidate(self, keys: Iterable[CacheKey]) -> None:
+        """
+        Drop cached values and reject fills already in flight for them.
+
+        Args:
+            keys (Iterable[CacheKey]): (instance_id, parameter_id) pairs.
+        """
+        with self._lock:
+            for key in keys:
+                self._bump(key)
+                self._values.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached value; statistics are kept."""
+        with self._lock:
+            self._values.clear()
+            self._generations.clear()
+            self._counter += 1
+            self._floor = self._counter
+
+    def _bump(self, key: CacheKey) -> None:
+        """Move a key to a new generation; the lock must be held."""
+        self._counter += 1
+        self._generations[key] = self._counter
+        self._generations.move_to_end(key)
+        if len(self._generations) > self.maxsize:
+            _, generation = self._generations.popitem(last=False)
+            self._floor = max(self._floor, generation)
+
+    def _store(self, key: CacheKey, value: float) -> None:
+        """Store a value as most recently used; the lock must be held."""
+        self._values[key] = value
+        self._values.move_to_end(key)
+
+    def _evict(self) -> None:
+        """Evict least recently used values beyond maxsize; the lock must be held."""
+        while len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+            self._evictions += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get usage statistics.
+
+        Returns:
+            Dict[str, int]: Hits, misses, evictions, current size and
+                maximum size.
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'size': len(self._values),
+                'maxsize': self.maxsize,
+            }
+
+    def reset_stats(self) -> None:
+        """Reset hit, miss and eviction counters."""
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def invalidate_everywhere(keys: Iterable[CacheKey]) -> None:
+    """
+    Invalidate values in every live cache of this process.
+
+    Args:
+        keys (Iterable[CacheKey]): (instance_id, parameter_id) pairs.
+    """
+    keys = list(keys)
+    for cache in list(_caches):
+        cache.invalidate(keys)
+
+
+def invalidate_on_commit(keys: Iterable[CacheKey]) -> None:
+    """
+    Invalidate values in every live cache now and again on commit.
+
+    A read between the write and its commit still sees the old value and
+    may cache it; the second invalidation, once the write is visible,
+    drops it. Also used for writes that send no model signals, such as
+    bulk_create.
+
+    Args:
+        keys (Iterable[CacheKey]): (instance_id, parameter_id) pairs.
+    """
+    keys = list(keys)
+    invalidate_everywhere(keys)
+    transaction.on_commit(lambda: invalidate_everywhere(keys))
+
+
+@receiver(post_save, sender=ParameterValue, dispatch_uid='parameter_value_cache_save')
+@receiver(post_delete, sender=ParameterValue, dispatch_uid='parameter_value_cache_delete')
+def invalidate_cached_value(sender, instance: ParameterValue, **kwargs) -> None:
+    """
+    Invalidate the cached value of a saved or deleted ParameterValue.
+
+    Args:
+        sender: The ParameterValue model.
+        instance (ParameterValue): The saved or deleted record.
+    """
+    invalidate_on_commit([(str(instance.instance_id), str(instance.parameter_id))])
@@ -10,16 +10,48 @@ namespace py = pybind11;
 PYBIND11_MODULE(parameters_engine, m) {
     m.doc() = "EuroTempl parameter management module";
 
+    py::register_exception_translator([](std::exception_ptr p) {
+        try {
+            if (p) {
+                std::rethrow_exception(p);
+            }
+        } catch (const eurotempl::parameters::ParameterNotFound& e) {
+            PyErr_SetString(PyExc_KeyError, e.what());
+        }
+    });
+
     py::class_<eurotempl::parameters::ParameterGraphManager>(m, "ParameterGraphManager")
         .def(py::init<>())
         .def("add_parameter", &eurotempl::parameters::ParameterGraphManager::addParameter,
             py::arg("id"), py::arg("name"), py::arg("type"), py::arg("value"),
             "Add a new parameter to the graph")
+        .def("add_parameters_bulk",
+            &eurotempl::parameters::ParameterGraphManager::addParametersBulk,
+            py::arg("ids"), py::arg("names"), py::arg("types"), py::arg("values"),
+            "Add parallel columns of parameters in one pass")
         .def("add_dependency", &eurotempl::parameters::ParameterGraphManager::addDependency,
-            py::arg("from_id"), py::arg("to_id"), py::arg("relationship"),
-            "Add a dependency between parameters")
+            py::arg("source"), py::arg("target"), py::arg("relationship"),
+            "Make source depend on target, rejecting cycles")
+        .def("add_dependencies_bulk",
+            &eurotempl::parameters::ParameterGraphManager::addDependenciesBulk,
+            py::arg("sources"), py::arg("targets"), py::arg("relationships"),
+            "Add parallel columns of dependencies, checking acyclicity once")
+        .def("remove_parameters",
+            &eurotempl::parameters::ParameterGraphManager::removeParameters,
+            py::arg("ids"),
+            "Remove parameters that take part in no dependency")
         .def("get_affected_parameters", 
             &eurotempl::parameters::ParameterGraphManager::getAffectedParameters,
             py::arg("changed_id"),
-            "Get parameters affected by a change");
-}
\ No newline at end of file
+            "Get parameters directly affected by a change")
+        // Keeps the GIL: graph_ is unsynchronized, so releasing it would let
+        // other threads mutate the graph during the traversal.
+        .def("get_propagation_order",
+            &eurotempl::parameters::ParameterGraphManager::getPropagationOrder,
+            py::arg("changed_ids"),
+            "Get downstream parameters in topological order")
+        .def("reaches", &eurotempl::parameters::ParameterGraphManager::reaches,
+            py::arg("start_id"), py::arg("goal_id"),
+            "Check whether goal depends on start")
+        .def("__len__", &eurotempl::parameters::ParameterGraphManager::size);
+}
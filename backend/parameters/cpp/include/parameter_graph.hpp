@@ -4,7 +4,10 @@
 #pragma once
 
 #include <boost/graph/adjacency_list.hpp>
+#include <stdexcept>
 #include <string>
+#include <unordered_map>
+#include <vector>
 #include <memory>
 
 namespace eurotempl {
@@ -21,6 +24,8 @@ struct ParameterEdge {
     std::string relationship;
 };
 
+// Edges point from an input parameter to the parameters that depend on it,
+// so out-edges of a vertex are its direct dependents.
 using ParameterGraph = boost::adjacency_list<
     boost::vecS,
     boost::vecS,
@@ -29,22 +34,62 @@ using ParameterGraph = boost::adjacency_list<
     ParameterEdge
 >;
 
+// Raised for unknown parameter identifiers (translated to KeyError).
+class ParameterNotFound : public std::out_of_range {
+public:
+    explicit ParameterNotFound(const std::string& id)
+        : std::out_of_range("Parameter " + id + " not found") {}
+};
+
 class ParameterGraphManager {
 public:
     ParameterGraphManager() = default;
     
     void addParameter(const std::string& id, const std::string& name,
                      const std::string& type, double value);
+
+    // Add parallel columns of parameters in one pass.
+    void addParametersBulk(const std::vector<std::string>& ids,
+                           const std::vector<std::string>& names,
+                           const std::vector<std::string>& types,
+                           const std::vector<double>& values);
     
-    void addDependency(const std::string& from_id, const std::string& to_id,
+    // Make source depend on target. Throws std::invalid_argument if the
+    // dependency would introduce a cycle.
+    void addDependency(const std::string& source_id, const std::string& target_id,
                       const std::string& relationship);
+
+    // Add parallel columns of dependencies, checking acyclicity once for the
+    // whole batch. On a cycle no dependency of the batch is kept.
+    void addDependenciesBulk(const std::vector<std::string>& source_ids,
+                             const std::vector<std::string>& target_ids,
+                             const std::vector<std::string>& relationships);
     
-    std::vector<std::string> getAffectedParameters(const std::string& changed_id);
+    // Remove parameters that take part in no dependency; unknown ids are
+    // skipped. Throws std::invalid_argument, removing nothing, if any
+    // parameter still has dependencies.
+    void removeParameters(const std::vector<std::string>& ids);
+
+    // Direct dependents of a parameter, in insertion order.
+    std::vector<std::string> getAffectedParameters(const std::string& changed_id) const;
+
+    // Parameters downstream of the changed ones in topological order,
+    // excluding the changed parameters themselves.
+    std::vector<std::string> getPropagationOrder(
+        const std::vector<std::string>& changed_ids) const;
+
+    // Whether goal depends, directly or transitively, on start.
+    bool reaches(const std::string& start_id, const std::string& goal_id) const;
+
+    std::size_t size() const noexcept { return boost::num_vertices(graph_); }
 
 private:
+    std::size_t vertexFor(const std::string& id) const;
+    bool isAcyclic() const;
+
     ParameterGraph graph_;
-    std::unordered_map<std::string, size_t> vertex_map_;
+    std::unordered_map<std::string, std::size_t> vertex_map_;
 };
 
 } // namespace parameters
-} // namespace eurotempl
\ No newline at end of file
+} // namespace eurotempl
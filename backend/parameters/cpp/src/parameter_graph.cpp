@@ -2,81 +2,273 @@
 // Copyright (c) 2024 Pygmalion Records
 
 #include "parameter_graph.hpp"
-#include <boost/graph/breadth_first_search.hpp>
+#include <boost/graph/depth_first_search.hpp>
+#include <boost/graph/topological_sort.hpp>
 #include <boost/graph/visitors.hpp>
+#include <iterator>
+#include <utility>
 
 namespace eurotempl {
 namespace parameters {
 
-class AffectedParametersVisitor : public boost::default_bfs_visitor {
+class PropagationOrderVisitor : public boost::default_dfs_visitor {
 public:
-    AffectedParametersVisitor(std::vector<std::string>& affected,
-                            const ParameterGraph& graph)
-        : affected_(affected), graph_(graph) {}
+    PropagationOrderVisitor(std::vector<std::size_t>& finished,
+                            const std::vector<bool>& is_root)
+        : finished_(finished), is_root_(is_root) {}
 
-    template <typename Vertex>
-    void discover_vertex(Vertex v, const ParameterGraph&) {
-        affected_.push_back(boost::get(&ParameterVertex::id, graph_, v));
+    template <typename Vertex, typename Graph>
+    void finish_vertex(Vertex v, const Graph&) {
+        if (!is_root_[v]) {
+            finished_.push_back(v);
+        }
     }
 
 private:
-    std::vector<std::string>& affected_;
-    const ParameterGraph& graph_;
+    std::vector<std::size_t>& finished_;
+    const std::vector<bool>& is_root_;
 };
 
-void ParameterGraphManager::add_parameter(
+std::size_t ParameterGraphManager::vertexFor(const std::string& id) const {
+    auto iter = vertex_map_.find(id);
+    if (iter == vertex_map_.end()) {
+        throw ParameterNotFound(id);
+    }
+    return iter->second;
+}
+
+void ParameterGraphManager::addParameter(
     const std::string& id,
     const std::string& name,
     const std::string& type,
     double value
 ) {
-    graph_.add_parameter(id, name, type, value);
+    auto iter = vertex_map_.find(id);
+    if (iter != vertex_map_.end()) {
+        graph_[iter->second] = ParameterVertex{id, name, type, value};
+        return;
+    }
+    auto vertex = boost::add_vertex(ParameterVertex{id, name, type, value}, graph_);
+    vertex_map_.emplace(id, vertex);
+}
+
+void ParameterGraphManager::addParametersBulk(
+    const std::vector<std::string>& ids,
+    const std::vector<std::string>& names,
+    const std::vector<std::string>& types,
+    const std::vector<double>& values
+) {
+    if (names.size() != ids.size() || types.size() != ids.size() ||
+        values.size() != ids.size()) {
+        throw std::invalid_argument("All columns must have the same length");
+    }
+    vertex_map_.reserve(vertex_map_.size() + ids.size());
+    for (std::size_t i = 0; i < ids.size(); ++i) {
+        addParameter(ids[i], names[i], types[i], values[i]);
+    }
 }
 
 void ParameterGraphManager::addDependency(
-    const std::string& from_id,
-    const std::string& to_id,
+    const std::string& source_id,
+    const std::string& target_id,
     const std::string& relationship
 ) {
-    auto from_iter = vertex_map_.find(from_id);
-    auto to_iter = vertex_map_.find(to_id);
-    
-    if (from_iter == vertex_map_.end() || to_iter == vertex_map_.end()) {
-        throw std::runtime_error("Parameter not found");
+    auto source = vertexFor(source_id);
+    auto target = vertexFor(target_id);
+
+    auto existing = boost::edge(target, source, graph_);
+    if (existing.second) {
+        graph_[existing.first].relationship = relationship;
+        return;
     }
-    
-    auto edge = boost::add_edge(from_iter->second, to_iter->second, graph_);
-    if (edge.second) {
-        graph_[edge.first].relationship = relationship;
+    if (source == target || reaches(source_id, target_id)) {
+        throw std::invalid_argument(
+            "Dependency " + source_id + " -> " + target_id + " would create a cycle");
     }
+    auto edge = boost::add_edge(target, source, graph_);
+    graph_[edge.first].relationship = relationship;
+}
+
+void ParameterGraphManager::addDependenciesBulk(
+    const std::vector<std::string>& source_ids,
+    const std::vector<std::string>& target_ids,
+    const std::vector<std::string>& relationships
+) {
+    if (target_ids.size() != source_ids.size() ||
+        relationships.size() != source_ids.size()) {
+        throw std::invalid_argument("All columns must have the same length");
+    }
+
+    std::vector<std::pair<std::size_t, std::size_t>> edges;
+    edges.reserve(source_ids.size());
+    for (std::size_t i = 0; i < source_ids.size(); ++i) {
+        edges.emplace_back(vertexFor(target_ids[i]), vertexFor(source_ids[i]));
+    }
+
+    std::vector<std::pair<std::size_t, std::size_t>> added;
+    std::vector<std::pair<ParameterGraph::edge_descriptor, std::string>> previous;
+    for (std::size_t i = 0; i < edges.size(); ++i) {
+        auto [from, to] = edges[i];
+        auto existing = boost::edge(from, to, graph_);
+        if (existing.second) {
+            previous.emplace_back(existing.first, graph_[existing.first].relationship);
+            graph_[existing.first].relationship = relationships[i];
+        } else {
+            auto edge = boost::add_edge(from, to, graph_);
+            graph_[edge.first].relationship = relationships[i];
+            added.emplace_back(from, to);
+        }
+    }
+
+    if (!isAcyclic()) {
+        for (auto it = previous.rbegin(); it != previous.rend(); ++it) {
+            graph_[it->first].relationship = it->second;
+        }
+        for (auto [from, to] : added) {
+            boost::remove_edge(from, to, graph_);
+        }
+        throw std::invalid_argument("Dependencies would create a cycle");
+    }
+}
+
+void ParameterGraphManager::removeParameters(const std::vector<std::string>& ids) {
+    std::vector<bool> removed(boost::num_vertices(graph_), false);
+    std::vector<std::string> linked;
+    std::size_t count = 0;
+    for (const auto& id : ids) {
+        auto iter = vertex_map_.find(id);
+        if (iter == vertex_map_.end() || removed[iter->second]) {
+            continue;
+        }
+        auto vertex = iter->second;
+        if (boost::in_degree(vertex, graph_) || boost::out_degree(vertex, graph_)) {
+            linked.push_back(id);
+        }
+        removed[vertex] = true;
+        ++count;
+    }
+    if (!linked.empty()) {
+        std::string message = "Parameters with dependencies cannot be removed: ";
+        for (std::size_t i = 0; i < linked.size(); ++i) {
+            message += (i ? ", " : "") + linked[i];
+        }
+        throw std::invalid_argument(message);
+    }
+    if (count == 0) {
+        return;
+    }
+
+    // vecS renumbers vertices on removal, so rebuild once in O(V + E)
+    // instead of shifting the storage for every removed vertex. Edges keep
+    // their per-vertex order, and with it the order of dependents.
+    ParameterGraph kept;
+    std::vector<std::size_t> index(boost::num_vertices(graph_));
+    for (auto [it, end] = boost::vertices(graph_); it != end; ++it) {
+        if (removed[*it]) {
+            vertex_map_.erase(graph_[*it].id);
+        } else {
+            index[*it] = boost::add_vertex(graph_[*it], kept);
+            vertex_map_[graph_[*it].id] = index[*it];
+        }
+    }
+    for (auto [it, end] = boost::edges(graph_); it != end; ++it) {
+        boost::add_edge(index[boost::source(*it, graph_)], index[boost::target(*it, graph_)],
+                        graph_[*it], kept);
+    }
+    graph_ = std::move(kept);
+}
+
+bool ParameterGraphManager::isAcyclic() const {
+    std::vector<std::size_t> order;
+    order.reserve(boost::num_vertices(graph_));
+    try {
+        boost::topological_sort(graph_, std::back_inserter(order));
+    } catch (const boost::not_a_dag&) {
+        return false;
+    }
+    return true;
 }
 
 std::vector<std::string> ParameterGraphManager::getAffectedParameters(
     const std::string& changed_id
-) {
+) const {
+    std::vector<std::string> affected;
     auto vertex_iter = vertex_map_.find(changed_id);
     if (vertex_iter == vertex_map_.end()) {
-        throw std::runtime_error("Parameter not found");
+        return affected;
+    }
+
+    for (auto [it, end] = boost::adjacent_vertices(vertex_iter->second, graph_);
+         it != end; ++it) {
+        affected.push_back(graph_[*it].id);
     }
-    
-    std::vector<std::string> affected;
-    std::vector<boost::default_color_type> color_map(boost::num_vertices(graph_));
-    
-    AffectedParametersVisitor visitor(affected, graph_);
-    
-    boost::breadth_first_search(
-        graph_,
-        vertex_iter->second,
-        boost::visitor(visitor).color_map(
-            boost::make_iterator_property_map(
-                color_map.begin(),
-                boost::get(boost::vertex_index, graph_)
-            )
-        )
-    );
-    
     return affected;
 }
 
+std::vector<std::string> ParameterGraphManager::getPropagationOrder(
+    const std::vector<std::string>& changed_ids
+) const {
+    const auto vertex_count = boost::num_vertices(graph_);
+    std::vector<bool> is_root(vertex_count, false);
+    std::vector<std::size_t> roots;
+    roots.reserve(changed_ids.size());
+    for (const auto& id : changed_ids) {
+        auto vertex = vertexFor(id);
+        if (!is_root[vertex]) {
+            is_root[vertex] = true;
+            roots.push_back(vertex);
+        }
+    }
+
+    // Roots start grey so one root's search never descends into another;
+    // each root's own dependents are covered when it is visited.
+    std::vector<boost::default_color_type> color_map(
+        vertex_count, boost::white_color);
+    for (auto root : roots) {
+        color_map[root] = boost::gray_color;
+    }
+    auto colors = boost::make_iterator_property_map(
+        color_map.begin(), boost::get(boost::vertex_index, graph_));
+
+    std::vector<std::size_t> finished;
+    PropagationOrderVisitor visitor(finished, is_root);
+    for (auto root : roots) {
+        boost::depth_first_visit(graph_, root, visitor, colors);
+    }
+
+    std::vector<std::string> order;
+    order.reserve(finished.size());
+    for (auto it = finished.rbegin(); it != finished.rend(); ++it) {
+        order.push_back(graph_[*it].id);
+    }
+    return order;
+}
+
+bool ParameterGraphManager::reaches(
+    const std::string& start_id,
+    const std::string& goal_id
+) const {
+    auto start = vertexFor(start_id);
+    auto goal = vertexFor(goal_id);
+
+    std::vector<bool> visited(boost::num_vertices(graph_), false);
+    std::vector<std::size_t> stack{start};
+    visited[start] = true;
+    while (!stack.empty()) {
+        auto vertex = stack.back();
+        stack.pop_back();
+        for (auto [it, end] = boost::adjacent_vertices(vertex, graph_); it != end; ++it) {
+            if (*it == goal) {
+                return true;
+            }
+            if (!visited[*it]) {
+                visited[*it] = true;
+                stack.push_back(*it);
+            }
+        }
+    }
+    return false;
+}
+
 } // namespace parameters
-} // namespace eurotempl
\ No newline at end of file
+} // namespace eurotempl
@@ -3,8 +3,33 @@ Copyright (c) 2024 Pygmalion Records"""
 
 import os
 import django
+import pytest
 from django.conf import settings
 
 def pytest_configure():
     
-    django.setup()
\ No newline at end of file
+    django.setup()
+
+
+# Model imports are deferred to the fixtures: this module is imported
+# before pytest_configure() has set Django up. The fixtures below build on
+# valid_component_data, which test modules import from core.tests.
+
+@pytest.fixture
+def length_constraints():
+    """Fixture providing whole-millimetre constraints between 0 and 1000mm."""
+    from ..core.interfaces import ParameterConstraint
+    return ParameterConstraint(min_value=0.0, max_value=1000.0, step=1.0, unit="mm")
+
+@pytest.fixture
+def component(valid_component_data):
+    """Fixture providing a valid component for parameter testing."""
+    from core.models import Component
+    return Component.objects.create(**valid_component_data)
+
+@pytest.fixture
+def other_component(valid_component_data):
+    """Fixture providing a second component with its own classification."""
+    from core.models import Component
+    other_data = dict(valid_component_data, classification='ET_AUD_PROC_AMP_002')
+    return Component.objects.create(**other_data)
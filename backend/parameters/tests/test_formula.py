@@ -0,0 +1,134 @@
+"""
+EuroTempl System - Formula Engine Tests
+
+This module contains tests for compiling and evaluating parameter formulas.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import math
+import numpy as np
+import pytest
+from ..utils.formula import VECTOR_FUNCTIONS, Formula, compile_formula, normalize_name
+
+
+@pytest.mark.parametrize("expression,expected", [
+    ("width * height", 5000.0),
+    ("width + height / 2", 125.0),
+    ("(width - 2 * 25) // 3", 16.0),
+    ("-width + 2 ** 3", -92.0),
+    ("width % 30", 10.0),
+    ("max(width, height, 75) - min(width, height)", 50.0),
+    ("sqrt(abs(-height * 2))", 10.0),
+    ("round(width / 3)", 33),
+    ("pi * 2", 2 * math.pi),
+])
+def test_evaluate(expression, expected):
+    """Test evaluation of supported operators and functions."""
+    formula = compile_formula(expression)
+    assert formula.evaluate({"width": 100.0, "height": 50.0}) == pytest.approx(expected)
+
+
+def test_variables_in_order_of_appearance():
+    """Test variables are collected once, excluding functions and constants."""
+    formula = Formula("max(b, a) * b + pi")
+    assert formula.variables == ("b", "a")
+
+
+def test_bind_resolves_names_to_keys():
+    """Test bound evaluators read values under the mapped keys."""
+    evaluator = compile_formula("width * height").bind({"width": "p1", "height": "p2"})
+    assert evaluator({"p1": 3.0, "p2": 4.0}) == 12.0
+
+
+def test_bind_unknown_variable():
+    """Test binding fails when a variable cannot be resolved."""
+    with pytest.raises(ValueError) as exc_info:
+        compile_formula("width * depth").bind({"width": "p1"})
+    assert "depth" in str(exc_info.value)
+
+
+def test_compile_formula_is_cached():
+    """Test identical expressions are parsed once."""
+    assert compile_formula("width * 2") is compile_formula("width * 2")
+
+
+@pytest.mark.parametrize("expression", [
+    "width *",
+    "__import__('os')",
+    "width.real",
+    "width[0]",
+    "width if height else 0",
+    "'text'",
+    "True + 1",
+    "width < height",
+    "max(width, key=height)",
+    "(lambda: 1)()",
+    "width ** 100000",
+])
+def test_invalid_formulas(expression):
+    """Test unsupported syntax is rejected at compile time."""
+    with pytest.raises(ValueError) as exc_info:
+        Formula(expression)
+    assert "Invalid formula" in str(exc_info.value)
+
+
+@pytest.mark.parametrize("name,expected", [
+    ("Width", "width"),
+    ("Wall Thickness", "wall_thickness"),
+    (" Panel-Height (mm) ", "panel_height_mm"),
+])
+def test_normalize_name(name, expected):
+    """Test parameter names are turned into formula identifiers."""
+    assert normalize_name(name) == expected
+
+
+def test_vector_bind():
+    """Test formulas bound to vector functions evaluate whole arrays."""
+    evaluator = compile_formula("max(width, height, 30) + floor(width / 4)").bind(
+        {"width": "width", "height": "height"}, VECTOR_FUNCTIONS
+    )
+    result = evaluator({"width": np.array([10.0, 50.0]), "height": np.array([20.0, 40.0])})
+    np.testing.assert_array_equal(result, [32.0, 62.0])
+
+
+def test_unbounded_power_rejected():
+    """Test nested powers fail fast instead of computing huge numbers."""
+    formula = compile_formula("9 ** 9 ** 9")
+    with pytest.raises(ValueError, match="Exponent exceeds"):
+        formula.evaluate({})
+    evaluator = compile_formula("width ** height").bind(
+        {"width": "width", "height": "height"}, VECTOR_FUNCTIONS
+    )
+    with pytest.raises(ValueError, match="Exponent exceeds"):
+        evaluator({"width": np.array([2.0]), "height": np.array([1e6])})
+
+
+def test_nested_power_result_bounded():
+    """Test powers that only grow through nesting fail fast."""
+    formula = compile_formula("((9 ** 1000) ** 1000) ** 1000")
+    with pytest.raises(ValueError, match="Power result exceeds"):
+        formula.evaluate({})
+    assert compile_formula("2 ** 1000").evaluate({}) == 2 ** 1000
+
+
+def test_fractional_power_of_negative_base_raises():
+    """Test powers without a real result raise instead of returning complex or nan."""
+    formula = compile_formula("width ** height")
+    with pytest.raises(ValueError, match="Negative base"):
+        formula.evaluate({"width": -8.0, "height": 1 / 3})
+    assert formula.evaluate({"width": -2.0, "height": 3.0}) == -8.0
+    evaluator = formula.bind({"width": "width", "height": "height"}, VECTOR_FUNCTIONS)
+    with pytest.raises(ValueError, match="Negative base"):
+        evaluator({"width": np.array([8.0, -8.0]), "height": np.array([0.5, 0.5])})
+
+
+def test_vector_division_by_zero_raises():
+    """Test vector evaluation raises on division by zero like scalar evaluation."""
+    for expression in ["width / height", "width // height", "width % height"]:
+        formula = compile_formula(expression)
+        with pytest.raises(ZeroDivisionError):
+            formula.evaluate({"width": 1.0, "height": 0.0})
+        evaluator = formula.bind({"width": "width", "height": "height"}, VECTOR_FUNCTIONS)
+        with pytest.raises(ZeroDivisionError):
+            evaluator({"width": np.array([1.0, 2.0]), "height": np.array([1.0, 0.0])})
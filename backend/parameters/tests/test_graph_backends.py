@@ -0,0 +1,177 @@
+"""
+EuroTempl System - Parameter Graph Backend Parity Tests
+
+This module checks that the native Boost.Graph backend and the pure-Python
+backend of the parameter graph return identical results.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import random
+import numpy as np
+import pytest
+from ..core.cpp_extensions import CppParameterGraphManager, PythonParameterGraphManager
+
+pytestmark = pytest.mark.skipif(
+    CppParameterGraphManager is None,
+    reason="parameters_engine native extension is not built"
+)
+
+
+def build_random_graphs(size=300, fan_in=3, seed=7):
+    """Build the same random acyclic graph on both backends."""
+    rng = random.Random(seed)
+    graphs = (PythonParameterGraphManager(), CppParameterGraphManager())
+    for graph in graphs:
+        for index in range(size):
+            graph.add_parameter(f"p{index}", f"Param {index}", "float", float(index % 7 + 1))
+    for index in range(fan_in, size):
+        targets = rng.sample(range(index), rng.randint(1, fan_in))
+        formula = " + ".join(f"param_{target}" for target in targets) + " / 2"
+        for target in targets:
+            for graph in graphs:
+                graph.add_dependency(f"p{index}", f"p{target}", formula)
+    return graphs
+
+
+@pytest.fixture(scope="module")
+def graphs():
+    """Fixture providing identical graphs on the Python and native backends."""
+    return build_random_graphs()
+
+
+def test_affected_parameters_match(graphs):
+    """Test direct dependents match, including their order."""
+    python_graph, cpp_graph = graphs
+    for index in range(300):
+        param_id = f"p{index}"
+        assert cpp_graph.get_affected_parameters(param_id) == \
+            python_graph.get_affected_parameters(param_id)
+    assert cpp_graph.get_affected_parameters("missing") == []
+
+
+def test_propagation_order_matches(graphs):
+    """Test transitive propagation orders are identical."""
+    python_graph, cpp_graph = graphs
+    for index in range(0, 300, 7):
+        param_id = f"p{index}"
+        assert cpp_graph.get_propagation_order(param_id) == \
+            python_graph.get_propagation_order(param_id)
+
+
+def test_multi_root_propagation_matches(graphs):
+    """Test dirty-set recalculation of several roots matches."""
+    python_graph, cpp_graph = graphs
+    updates = {"p0": 25.0, "p5": 50.0, "p40": 75.0}
+    assert cpp_graph.update_values(updates) == python_graph.update_values(updates)
+    assert cpp_graph._values == python_graph._values
+    assert cpp_graph.get_recompute_stats() == python_graph.get_recompute_stats()
+
+
+def test_batch_evaluation_matches(graphs):
+    """Test vectorized batch evaluation matches."""
+    python_graph, cpp_graph = graphs
+    columns = {"p1": np.linspace(0.0, 100.0, 16), "p2": np.arange(16.0)}
+    python_results = python_graph.evaluate_batch(columns)
+    cpp_results = cpp_graph.evaluate_batch(columns)
+    assert cpp_results.keys() == python_results.keys()
+    for param_id, values in python_results.items():
+        np.testing.assert_array_equal(cpp_results[param_id], values)
+
+
+@pytest.mark.parametrize("backend", [PythonParameterGraphManager, CppParameterGraphManager])
+def test_errors_match(backend):
+    """Test both backends raise the same exception types."""
+    graph = backend()
+    graph.add_parameter("a", "A", "float", 1.0)
+    graph.add_parameter("b", "B", "float", 1.0)
+    graph.add_dependency("b", "a", "a")
+
+    with pytest.raises(ValueError):
+        graph.add_dependency("a", "b", "b")
+    with pytest.raises(ValueError):
+        graph.add_dependency("a", "a", "a")
+    with pytest.raises(KeyError):
+        graph.add_dependency("a", "missing", "missing")
+    with pytest.raises(KeyError):
+        graph.update_value("missing", 1.0)
+    assert graph.get_affected_parameters("a") == ["b"]
+
+
+@pytest.mark.parametrize("backend", [PythonParameterGraphManager, CppParameterGraphManager])
+def test_bulk_construction_matches_incremental(backend):
+    """Test bulk construction yields the same graph as per-call construction."""
+    incremental = build_random_graphs(size=200, seed=11)[0]
+    bulk = backend()
+    bulk.add_parameters_bulk(
+        list(incremental._parameters),
+        [meta['name'] for meta in incremental._parameters.values()],
+        [meta['type'] for meta in incremental._parameters.values()],
+        [incremental._values[param_id] for param_id in incremental._parameters],
+    )
+    sources, targets, formulas = [], [], []
+    for target, dependents in incremental._dependents.items():
+        for source in dependents:
+            sources.append(source)
+            targets.append(target)
+            formulas.append(incremental._formulas[source])
+    bulk.add_dependencies_bulk(sources, targets, formulas)
+
+    for param_id in incremental._parameters:
+        assert bulk.get_propagation_order(param_id) == \
+            incremental.get_propagation_order(param_id)
+
+
+@pytest.mark.parametrize("backend", [PythonParameterGraphManager, CppParameterGraphManager])
+def test_bulk_construction_keeps_non_numeric_values(backend):
+    """Test both backends accept text and unset values in bulk and per call."""
+    graph = backend()
+    graph.add_parameters_bulk(["a", "b"], ["A", "B"], ["string", "float"], ["oak", None])
+    graph.add_parameter("c", "C", "string", "walnut")
+    assert graph.get_parameter_value("a") == "oak"
+    assert graph.get_parameter_value("b") is None
+    assert graph.get_parameter_value("c") == "walnut"
+
+
+@pytest.mark.parametrize("backend", [PythonParameterGraphManager, CppParameterGraphManager])
+def test_bulk_cycle_rollback_matches(backend):
+    """Test both backends reject cyclic batches and keep the prior graph."""
+    graph = backend()
+    graph.add_parameters_bulk(["a", "b", "c"], ["A", "B", "C"], ["float"] * 3, [1.0, 2.0, 3.0])
+    graph.add_dependency("b", "a", "a")
+    with pytest.raises(ValueError):
+        graph.add_dependencies_bulk(["c", "a"], ["b", "c"], ["b", "c"])
+    assert graph.get_affected_parameters("b") == []
+    assert graph.get_propagation_order("a") == ["b"]
+    graph.add_dependencies_bulk(["c"], ["b"], ["b * 3"])
+    assert graph.get_propagation_order("a") == ["b", "c"]
+
+
+@pytest.mark.parametrize("backend", [PythonParameterGraphManager, CppParameterGraphManager])
+def test_remove_parameters_matches(backend):
+    """Test both backends forget removed parameters and keep the rest intact."""
+    graph = backend()
+    graph.add_parameters_bulk(
+        ["a", "b", "c", "d", "e"], ["A", "B", "C", "D", "E"], ["float"] * 5, [1.0] * 5
+    )
+    graph.add_dependency("e", "a", "a * 2")
+    graph.add_dependency("d", "a", "a + 1")
+
+    with pytest.raises(ValueError):
+        graph.remove_parameters(["b", "e"])
+    assert graph.get_parameter_value("b") == 1.0
+
+    graph.remove_parameters(["b", "c", "missing"])
+    with pytest.raises(KeyError):
+        graph.add_dependency("e", "b", "b")
+    with pytest.raises(KeyError):
+        graph.get_parameter_value("c")
+    assert graph.get_affected_parameters("a") == ["e", "d"]
+    assert sorted(graph.get_propagation_order("a")) == ["d", "e"]
+
+    graph.add_parameter("b", "B", "float", 4.0)
+    graph.add_dependency("d", "b", "a + b")
+    graph.update_value("b", 5.0)
+    assert graph.get_parameter_value("d") == 6.0
+    if backend is CppParameterGraphManager:
+        assert len(graph._native) == 4
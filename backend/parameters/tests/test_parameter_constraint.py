@@ -0,0 +1,122 @@
+"""
+EuroTempl System - Parameter Constraint Tests
+
+This module contains tests for plain and compiled parameter constraints.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import numpy as np
+import pytest
+from django.core.exceptions import ValidationError
+from core.models import Component, Parameter
+from core.tests import valid_component_data
+from ..core.interfaces.parameter_constraint import (
+    ParameterConstraint,
+    compiled_constraint,
+)
+
+
+@pytest.mark.parametrize("constraint", [
+    ParameterConstraint(),
+    ParameterConstraint(min_value=0.0, max_value=1000.0),
+    ParameterConstraint(min_value=0.0, max_value=1000.0, step=10.0, grid_aligned=True),
+    ParameterConstraint(step=0.5, grid_aligned=True),
+    ParameterConstraint(max_value=100.0, step=2.5),
+    ParameterConstraint(min_value=5.0, max_value=1000.0, step=10.0, grid_aligned=True),
+])
+def test_compiled_matches_reference(constraint):
+    """Test compiled constraints accept exactly what validate() accepts."""
+    compiled = constraint.compile()
+    for value in [-25.0, 0.0, 2.5, 10.0, 25.0, 50.0, 75.0, 100.0, 125.0, 250.0, 1025.0]:
+        try:
+            constraint.validate(value)
+            expected = True
+        except ValidationError:
+            expected = False
+        assert compiled.is_valid(value) is expected
+
+
+def test_step_and_grid_folded():
+    """Test integral step and grid are checked as one step when they line up."""
+    compiled = ParameterConstraint(step=10.0, grid_aligned=True).compile()
+    assert compiled._validator.lattices == ((0, 50),)
+    assert ParameterConstraint(step=0.5, grid_aligned=True).compile()._validator.lattices == \
+        ((0, 0.5), (0, 25))
+    assert ParameterConstraint(min_value=5.0, step=10.0, grid_aligned=True).compile() \
+        ._validator.lattices == ((5.0, 10.0), (0, 25))
+
+
+def test_steps_counted_from_minimum():
+    """Test steps are counted from the minimum, as Parameter.validate_value does."""
+    constraint = ParameterConstraint(min_value=5.0, max_value=100.0, step=10.0)
+    constraint.validate(15.0)
+    assert constraint.compile().is_valid(15.0)
+    with pytest.raises(ValidationError, match="in steps of 10.0 from 5.0"):
+        constraint.validate(20.0)
+    assert constraint.validate_batch([15.0, 20.0]).mask.tolist() == [True, False]
+
+
+def test_compiled_reports_reference_message():
+    """Test invalid values fail with the message of the violated constraint."""
+    compiled = ParameterConstraint(min_value=0.0, step=10.0, grid_aligned=True).compile()
+    with pytest.raises(ValidationError, match="below minimum"):
+        compiled.validate(-50.0)
+    with pytest.raises(ValidationError, match="25mm grid"):
+        compiled.validate(30.0)
+
+
+@pytest.mark.django_db
+def test_compiled_constraint_follows_parameter(valid_component_data):
+    """Test compiled constraints follow valid_ranges and agree with the model."""
+    component = Component.objects.create(**valid_component_data)
+    parameter = Parameter.objects.create(
+        component=component,
+        name="Width",
+        data_type="float",
+        units="mm",
+        valid_ranges={'min': 0.0, 'max': 100.0}
+    )
+    compiled = compiled_constraint(parameter)
+    assert compiled_constraint(parameter) is compiled
+    assert not compiled.is_valid(200.0)
+
+    parameter.valid_ranges = {'min': 5.0, 'max': 1000.0, 'step': 10.0}
+    assert compiled_constraint(parameter) is not compiled
+    for value in (15.0, 20.0, 200.0, 205.0):
+        assert compiled_constraint(parameter).is_valid(value) is \
+            parameter._range_validator.is_valid(value)
+
+
+def test_validate_batch_reasons():
+    """Test batch validation reports the first violated constraint per value."""
+    constraint = ParameterConstraint(min_value=0.0, max_value=1000.0, step=5.0, grid_aligned=True)
+    result = constraint.validate_batch([-25.0, 50.0, 1025.0, 52.0, 30.0, float('nan')])
+
+    assert result.mask.tolist() == [False, True, False, False, False, False]
+    assert result.errors == {
+        0: "Value -25.0 below minimum 0.0",
+        2: "Value 1025.0 above maximum 1000.0",
+        3: "Value 52.0 must be a multiple of step 5.0",
+        4: "Value must align with 25mm grid",
+        5: "Value nan is not a finite number",
+    }
+    assert not result.all_valid
+
+
+def test_compiled_validate_batch_matches_reference():
+    """Test the compiled batch check agrees with the reference one."""
+    constraint = ParameterConstraint(min_value=0.0, max_value=1000.0, step=10.0, grid_aligned=True)
+    values = np.arange(-100.0, 1100.0, 2.5)
+    expected = constraint.validate_batch(values)
+    result = constraint.compile().validate_batch(values)
+
+    assert np.array_equal(result.mask, expected.mask)
+    assert result.errors == expected.errors
+    assert constraint.compile().validate_batch(np.array([0.0, 50.0, 100.0])).all_valid
+
+
+def test_validate_batch_requires_one_dimension():
+    """Test batch validation rejects multi-dimensional input."""
+    with pytest.raises(ValueError):
+        ParameterConstraint().validate_batch(np.zeros((2, 2)))
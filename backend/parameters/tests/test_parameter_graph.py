@@ -0,0 +1,340 @@
+"""
+EuroTempl System - Parameter Graph Tests
+
+This module contains tests for the parameter dependency graph.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import numpy as np
+import pytest
+from ..core.cpp_extensions._parameter_graph import ParameterGraphManager
+
+
+@pytest.fixture
+def graph():
+    """Fixture providing a graph with width, height and area parameters."""
+    graph = ParameterGraphManager()
+    graph.add_parameter("width", "Width", "float", 100.0)
+    graph.add_parameter("height", "Height", "float", 50.0)
+    graph.add_parameter("area", "Area", "float", 0.0)
+    graph.add_dependency("area", "width", "width * height")
+    graph.add_dependency("area", "height", "width * height")
+    return graph
+
+
+def test_affected_parameters(graph):
+    """Test direct dependents are returned for a changed parameter."""
+    assert graph.get_affected_parameters("width") == ["area"]
+    assert graph.get_affected_parameters("height") == ["area"]
+    assert graph.get_affected_parameters("area") == []
+
+
+def test_affected_parameters_unknown_id(graph):
+    """Test lookups for parameters without dependents return nothing."""
+    assert graph.get_affected_parameters("missing") == []
+
+
+def test_reverse_index_matches_dependencies(graph):
+    """Test the reverse index mirrors the forward dependency map."""
+    graph.add_parameter("volume", "Volume", "float", 0.0)
+    graph.add_dependency("volume", "area", "area * 10")
+    graph.add_dependency("volume", "width", "area * width")
+
+    for source, targets in graph._dependencies.items():
+        for target in targets:
+            assert source in graph._dependents[target]
+    assert sorted(graph.get_affected_parameters("width")) == ["area", "volume"]
+
+
+def test_duplicate_dependency_is_idempotent(graph):
+    """Test adding the same dependency twice does not duplicate dependents."""
+    graph.add_dependency("area", "width", "width * height")
+    assert graph.get_affected_parameters("width") == ["area"]
+
+
+@pytest.fixture
+def chain():
+    """Fixture providing a diamond-shaped graph a -> (b, c) -> d."""
+    graph = ParameterGraphManager()
+    for param_id in ("a", "b", "c", "d"):
+        graph.add_parameter(param_id, param_id.upper(), "float", 2.0)
+    graph.add_dependency("b", "a", "a")
+    graph.add_dependency("c", "a", "a")
+    graph.add_dependency("d", "b", "b * c")
+    graph.add_dependency("d", "c", "b * c")
+    return graph
+
+
+def test_propagation_order_is_transitive_and_topological(chain):
+    """Test propagation visits every downstream parameter after its inputs."""
+    order = chain.get_propagation_order("a")
+    assert sorted(order) == ["b", "c", "d"]
+    assert order.index("d") > order.index("b")
+    assert order.index("d") > order.index("c")
+
+
+def test_propagation_order_only_walks_downstream(chain):
+    """Test parameters upstream of the change are not visited."""
+    assert chain.get_propagation_order("b") == ["d"]
+    assert chain.get_propagation_order("d") == []
+
+
+def test_propagate_evaluates_each_node_once(chain):
+    """Test a single propagation pass brings the whole chain up to date."""
+    evaluated = []
+    original = chain._evaluate
+
+    def tracking_evaluate(source):
+        evaluated.append(source)
+        return original(source)
+
+    chain._evaluate = tracking_evaluate
+    chain._values["a"] = 3.0
+    chain.propagate("a")
+
+    assert sorted(evaluated) == ["b", "c", "d"]
+    assert chain.get_parameter_value("d") == 9.0
+
+
+def test_propagate_unknown_parameter(chain):
+    """Test propagating from an unknown parameter raises KeyError."""
+    with pytest.raises(KeyError):
+        chain.propagate("missing")
+
+
+def test_cycle_rejected_at_add_time(chain):
+    """Test dependencies closing a cycle are rejected."""
+    with pytest.raises(ValueError) as exc_info:
+        chain.add_dependency("a", "d", "d")
+    assert "cycle" in str(exc_info.value)
+    with pytest.raises(ValueError):
+        chain.add_dependency("a", "a", "a")
+    assert chain.get_affected_parameters("d") == []
+
+
+def test_full_recalculation_is_topological(chain):
+    """Test full recalculation resolves chains in one pass."""
+    chain._values["a"] = 5.0
+    chain._recalculate_dependencies()
+    assert chain.get_parameter_value("b") == 5.0
+    assert chain.get_parameter_value("d") == 25.0
+
+
+def test_update_value_recalculates_only_dirty_subgraph(chain):
+    """Test an update only recalculates parameters downstream of it."""
+    chain.add_parameter("e", "E", "float", 4.0)
+    chain.add_parameter("f", "F", "float", 0.0)
+    chain.add_dependency("f", "e", "e")
+
+    chain.update_value("b", 3.0)
+    assert chain.get_recompute_stats()["last"] == 1
+    assert chain.get_parameter_value("d") == 6.0
+    assert chain.get_parameter_value("f") == 0.0  # untouched
+
+    chain.update_value("a", 4.0)
+    assert chain.get_recompute_stats() == {"last": 3, "total": 4}
+    assert chain.get_parameter_value("d") == 16.0
+
+
+def test_update_value_unknown_parameter(chain):
+    """Test updating an unknown parameter raises KeyError."""
+    with pytest.raises(KeyError):
+        chain.update_value("missing", 1.0)
+
+
+def test_update_values_shares_one_pass(chain):
+    """Test batched updates evaluate shared dependents once."""
+    order = chain.update_values({"b": 3.0, "c": 5.0})
+    assert order == ["d"]
+    assert chain.get_parameter_value("d") == 15.0
+    assert chain.get_recompute_stats()["last"] == 1
+
+
+def test_update_values_keeps_explicit_values(chain):
+    """Test explicitly updated dependents are not overwritten."""
+    chain.update_values({"a": 10.0, "b": 1.0})
+    assert chain.get_parameter_value("b") == 1.0
+    assert chain.get_parameter_value("c") == 10.0
+    assert chain.get_parameter_value("d") == 10.0
+
+
+def test_failing_formula_leaves_graph_unchanged(chain):
+    """Test a formula error during an update restores every value."""
+    chain.add_parameter("e", "E", "float", 0.0)
+    chain.add_dependency("e", "c", "10 / (c - 4)")
+    before = dict(chain._values)
+    with pytest.raises(ZeroDivisionError):
+        chain.update_values({"a": 4.0, "b": 7.0})
+    assert chain._values == before
+    chain.update_value("a", 5.0)
+    assert chain.get_parameter_value("e") == 10.0
+
+
+def test_failing_formula_in_full_recalculation(chain):
+    """Test a formula error during a full recalculation restores every value."""
+    chain.add_parameter("e", "E", "float", 0.0)
+    chain.add_dependency("e", "c", "10 / (c - 2)")
+    before = dict(chain._values)
+    with pytest.raises(ZeroDivisionError):
+        chain._recalculate_dependencies()
+    assert chain._values == before
+
+
+def test_restore_values_skips_recalculation(chain):
+    """Test restored values are put back as read, without recalculating."""
+    before = {param_id: chain.get_parameter_value(param_id) for param_id in ("a", "c", "d")}
+    chain.update_value("a", 9.0)
+    chain.reset_recompute_stats()
+    chain.restore_values(dict(before, removed=1.0))
+    assert {param_id: chain.get_parameter_value(param_id) for param_id in before} == before
+    assert chain.get_recompute_stats()["total"] == 0
+    assert "removed" not in chain._values
+
+
+def test_reset_recompute_stats(chain):
+    """Test the recalculation counters can be reset."""
+    chain.update_value("a", 1.0)
+    chain.reset_recompute_stats()
+    assert chain.get_recompute_stats() == {"last": 0, "total": 0}
+
+
+def test_formula_drives_recalculation(graph):
+    """Test dependent values come from their formula."""
+    graph.add_parameter("half", "Half Area", "float", 0.0)
+    graph.add_dependency("half", "area", "area / 2 + 1")
+    graph.update_value("width", 10.0)
+    assert graph.get_parameter_value("area") == 500.0
+    assert graph.get_parameter_value("half") == 251.0
+
+
+def test_formula_recompiled_when_dependency_changes(graph):
+    """Test the compiled formula is replaced when a dependency is added."""
+    graph.update_value("width", 10.0)
+    graph.add_parameter("depth", "Depth", "float", 3.0)
+    graph.add_dependency("area", "depth", "width * height * depth")
+    graph.propagate("depth")
+    assert graph.get_parameter_value("area") == 1500.0
+
+
+def test_formula_with_unknown_variable(graph):
+    """Test formulas referencing non-inputs fail when evaluated."""
+    graph.add_parameter("ratio", "Ratio", "float", 0.0)
+    graph.add_dependency("ratio", "width", "width / depth")
+    with pytest.raises(ValueError):
+        graph.update_value("width", 10.0)
+
+
+def test_evaluate_batch(chain):
+    """Test batch evaluation matches per-instance propagation."""
+    inputs = np.array([1.0, 2.0, 3.0, 4.0])
+    results = chain.evaluate_batch({"a": inputs})
+
+    assert set(results) == {"b", "c", "d"}
+    for index, value in enumerate(inputs):
+        chain.update_value("a", value)
+        assert results["d"][index] == chain.get_parameter_value("d")
+
+
+def test_evaluate_batch_uses_graph_values_for_missing_columns(graph):
+    """Test parameters without a column are broadcast from the graph."""
+    results = graph.evaluate_batch({"width": [10.0, 20.0]})
+    np.testing.assert_array_equal(results["area"], [500.0, 1000.0])
+    assert graph.get_parameter_value("width") == 100.0
+
+
+def test_evaluate_batch_vector_functions(graph):
+    """Test formula functions are applied element-wise."""
+    graph.add_parameter("side", "Side", "float", 0.0)
+    graph.add_dependency("side", "area", "max(sqrt(area), 25)")
+    results = graph.evaluate_batch({"width": [2.0, 72.0], "height": [2.0, 50.0]})
+    np.testing.assert_allclose(results["side"], [25.0, 60.0])
+
+
+def test_evaluate_batch_length_mismatch(graph):
+    """Test columns of different lengths are rejected."""
+    with pytest.raises(ValueError):
+        graph.evaluate_batch({"width": [1.0, 2.0], "height": [1.0]})
+
+
+def test_evaluate_batch_unknown_parameter(graph):
+    """Test columns for unknown parameters are rejected."""
+    with pytest.raises(KeyError):
+        graph.evaluate_batch({"missing": [1.0]})
+
+
+def test_add_parameters_bulk():
+    """Test columnar parameter construction."""
+    graph = ParameterGraphManager()
+    graph.add_parameters_bulk(
+        ["w", "h"], ["Width", "Height"], ["float", "float"], np.array([10.0, 20.0])
+    )
+    assert graph.get_parameter_value("h") == 20.0
+    assert graph._parameters["w"] == {"name": "Width", "type": "float"}
+
+
+def test_add_parameters_bulk_keeps_values_as_given():
+    """Test bulk-loaded text, unset and structured values are not coerced."""
+    graph = ParameterGraphManager()
+    graph.add_parameters_bulk(
+        ["material", "finish", "meta"], ["Material", "Finish", "Meta"],
+        ["string", "string", "json"], ["oak", None, {"grade": "A"}]
+    )
+    assert graph.get_parameter_value("material") == "oak"
+    assert graph.get_parameter_value("finish") is None
+    assert graph.get_parameter_value("meta") == {"grade": "A"}
+
+
+def test_add_parameters_bulk_length_mismatch():
+    """Test columns of different lengths are rejected."""
+    graph = ParameterGraphManager()
+    with pytest.raises(ValueError):
+        graph.add_parameters_bulk(["w", "h"], ["Width"], ["float", "float"], [1.0, 2.0])
+
+
+def test_add_dependencies_bulk(graph):
+    """Test columnar dependency construction."""
+    graph.add_parameters_bulk(["vol", "cost"], ["Volume", "Cost"], ["float"] * 2, [0.0, 0.0])
+    graph.add_dependencies_bulk(
+        ["vol", "cost"], ["area", "vol"], ["area * 2", "vol / 4"]
+    )
+    graph.update_value("width", 10.0)
+    assert graph.get_parameter_value("cost") == 250.0
+    assert graph.get_propagation_order("area") == ["vol", "cost"]
+
+
+def test_add_dependencies_bulk_rejects_cycle_atomically(graph):
+    """Test a batch closing a cycle leaves the graph unchanged."""
+    graph.add_parameter("vol", "Volume", "float", 0.0)
+    with pytest.raises(ValueError) as exc_info:
+        graph.add_dependencies_bulk(
+            ["vol", "width", "area"], ["area", "vol", "width"],
+            ["area", "vol", "width * 2"]
+        )
+    assert "cycle" in str(exc_info.value)
+    assert graph.get_affected_parameters("area") == []
+    assert graph.get_affected_parameters("vol") == []
+    assert graph._formulas["area"] == "width * height"
+    graph.update_value("width", 10.0)
+    assert graph.get_parameter_value("area") == 500.0
+
+
+def test_add_dependencies_bulk_unknown_parameter(graph):
+    """Test batches referencing unknown parameters are rejected."""
+    with pytest.raises(KeyError):
+        graph.add_dependencies_bulk(["area"], ["missing"], ["missing"])
+
+
+def test_remove_parameters(graph):
+    """Test unlinked parameters can be removed and linked ones cannot."""
+    graph.add_parameter("depth", "Depth", "float", 3.0)
+    assert not graph.has_dependencies("depth")
+    assert graph.has_dependencies("width") and graph.has_dependencies("area")
+
+    with pytest.raises(ValueError):
+        graph.remove_parameters(["depth", "width"])
+    assert graph.get_parameter_value("depth") == 3.0
+
+    graph.remove_parameters(["depth"])
+    with pytest.raises(KeyError):
+        graph.get_parameter_value("depth")
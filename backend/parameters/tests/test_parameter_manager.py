@@ -4,8 +4,9 @@ Copyright (c) 2024 Pygmalion Records"""
 import pytest
 from unittest.mock import Mock
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from ..core.interfaces.parameter_manager import ParameterManager, ParametricValue, ParameterConstraint
-from core.models import Component, ComponentInstance, ComponentStatus
+from core.models import Component, ComponentInstance, ComponentStatus, Parameter, ParameterValue
 from core.tests import valid_component_data
 from geometry.cad_model import CADModel
 
@@ -43,11 +44,6 @@ def cleanup_db():
     ComponentInstance.objects.all().delete()  # Clean up in reverse order
     Component.objects.all().delete()
 
-@pytest.fixture
-def component(valid_component_data):
-    """Fixture providing a valid component for parameter testing."""
-    return Component.objects.create(**valid_component_data)
-
 @pytest.fixture
 def valid_instance_data(valid_component_data):
     """Fixture providing valid component instance data."""
@@ -192,14 +188,32 @@ class TestParameterManager:
     
         # Force recalculation
         manager._graph._recalculate_dependencies()
-        manager._update_dependent(
-            instance=instance,
-            param_id=str(area_param.id),
-            modified_by=test_user
-        )
+        manager._save_dependent_values(instance, [str(area_param.id)], modified_by=test_user)
     
         values = manager.get_parameter_values(instance)
         assert values[str(area_param.id)] == 5000.0  # 100mm * 50mm = 5000mm²
+
+    def test_failed_update_restores_graph(self, manager, component, instance, test_user,
+                                          length_constraints):
+        """Test a rejected dependent value rolls back the graph with the database."""
+        width = manager.add_parameter(component, "Width", "float", length_constraints)
+        area = manager.add_parameter(component, "Area", "float", length_constraints)
+        width_id, area_id = str(width.id), str(area.id)
+        manager._graph.add_dependency(area_id, width_id, "width * 2")
+        manager.update_parameter(
+            instance, width_id, ParametricValue(width_id, 100.0, "mm"), modified_by=test_user
+        )
+
+        # 600mm doubles to 1200mm, above the 1000mm maximum of the area.
+        with pytest.raises(ValidationError):
+            manager.update_parameter(
+                instance, width_id, ParametricValue(width_id, 600.0, "mm"), modified_by=test_user
+            )
+
+        assert manager._graph.get_parameter_value(width_id) == 100.0
+        assert manager._graph.get_parameter_value(area_id) == 200.0
+        assert ParameterValue.objects.filter(parameter=width, value__value=600.0).count() == 0
+
     def test_grid_aligned_parameter(self, manager, component, instance, test_user):
         """Test parameter with grid alignment constraint."""
         constraints = ParameterConstraint(
@@ -293,6 +307,25 @@ class TestParameterManager:
             manager.update_parameter(instance, str(param.id), invalid_value, modified_by=test_user)
         assert "below minimum" in str(exc_info.value)
     
+    def test_validate_parameter_values(self, manager, component):
+        """Test candidate values are validated as a batch."""
+        param = manager.add_parameter(
+            component=component,
+            name="Batch Parameter",
+            data_type="float",
+            constraints=ParameterConstraint(
+                min_value=50.0, max_value=100.0, unit="mm", grid_aligned=True
+            )
+        )
+
+        result = manager.validate_parameter_values(str(param.id), [25.0, 75.0, 80.0])
+        assert result.mask.tolist() == [False, True, False]
+        assert "below minimum" in result.errors[0]
+        assert "25mm grid" in result.errors[2]
+
+        with pytest.raises(KeyError):
+            manager.validate_parameter_values("missing", [75.0])
+
     def test_unit_conversion(self, manager, component, instance, test_user):
         """Test automatic unit conversion during parameter validation."""
         constraints = ParameterConstraint(
@@ -398,4 +431,215 @@ class TestParameterManager:
         
         # Verify cleanup
         assert len(manager._cad_models) == 0
-        assert mock_cad_model.id not in manager._cad_models
\ No newline at end of file
+        assert mock_cad_model.id not in manager._cad_models
+
+    def test_load_parameters_single_query(self, component, instance, test_user,
+                                          length_constraints, django_assert_num_queries):
+        """Test manager construction loads parameters and values in one query."""
+        setup_manager = ParameterManager()
+        params = [
+            setup_manager.add_parameter(
+                component=component,
+                name=f"Parameter {index}",
+                data_type="float",
+                constraints=length_constraints
+            )
+            for index in range(3)
+        ]
+        for index, param in enumerate(params):
+            value = ParametricValue(
+                parameter_id=str(param.id),
+                value=10.0 * (index + 1),
+                unit="mm"
+            )
+            setup_manager.update_parameter(instance, str(param.id), value, modified_by=test_user)
+        
+        with django_assert_num_queries(1):
+            manager = ParameterManager()
+        
+        for index, param in enumerate(params):
+            assert manager._graph.get_parameter_value(str(param.id)) == 10.0 * (index + 1)
+    
+    def test_load_text_and_unset_parameters(self, component, instance, test_user):
+        """Test components with text and unset parameters load without coercion."""
+        material = Parameter.objects.create(
+            component=component,
+            name="Material",
+            data_type="text"
+        )
+        finish = Parameter.objects.create(
+            component=component,
+            name="Finish",
+            data_type="text"
+        )
+        ParameterValue.objects.create(
+            instance=instance,
+            parameter=material,
+            value={'value': 'oak'},
+            recorded_at=timezone.now(),
+            modified_by=test_user
+        )
+        
+        manager = ParameterManager()
+        
+        assert manager._graph.get_parameter_value(str(material.id)) == 'oak'
+        assert manager._graph.get_parameter_value(str(finish.id)) == 0.0
+    
+    def test_get_parameter_values_bulk(self, manager, component, other_component,
+                                       length_constraints, test_user,
+                                       django_assert_num_queries):
+        """Test values for many instances come from one query, scoped per component."""
+        param = manager.add_parameter(
+            component=component,
+            name="Width",
+            data_type="float",
+            constraints=length_constraints
+        )
+        other_param = manager.add_parameter(
+            component=other_component,
+            name="Width",
+            data_type="float",
+            constraints=length_constraints
+        )
+        first = component.create_instance()
+        second = component.create_instance()
+        other = other_component.create_instance()
+        
+        manager.update_parameter(
+            first, str(param.id),
+            ParametricValue(parameter_id=str(param.id), value=100.0, unit="mm"),
+            modified_by=test_user
+        )
+        manager.update_parameter(
+            other, str(other_param.id),
+            ParametricValue(parameter_id=str(other_param.id), value=200.0, unit="mm"),
+            modified_by=test_user
+        )
+        
+        with django_assert_num_queries(1):
+            values = manager.get_parameter_values_bulk([first, second, other])
+        
+        assert values == {
+            str(first.id): {str(param.id): 100.0},
+            str(second.id): {str(param.id): 0.0},
+            str(other.id): {str(other_param.id): 200.0},
+        }
+        assert manager.get_parameter_values(first) == values[str(first.id)]
+    
+    def test_dependent_values_saved_in_bulk(self, manager, component, instance,
+                                            test_user, django_assert_num_queries):
+        """Test propagated values are appended and made current in two statements."""
+        constraints = ParameterConstraint(
+            min_value=0.0,
+            max_value=1000000.0,
+            step=1.0,
+            unit="mm"
+        )
+        width, area, volume = [
+            manager.add_parameter(
+                component=component,
+                name=name,
+                data_type="float",
+                constraints=constraints
+            )
+            for name in ("Width", "Area", "Volume")
+        ]
+        manager._graph.add_dependency(str(area.id), str(width.id), "width * 2")
+        manager._graph.add_dependency(str(volume.id), str(area.id), "area * 3")
+        manager._graph.update_value(str(width.id), 10.0)
+        
+        with django_assert_num_queries(2):
+            manager._save_dependent_values(
+                instance, [str(area.id), str(volume.id)], modified_by=test_user
+            )
+        
+        manager._graph.update_value(str(width.id), 20.0)
+        with django_assert_num_queries(2):
+            manager._save_dependent_values(
+                instance, [str(area.id), str(volume.id)], modified_by=test_user
+            )
+        
+        values = manager.get_parameter_values(instance)
+        assert values[str(area.id)] == 40.0
+        assert values[str(volume.id)] == 120.0
+        assert ParameterValue.objects.filter(parameter=area).count() == 2
+    
+    def test_get_parameter_snapshots_bulk(self, manager, component, length_constraints,
+                                          test_user, django_assert_num_queries):
+        """Test point-in-time values for many instances come from one query."""
+        param = manager.add_parameter(
+            component=component,
+            name="Width",
+            data_type="float",
+            constraints=length_constraints
+        )
+        first = component.create_instance()
+        second = component.create_instance()
+        
+        for instance, value in ((first, 100.0), (second, 200.0)):
+            manager.update_parameter(
+                instance, str(param.id),
+                ParametricValue(parameter_id=str(param.id), value=value, unit="mm"),
+                modified_by=test_user
+            )
+        moment = timezone.now()
+        manager.update_parameter(
+            first, str(param.id),
+            ParametricValue(parameter_id=str(param.id), value=300.0, unit="mm"),
+            modified_by=test_user
+        )
+        
+        with django_assert_num_queries(1):
+            snapshot = manager.get_parameter_snapshots_bulk([first, second], moment)
+        
+        assert snapshot == {
+            str(first.id): {str(param.id): 100.0},
+            str(second.id): {str(param.id): 200.0},
+        }
+        assert manager.get_parameter_snapshot(first, timezone.now()) == {str(param.id): 300.0}
+    
+    def test_lazy_loading_and_eviction(self, manager, component, other_component,
+                                       length_constraints, django_assert_num_queries):
+        """Test lazy managers load components on access and evict the oldest."""
+        param = manager.add_parameter(
+            component=component,
+            name="Width",
+            data_type="float",
+            constraints=length_constraints
+        )
+        other_param = manager.add_parameter(
+            component=other_component,
+            name="Width",
+            data_type="float",
+            constraints=length_constraints
+        )
+        first = component.create_instance()
+        other = other_component.create_instance()
+        
+        with django_assert_num_queries(0):
+            lazy = ParameterManager(lazy=True, max_components=1)
+        assert lazy._parameters == {}
+        
+        assert lazy.get_parameter_values(first) == {str(param.id): 0.0}
+        assert list(lazy._parameters) == [str(param.id)]
+        
+        assert lazy.get_parameter_values(other) == {str(other_param.id): 0.0}
+        assert list(lazy._parameters) == [str(other_param.id)]
+        with pytest.raises(KeyError):
+            lazy._graph.get_parameter_value(str(param.id))
+    
+    def test_lazy_eviction_keeps_linked_components(self, component, other_component,
+                                                   length_constraints):
+        """Test components with graph dependencies are never evicted."""
+        lazy = ParameterManager(lazy=True, max_components=1)
+        width = lazy.add_parameter(component, "Width", "float", length_constraints)
+        area = lazy.add_parameter(component, "Area", "float", length_constraints)
+        lazy._graph.add_dependency(str(area.id), str(width.id), "width * 2")
+        
+        lazy.get_parameter_values(other_component.create_instance())
+        assert str(width.id) in lazy._parameters
+    
+    def test_max_components_requires_lazy(self):
+        """Test a component bound is rejected for eager managers."""
+        with pytest.raises(ValueError):
+            ParameterManager(max_components=10)
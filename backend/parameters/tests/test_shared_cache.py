@@ -0,0 +1,181 @@
+"""
+EuroTempl System - Shared Parameter Cache Tests
+
+This module contains tests for the cross-process parameter cache.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import pytest
+from django.core.cache import caches
+from core.tests import valid_component_data
+from ..core.interfaces import ParameterManager, ParametricValue
+from ..core.interfaces.shared_cache import SharedParameterCache, _parameter_component
+
+
+@pytest.fixture
+def shared_cache():
+    """Fixture providing an empty shared cache on the default backend."""
+    caches['default'].clear()
+    yield SharedParameterCache('default')
+    caches['default'].clear()
+
+
+def test_payload_served_under_current_stamp(shared_cache):
+    """Test payloads are only served while their stamp is current."""
+    stamps = shared_cache.get_instance_stamps(["i1"])
+    assert stamps == {"i1": None}
+    shared_cache.set_instances({"i1": {"p": 1.0}}, stamps)
+
+    assert shared_cache.get_instances(shared_cache.get_instance_stamps(["i1"])) == {
+        "i1": {"p": 1.0}
+    }
+    shared_cache.invalidate_instances(["i1"])
+    assert shared_cache.get_instances(shared_cache.get_instance_stamps(["i1"])) == {}
+
+
+def test_stale_payload_not_stored_after_invalidation(shared_cache):
+    """Test values read before a concurrent invalidation are discarded."""
+    stamps = shared_cache.get_instance_stamps(["i1"])
+    shared_cache.invalidate_instances(["i1"])  # another process writes
+    shared_cache.set_instances({"i1": {"p": 1.0}}, stamps)
+    assert shared_cache.get_instances(shared_cache.get_instance_stamps(["i1"])) == {}
+
+
+def test_first_payload_returns_created_stamp(shared_cache):
+    """Test storing a payload for an unstamped object reports its new stamp."""
+    stamps = shared_cache.get_instance_stamps(["i1"])
+    created = shared_cache.set_instances({"i1": {"p": 1.0}}, stamps)
+    assert created == shared_cache.get_instance_stamps(["i1"])
+    assert shared_cache.set_instances({"i1": {"p": 1.0}}, created) == {}
+
+
+def test_from_settings(settings):
+    """Test the shared cache is opt-in through settings."""
+    settings.EUROTEMPL_PARAMETER_CACHE = None
+    assert SharedParameterCache.from_settings() is None
+    settings.EUROTEMPL_PARAMETER_CACHE = 'default'
+    settings.EUROTEMPL_PARAMETER_CACHE_TIMEOUT = 60
+    cache = SharedParameterCache.from_settings()
+    assert (cache.alias, cache.timeout) == ('default', 60)
+
+
+@pytest.mark.django_db
+class TestManagerSharedCache:
+    """Test suite for ParameterManager with a shared cache."""
+
+    @pytest.fixture
+    def width(self, component, length_constraints, shared_cache,
+              django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            return ParameterManager(shared_cache=shared_cache).add_parameter(
+                component=component,
+                name="Width",
+                data_type="float",
+                constraints=length_constraints
+            )
+
+    def test_second_worker_loads_definitions_from_cache(self, width, shared_cache,
+                                                        django_assert_num_queries):
+        """Test a second manager only queries which components exist."""
+        ParameterManager(shared_cache=shared_cache)
+        with django_assert_num_queries(1):
+            manager = ParameterManager(shared_cache=shared_cache)
+        assert str(width.id) in manager._parameters
+
+    def test_refresh_reloads_changed_components_only(self, component, width, shared_cache,
+                                                     length_constraints,
+                                                     django_capture_on_commit_callbacks):
+        """Test refresh only reloads components invalidated elsewhere."""
+        worker = ParameterManager(shared_cache=shared_cache)
+        assert worker.refresh_parameters() == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            height = ParameterManager(shared_cache=shared_cache).add_parameter(
+                component=component,
+                name="Height",
+                data_type="float",
+                constraints=length_constraints
+            )
+        assert worker.refresh_parameters() == [str(component.id)]
+        assert str(height.id) in worker._parameters
+
+    def test_values_follow_writes_from_other_workers(self, component, width, shared_cache,
+                                                     django_user_model,
+                                                     django_capture_on_commit_callbacks):
+        """Test a worker drops local values when another worker writes."""
+        reader = ParameterManager(shared_cache=shared_cache)
+        writer = ParameterManager(shared_cache=shared_cache)
+        user = django_user_model.objects.create_user(username='shared-user')
+        instance = component.create_instance()
+        assert reader.get_parameter_values(instance) == {str(width.id): 0.0}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            writer.update_parameter(
+                instance, str(width.id),
+                ParametricValue(parameter_id=str(width.id), value=100.0, unit="mm"),
+                modified_by=user
+            )
+        # Simulate another process: no in-process signal reaches the reader.
+        reader._value_cache.put(str(instance.id), str(width.id), 0.0)
+        assert reader.get_parameter_values(instance) == {str(width.id): 100.0}
+
+    def test_direct_value_save_replaces_stamps(self, component, width, shared_cache,
+                                               django_user_model,
+                                               django_capture_on_commit_callbacks):
+        """Test a ParameterValue saved outside any manager stales shared values."""
+        from core.models import ParameterValue
+        reader = ParameterManager(shared_cache=shared_cache)
+        user = django_user_model.objects.create_user(username='shared-user')
+        instance = component.create_instance()
+        assert reader.get_parameter_values(instance) == {str(width.id): 0.0}
+        assert reader._instance_stamps[str(instance.id)] is not None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ParameterValue.objects.create(
+                instance=instance,
+                parameter=width,
+                value={'value': 50.0, 'unit': 'mm'},
+                modified_by=user
+            )
+        reader._value_cache.put(str(instance.id), str(width.id), 0.0)
+        assert reader.get_parameter_values(instance) == {str(width.id): 50.0}
+        assert reader.refresh_parameters() == [str(component.id)]
+
+    def test_parameter_save_replaces_component_stamp(self, component, width, shared_cache,
+                                                     django_capture_on_commit_callbacks):
+        """Test saving a Parameter directly makes workers reload its component."""
+        worker = ParameterManager(shared_cache=shared_cache)
+        assert worker.refresh_parameters() == []
+
+        width.description = "Outer width"
+        with django_capture_on_commit_callbacks(execute=True):
+            width.save()
+        assert worker.refresh_parameters() == [str(component.id)]
+
+    def test_value_writes_look_up_components_once(self, component, width,
+                                                  django_assert_num_queries):
+        """Test value signals remember which component a parameter belongs to."""
+        _parameter_component.cache_clear()
+        with django_assert_num_queries(1):
+            assert _parameter_component(width.id) == str(component.id)
+        with django_assert_num_queries(0):
+            assert _parameter_component(width.id) == str(component.id)
+
+        width.save()
+        assert _parameter_component.cache_info().currsize == 0
+
+    def test_writer_keeps_its_own_stamps(self, component, width, shared_cache,
+                                         length_constraints, django_user_model,
+                                         django_capture_on_commit_callbacks):
+        """Test a manager does not reload what it wrote itself."""
+        writer = ParameterManager(shared_cache=shared_cache)
+        user = django_user_model.objects.create_user(username='shared-user')
+        with django_capture_on_commit_callbacks(execute=True):
+            writer.add_parameter(component, "Height", "float", length_constraints)
+            writer.update_parameter(
+                component.create_instance(), str(width.id),
+                ParametricValue(parameter_id=str(width.id), value=100.0, unit="mm"),
+                modified_by=user
+            )
+        assert writer.refresh_parameters() == []
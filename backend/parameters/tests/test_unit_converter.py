@@ -6,6 +6,8 @@ This module contains tests for the unit conversion functionality.
 Copyright (c) 2024 Pygmalion Records
 """
 
+import math
+import numpy as np
 import pytest
 from ..utils.unit_converter import UnitConverter
 
@@ -90,4 +92,32 @@ def test_precision():
 def test_parametrized_conversions(value, from_unit, to_unit, expected):
     """Test various conversion combinations."""
     result = UnitConverter.convert(value, from_unit, to_unit)
-    assert result == pytest.approx(expected)
\ No newline at end of file
+    assert result == pytest.approx(expected)
+
+def test_volume_mass_angle_conversions():
+    """Test volume, mass and angle unit conversions."""
+    assert UnitConverter.convert(1.0, "l", "cm3") == pytest.approx(1000.0)
+    assert UnitConverter.convert(1.0, "m3", "l") == pytest.approx(1000.0)
+    assert UnitConverter.convert(2500.0, "g", "kg") == pytest.approx(2.5)
+    assert UnitConverter.convert(1.0, "t", "kg") == pytest.approx(1000.0)
+    assert UnitConverter.convert(math.pi, "rad", "deg") == pytest.approx(180.0)
+    assert UnitConverter.are_compatible("kg", "m3") is False
+
+def test_unit_table():
+    """Test every unit maps to its dimension and base factor."""
+    assert UnitConverter.UNITS["cm"] == ("length", 10.0)
+    assert UnitConverter.dimension("ml") == "volume"
+    assert UnitConverter.dimension("invalid") is None
+    for dimension, units in UnitConverter.CONVERSION_FACTORS.items():
+        for unit in units:
+            assert UnitConverter.conversion_factor(unit, unit) == 1.0
+
+def test_convert_array():
+    """Test converting NumPy arrays in one call."""
+    values = np.array([0.0, 10.0, 2500.0])
+    result = UnitConverter.convert_array(values, "mm", "m")
+    assert result == pytest.approx([0.0, 0.01, 2.5])
+    assert values[1] == 10.0  # input left untouched
+
+    with pytest.raises(ValueError, match="Cannot convert between units"):
+        UnitConverter.convert_array(values, "mm", "kg")
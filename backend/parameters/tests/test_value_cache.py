@@ -0,0 +1,138 @@
+"""
+EuroTempl System - Parameter Value Cache Tests
+
+This module contains tests for the in-process parameter value cache.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import pytest
+from core.models import ParameterValue
+from core.tests import valid_component_data
+from ..core.interfaces import ParameterManager, ParametricValue
+from ..core.interfaces.value_cache import MISSING, ParameterValueCache
+
+
+def test_lru_eviction():
+    """Test the least recently used value is evicted first."""
+    cache = ParameterValueCache(maxsize=2)
+    cache.put("i", "a", 1.0)
+    cache.put("i", "b", 2.0)
+    assert cache.get("i", "a") == 1.0
+    cache.put("i", "c", 3.0)
+
+    assert cache.get("i", "b") is None
+    assert cache.get("i", "a") == 1.0
+    assert cache.get("i", "c") == 3.0
+    assert cache.get_stats() == {
+        "hits": 3, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2
+    }
+
+
+def test_invalidate_and_reset_stats():
+    """Test invalidated values miss and counters can be reset."""
+    cache = ParameterValueCache(maxsize=10)
+    cache.put_many({("i", "a"): 1.0, ("i", "b"): 2.0})
+    cache.invalidate([("i", "a")])
+    assert cache.get("i", "a") is None
+    assert len(cache) == 1
+    cache.reset_stats()
+    assert cache.get_stats()["misses"] == 0
+
+
+def test_cached_none_is_a_hit():
+    """Test a cached None is told apart from a miss through the sentinel."""
+    cache = ParameterValueCache(maxsize=10)
+    cache.put("i", "a", None)
+    assert cache.get("i", "a", MISSING) is None
+    assert cache.get("i", "b", MISSING) is MISSING
+    assert (cache.get_stats()["hits"], cache.get_stats()["misses"]) == (1, 1)
+
+
+def test_fill_dropped_after_concurrent_write():
+    """Test values read before an invalidation or write-through are not cached."""
+    cache = ParameterValueCache(maxsize=10)
+    keys = [("i", "a"), ("i", "b"), ("i", "c")]
+    generations = cache.generations(keys)
+    cache.invalidate([("i", "a")])
+    cache.put("i", "b", 20.0)
+    cache.fill({("i", "a"): 1.0, ("i", "b"): 2.0, ("i", "c"): 3.0}, generations)
+
+    assert cache.get("i", "a") is None
+    assert cache.get("i", "b") == 20.0
+    assert cache.get("i", "c") == 3.0
+
+
+def test_fill_bounded_generations_stay_conservative():
+    """Test forgetting old generations never lets a stale fill through."""
+    cache = ParameterValueCache(maxsize=2)
+    generations = cache.generations([("i", "a")])
+    cache.invalidate([("i", "a"), ("i", "b"), ("i", "c")])
+    cache.fill({("i", "a"): 1.0}, generations)
+    assert cache.get("i", "a") is None
+    cache.fill({("i", "a"): 1.0}, cache.generations([("i", "a")]))
+    assert cache.get("i", "a") == 1.0
+
+
+def test_invalid_size():
+    """Test the cache size must be positive."""
+    with pytest.raises(ValueError):
+        ParameterValueCache(maxsize=0)
+
+
+@pytest.mark.django_db
+class TestManagerValueCache:
+    """Test suite for the ParameterManager value cache."""
+
+    @pytest.fixture
+    def width(self, component, length_constraints):
+        return ParameterManager().add_parameter(
+            component=component,
+            name="Width",
+            data_type="float",
+            constraints=length_constraints
+        )
+
+    def test_write_through_serves_reads(self, component, width, django_user_model,
+                                        django_capture_on_commit_callbacks,
+                                        django_assert_num_queries):
+        """Test updated values are served from the cache without queries."""
+        manager = ParameterManager()
+        user = django_user_model.objects.create_user(username='cache-user')
+        instance = component.create_instance()
+        with django_capture_on_commit_callbacks(execute=True):
+            manager.update_parameter(
+                instance, str(width.id),
+                ParametricValue(parameter_id=str(width.id), value=100.0, unit="mm"),
+                modified_by=user
+            )
+
+        with django_assert_num_queries(0):
+            assert manager.get_parameter_values(instance) == {str(width.id): 100.0}
+        assert manager.get_cache_stats()["hits"] == 1
+
+    def test_read_populates_cache(self, component, width, django_assert_num_queries):
+        """Test a miss is loaded once and then served from the cache."""
+        manager = ParameterManager()
+        instance = component.create_instance()
+        with django_assert_num_queries(1):
+            manager.get_parameter_values(instance)
+        with django_assert_num_queries(0):
+            manager.get_parameter_values(instance)
+        stats = manager.get_cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_signal_invalidates_cache(self, component, width, django_user_model):
+        """Test saving a ParameterValue outside the manager invalidates it."""
+        manager = ParameterManager()
+        user = django_user_model.objects.create_user(username='cache-user')
+        instance = component.create_instance()
+        assert manager.get_parameter_values(instance) == {str(width.id): 0.0}
+
+        ParameterValue.objects.create(
+            instance=instance,
+            parameter=width,
+            value={'value': 50.0, 'unit': 'mm'},
+            modified_by=user
+        )
+        assert manager.get_parameter_values(instance) == {str(width.id): 50.0}
@@ -1 +1,2 @@
-from .unit_converter import UnitConverter
\ No newline at end of file
+from .unit_converter import UnitConverter
+from .formula import Formula, compile_formula, normalize_name
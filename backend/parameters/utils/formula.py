@@ -0,0 +1,300 @@
+"""
+EuroTempl System - Formula Engine
+
+This module compiles parameter dependency formulas such as
+``width * height / 2`` into closure trees. A formula is parsed and
+validated once; evaluating it afterwards only calls plain Python
+functions and never goes through ``eval``. The same formula can be bound
+to NumPy implementations of its functions to evaluate whole columns of
+values in one pass.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import ast
+import math
+import operator
+import re
+from functools import lru_cache, reduce
+from typing import Any, Callable, Mapping, Tuple
+import numpy as np
+
+Evaluator = Callable[[Mapping[str, Any]], Any]
+
+# Largest exponent accepted by ``**``; unbounded powers such as
+# ``9 ** 9 ** 9`` would otherwise hang the process.
+MAX_EXPONENT = 1024
+
+# Largest integer power result, in bits. Exact integer powers grow with
+# every nesting level, so ``((9 ** 1000) ** 1000) ** 1000`` would hang even
+# though each exponent is in range; float powers overflow instead.
+MAX_POWER_BITS = 1 << 16
+
+
+def _divisor_checked(op: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+    """
+    Make a division operator raise ZeroDivisionError for NumPy operands too.
+
+    Python numbers already raise; NumPy would return inf or nan instead, so
+    scalar and vector evaluation of the same formula would disagree.
+    """
+    def apply(left: Any, right: Any) -> Any:
+        if isinstance(right, (np.ndarray, np.generic)) and np.any(right == 0):
+            raise ZeroDivisionError("division by zero")
+        return op(left, right)
+    return apply
+
+
+def _bounded_pow(base: Any, exponent: Any) -> Any:
+    """
+    Raise to a power, refusing results that are huge or not real.
+
+    Raises:
+        ValueError: If any exponent exceeds MAX_EXPONENT in magnitude, an
+            integer result would exceed MAX_POWER_BITS, or a negative base
+            is raised to a fractional exponent. Python would return a
+            complex number and NumPy nan for the latter.
+    """
+    if np.any(np.abs(exponent) > MAX_EXPONENT):
+        raise ValueError(f"Exponent exceeds the maximum of {MAX_EXPONENT}")
+    if (isinstance(base, int) and isinstance(exponent, int) and exponent > 1
+            and base.bit_length() * exponent > MAX_POWER_BITS):
+        raise ValueError(f"Power result exceeds the maximum of {MAX_POWER_BITS} bits")
+    if np.any(np.less(base, 0) & (np.mod(exponent, 1) != 0)):
+        raise ValueError("Negative base raised to a fractional exponent")
+    return operator.pow(base, exponent)
+
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: _divisor_checked(operator.truediv),
+    ast.FloorDiv: _divisor_checked(operator.floordiv),
+    ast.Mod: _divisor_checked(operator.mod),
+    ast.Pow: _bounded_pow,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+SCALAR_FUNCTIONS = {
+    'abs': abs,
+    'min': min,
+    'max': max,
+    'round': round,
+    'floor': math.floor,
+    'ceil': math.ceil,
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+}
+
+VECTOR_FUNCTIONS = {
+    'abs': np.abs,
+    'min': lambda *args: reduce(np.minimum, args),
+    'max': lambda *args: reduce(np.maximum, args),
+    'round': np.round,
+    'floor': np.floor,
+    'ceil': np.ceil,
+    'sqrt': np.sqrt,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+}
+
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+}
+
+
+def normalize_name(name: str) -> str:
+    """
+    Turn a parameter name into the identifier used to reference it in formulas.
+
+    Args:
+        name (str): Human-readable parameter name, e.g. "Wall Thickness".
+
+    Returns:
+        str: Lower-case identifier, e.g. "wall_thickness".
+    """
+    return re.sub(r'\W+', '_', name.strip()).strip('_').lower()
+
+
+class Formula:
+    """
+    A parsed and validated formula.
+
+    Attributes:
+        expression (str): The source expression.
+        variables (Tuple[str, ...]): Variable names referenced by the
+            expression, in order of first appearance.
+    """
+
+    __slots__ = ('expression', 'variables', '_tree')
+
+    def __init__(self, expression: str):
+        """
+        Parse and validate a formula.
+
+        Args:
+            expression (str): Arithmetic expression over parameter names.
+
+        Raises:
+            ValueError: If the expression is not a valid formula.
+        """
+        try:
+            tree = ast.parse(expression.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid formula {expression!r}: {e.msg}")
+
+        variables = []
+        function_names = set()
+        for node in ast.walk(tree.body):
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.func.id not in SCALAR_FUNCTIONS:
+                    raise ValueError(f"Invalid formula {expression!r}: unsupported function")
+                if node.keywords:
+                    raise ValueError(f"Invalid formula {expression!r}: keyword arguments are not supported")
+                function_names.add(id(node.func))
+            elif isinstance(node, ast.Name):
+                if id(node) in function_names:
+                    continue
+                if node.id not in CONSTANTS and node.id not in variables:
+                    variables.append(node.id)
+            elif isinstance(node, ast.Constant):
+                if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                    raise ValueError(f"Invalid formula {expression!r}: only numeric constants are allowed")
+            elif not isinstance(node, (ast.BinOp, ast.UnaryOp, ast.Load, ast.operator, ast.unaryop)):
+                raise ValueError(
+                    f"Invalid formula {expression!r}: unsupported syntax {type(node).__name__}"
+                )
+            if isinstance(node, ast.BinOp) and type(node.op) not in BINARY_OPERATORS:
+                raise ValueError(f"Invalid formula {expression!r}: unsupported operator")
+            if (isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow)
+                    and isinstance(node.right, ast.Constant)
+                    and isinstance(node.right.value, (int, float))
+                    and abs(node.right.value) > MAX_EXPONENT):
+                raise ValueError(
+                    f"Invalid formula {expression!r}: exponent exceeds {MAX_EXPONENT}"
+                )
+            if isinstance(node, ast.UnaryOp) and type(node.op) not in UNARY_OPERATORS:
+                raise ValueError(f"Invalid formula {expression!r}: unsupported operator")
+
+        self.expression = expression
+        self.variables: Tuple[str, ...] = tuple(variables)
+        self._tree = tree.body
+
+    def bind(self, names: Mapping[str, str],
+             functions: Mapping[str, Callable] = SCALAR_FUNCTIONS) -> Evaluator:
+        """
+        Build an evaluator with variable names resolved to value keys.
+
+        Args:
+            names (Mapping[str, str]): Maps each variable name to the key
+                under which its value is found at evaluation time.
+            functions (Mapping[str, Callable]): Implementations of the
+                supported functions, SCALAR_FUNCTIONS for plain numbers or
+                VECTOR_FUNCTIONS for NumPy arrays.
+
+        Returns:
+            Evaluator: A callable taking a mapping of values and returning
+            the formula result.
+
+        Raises:
+            ValueError: If a variable cannot be resolved.
+        """
+        missing = [name for name in self.variables if name not in names]
+        if missing:
+            raise ValueError(
+                f"Unknown variable(s) {', '.join(missing)} in formula {self.expression!r}"
+            )
+        return _compile_node(self._tree, names, functions)
+
+    def evaluate(self, values: Mapping[str, Any]) -> Any:
+        """
+        Evaluate the formula with values keyed by variable name.
+
+        This binds the formula on every call; hot paths should keep the
+        evaluator returned by bind() instead.
+
+        Args:
+            values (Mapping[str, Any]): Variable values keyed by name.
+
+        Returns:
+            Any: The formula result.
+        """
+        return self.bind({name: name for name in values})(values)
+
+    def __repr__(self) -> str:
+        return f"Formula({self.expression!r})"
+
+
+@lru_cache(maxsize=4096)
+def compile_formula(expression: str) -> Formula:
+    """
+    Parse a formula, reusing previously parsed formulas.
+
+    Args:
+        expression (str): Arithmetic expression over parameter names.
+
+    Returns:
+        Formula: The parsed formula.
+
+    Raises:
+        ValueError: If the expression is not a valid formula.
+    """
+    return Formula(expression)
+
+
+def _compile_node(node: ast.AST, names: Mapping[str, str],
+                  functions: Mapping[str, Callable]) -> Evaluator:
+    """
+    Recursively turn a validated AST node into a closure.
+
+    Args:
+        node (ast.AST): The node to compile.
+        names (Mapping[str, str]): Variable name to value key mapping.
+        functions (Mapping[str, Callable]): Function implementations.
+
+    Returns:
+        Evaluator: Closure computing the node's value.
+    """
+    if isinstance(node, ast.Constant):
+        constant = node.value
+        return lambda values: constant
+
+    if isinstance(node, ast.Name):
+        if node.id in names:
+            key = names[node.id]
+            return lambda values: values[key]
+        constant = CONSTANTS[node.id]
+        return lambda values: constant
+
+    if isinstance(node, ast.BinOp):
+        op = BINARY_OPERATORS[type(node.op)]
+        left = _compile_node(node.left, names, functions)
+        right = _compile_node(node.right, names, functions)
+        return lambda values: op(left(values), right(values))
+
+    if isinstance(node, ast.UnaryOp):
+        op = UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, names, functions)
+        return lambda values: op(operand(values))
+
+    if isinstance(node, ast.Call):
+        func = functions[node.func.id]
+        args = [_compile_node(arg, names, functions) for arg in node.args]
+        if len(args) == 1:
+            (arg,) = args
+            return lambda values: func(arg(values))
+        if len(args) == 2:
+            first, second = args
+            return lambda values: func(first(values), second(values))
+        return lambda values: func(*[arg(values) for arg in args])
+
+    raise ValueError(f"Unsupported syntax {type(node).__name__}")
@@ -1,36 +1,135 @@
+"""
+EuroTempl System - Unit Converter
 
+This module converts parameter values between units of the same
+dimension. The per-dimension factors are flattened once into a unit table
+and a table of conversion factors for every compatible unit pair, so
+conversions and compatibility checks are single dictionary lookups.
+
+Copyright (c) 2024 Pygmalion Records
+"""
+
+import math
 from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+
+# Factors relative to the base unit of each dimension (mm, mm2, mm3, g, deg).
+CONVERSION_FACTORS = {
+    'length': {
+        'mm': 1.0,
+        'cm': 10.0,
+        'm': 1000.0,
+        'inch': 25.4
+    },
+    'area': {
+        'mm2': 1.0,
+        'cm2': 100.0,
+        'm2': 1000000.0
+    },
+    'volume': {
+        'mm3': 1.0,
+        'cm3': 1000.0,
+        'ml': 1000.0,
+        'l': 1000000.0,
+        'm3': 1000000000.0
+    },
+    'mass': {
+        'g': 1.0,
+        'kg': 1000.0,
+        't': 1000000.0
+    },
+    'angle': {
+        'deg': 1.0,
+        'rad': 180.0 / math.pi
+    }
+}
+
+
+def _build_unit_table(factors: Dict[str, Dict[str, float]]) -> Dict[str, Tuple[str, float]]:
+    """
+    Flatten per-dimension factors into a unit -> (dimension, factor) table.
+
+    Raises:
+        ValueError: If a unit is listed under more than one dimension.
+    """
+    table: Dict[str, Tuple[str, float]] = {}
+    for dimension, units in factors.items():
+        for unit, factor in units.items():
+            if unit in table:
+                raise ValueError(f"Unit {unit} is defined for several dimensions")
+            table[unit] = (dimension, factor)
+    return table
+
+
+def _build_factor_table(units: Dict[str, Tuple[str, float]]) -> Dict[Tuple[str, str], float]:
+    """Compute the conversion factor of every compatible unit pair."""
+    return {
+        (from_unit, to_unit): from_factor / to_factor
+        for from_unit, (from_dimension, from_factor) in units.items()
+        for to_unit, (to_dimension, to_factor) in units.items()
+        if from_dimension == to_dimension
+    }
+
 
 @dataclass
 class UnitConverter:
     """Handles unit conversions and compatibility checks."""
-    
-    CONVERSION_FACTORS = {
-        'length': {
-            'mm': 1.0,
-            'cm': 10.0,
-            'm': 1000.0,
-            'inch': 25.4
-        },
-        'area': {
-            'mm2': 1.0,
-            'cm2': 100.0,
-            'm2': 1000000.0
-        }
-    }
+
+    CONVERSION_FACTORS = CONVERSION_FACTORS
+    UNITS = _build_unit_table(CONVERSION_FACTORS)
+    FACTORS = _build_factor_table(UNITS)
+
+    @classmethod
+    def conversion_factor(cls, from_unit: str, to_unit: str) -> float:
+        """
+        Get the factor converting values from one unit to another.
+
+        Args:
+            from_unit (str): Unit of the values.
+            to_unit (str): Unit to convert to.
+
+        Returns:
+            float: Multiplier turning from_unit values into to_unit values.
+
+        Raises:
+            ValueError: If the units are unknown or of different dimensions.
+        """
+        try:
+            return cls.FACTORS[from_unit, to_unit]
+        except KeyError:
+            raise ValueError(f"Cannot convert between units {from_unit} and {to_unit}") from None
 
     @classmethod
     def convert(cls, value: float, from_unit: str, to_unit: str) -> float:
         """Convert value between compatible units."""
-        for unit_type, conversions in cls.CONVERSION_FACTORS.items():
-            if from_unit in conversions and to_unit in conversions:
-                return value * (conversions[from_unit] / conversions[to_unit])
-        raise ValueError(f"Cannot convert between units {from_unit} and {to_unit}")
+        return value * cls.conversion_factor(from_unit, to_unit)
+
+    @classmethod
+    def convert_array(cls, values: Any, from_unit: str, to_unit: str) -> np.ndarray:
+        """
+        Convert an array of values between compatible units.
+
+        Args:
+            values (Any): Array-like of values in from_unit.
+            from_unit (str): Unit of the values.
+            to_unit (str): Unit to convert to.
+
+        Returns:
+            np.ndarray: New float64 array of the values in to_unit.
+
+        Raises:
+            ValueError: If the units are unknown or of different dimensions.
+        """
+        return np.asarray(values, dtype=np.float64) * cls.conversion_factor(from_unit, to_unit)
 
     @classmethod
     def are_compatible(cls, unit1: str, unit2: str) -> bool:
         """Check if units are compatible for conversion."""
-        for conversions in cls.CONVERSION_FACTORS.values():
-            if unit1 in conversions and unit2 in conversions:
-                return True
-        return False
+        return (unit1, unit2) in cls.FACTORS
+
+    @classmethod
+    def dimension(cls, unit: str) -> Optional[str]:
+        """Get the dimension of a unit, or None if the unit is unknown."""
+        entry = cls.UNITS.get(unit)
+        return entry[0] if entry is not None else None